@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled templates against the f-string builders they replaced.
+
+Times the section pages batch_generate.py renders (its section cache is
+cleared every round, so each body is rendered once per round as in a build),
+one page per section (no cache reuse at all), and the algorithm blocks of
+process_pages_v3.py, each against a frozen copy of the pre-template code.
+The legacy builders live only here; templates.py is just the engine.
+"""
+
+import argparse
+import html
+import re
+import time
+
+import batch_generate
+import process_pages_v3
+from build_search_index import load_pages
+
+def legacy_section_page(section_num, page_num):
+    """batch_generate.create_section_page before templates.py."""
+    if section_num not in batch_generate.SECTIONS:
+        return None
+
+    sec = batch_generate.SECTIONS[section_num]
+
+    points_html = '\n'.join([f'<li>{html.escape(p)}</li>' for p in sec.get('key_points', [])])
+
+    pseudocode_html = ''
+    if 'pseudocode' in sec:
+        pseudocode_html = f'''<div class="algorithm">
+    <h4>Pseudocode</h4>
+    <pre style="font-size: 0.85rem; line-height: 1.6;">{html.escape(sec['pseudocode'])}</pre>
+</div>'''
+
+    example_html = ''
+    if 'example' in sec:
+        example_html = f'''<div class="figure-box">
+    <h4>Example</h4>
+    <p>{html.escape(sec['example'])}</p>
+</div>'''
+
+    why_html = ''
+    if 'why_matters' in sec:
+        why_html = f'''<div class="highlight-box">
+    <h4>Why It Matters</h4>
+    <p>{html.escape(sec['why_matters'])}</p>
+</div>'''
+
+    return {
+        "page": page_num,
+        "title": f"{section_num} {sec['title']}",
+        "content": f"""<div class="article-header">
+    <div class="section-label">Section {section_num}</div>
+    <h1>{sec['title']}</h1>
+</div>
+<div class="original-content">
+    <div class="definition-box">
+        <h4>Summary</h4>
+        <p><strong>{html.escape(sec['summary'])}</strong></p>
+    </div>
+
+    <div class="highlight-box">
+        <h4>Key Points</h4>
+        <ul>{points_html}</ul>
+    </div>
+
+    {pseudocode_html}
+    {example_html}
+    {why_html}
+</div>"""
+    }
+
+def legacy_algo_html(algo):
+    """process_pages_v3.create_algo_html before templates.py."""
+    code_lines = []
+    for line in algo['code'].split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        match = re.match(r'^(\d+)\s+(.*)$', line)
+        if match:
+            content = html.escape(match.group(2))
+            for kw in ['for', 'while', 'if', 'else', 'return', 'error', 'to', 'downto', 'do',
+                       'and', 'or', 'not', 'NIL', 'TRUE', 'FALSE']:
+                content = re.sub(rf'\b{kw}\b', f'<b>{kw}</b>', content)
+            code_lines.append(f'<span style="color:#64748b">{match.group(1):>2}</span>  {content}')
+        else:
+            code_lines.append(html.escape(line))
+    return f'''
+<div class="algorithm">
+    <span class="algorithm-name">{html.escape(algo['name'])}({html.escape(algo['params'])})</span>
+    <p style="margin:0.3rem 0;color:#475569;font-size:0.85rem;font-family:var(--font-sans);">{html.escape(algo['description'])}</p>
+    <pre style="margin-top:0.5rem;font-size:0.82rem;line-height:1.7;">{chr(10).join(code_lines)}</pre>
+</div>'''
+
+def uncached_section_pages(sections):
+    """Template section pages with the section cache emptied first, so every body is rendered."""
+    batch_generate.SECTION_CACHE.clear()
+    return [batch_generate.create_section_page(s, p, "") for s, p in sections]
+
+def benchmark(rounds=50):
+    """Time each render stage before and after templates."""
+    pages = {p: t.replace('\f', '').strip() for p, t in load_pages().items()}
+    algos = [a for text in pages.values() for a in process_pages_v3.extract_algorithms(text)]
+    sections = [(section, page) for page, section in batch_generate.PAGE_TO_SECTION.items()]
+    distinct = {}
+    for section, page in sections:
+        distinct.setdefault(section, page)
+
+    def time_it(fn):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        return (time.perf_counter() - start) / rounds * 1000
+
+    cases = [
+        ("section pages (f-string)", lambda: [legacy_section_page(s, p) for s, p in sections]),
+        ("section pages (template)", lambda: uncached_section_pages(sections)),
+        ("one page per section (f-string)", lambda: [legacy_section_page(s, p) for s, p in distinct.items()]),
+        ("one page per section (template)", lambda: uncached_section_pages(distinct.items())),
+        ("algorithm blocks (f-string)", lambda: [legacy_algo_html(a) for a in algos]),
+        ("algorithm blocks (template)", lambda: [process_pages_v3.create_algo_html(a) for a in algos]),
+    ]
+    print(f"{len(sections)} section pages ({len(distinct)} sections), {len(algos)} algorithm blocks, {rounds} rounds")
+    for label, fn in cases:
+        print(f"{label:<34} {time_it(fn):>8.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+    benchmark(args.rounds)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Build the prefix autocomplete index for the TOC filter box.
+Section titles, algorithm names and theorem numbers are stored as a sorted,
+front-coded key array that the reader binary-searches on every keystroke.
+"""
+
+import json
+import re
+
+from batch_generate import SECTIONS, PAGE_TO_SECTION
+from build_search_index import PAGES_DIR, load_pages, normalize_text
+from process_pages_v3 import ALGO_DESC, CHAPTERS, extract_algorithms, extract_theorems
+
+AUTOCOMPLETE_FILE = PAGES_DIR.parent / "reader" / "data" / "autocomplete.json"
+
+# Keys per front-coded block; each block starts with a full key
+BLOCK_SIZE = 16
+
+def section_targets():
+    """(label, page, kind) for every chapter and section, at its first page."""
+    first_page = {}
+    for page_num, section in PAGE_TO_SECTION.items():
+        first_page[section] = min(page_num, first_page.get(section, page_num))
+
+    targets = []
+    for section, sec in SECTIONS.items():
+        if section in first_page:
+            targets.append((f"{section} {sec['title']}", first_page[section], "section"))
+
+    for chapter, name in CHAPTERS.items():
+        pages = [p for s, p in first_page.items() if s.split('.')[0] == str(chapter)]
+        if pages:
+            targets.append((f"{chapter}. {name}", min(pages), "chapter"))
+    return targets
+
+def page_entity_targets(pages):
+    """(label, page, kind) for algorithms and theorems at the page defining them."""
+    algo_pages = {}
+    theorem_pages = {}
+    for page_num in sorted(pages):
+        text = pages[page_num].replace('\f', '').strip()
+        for algo in extract_algorithms(text):
+            algo_pages.setdefault(algo['name'], page_num)
+        for thm in extract_theorems(text):
+            if re.fullmatch(r'\d+\.\d+', thm['number']):
+                theorem_pages.setdefault(f"{thm['type']} {thm['number']}", page_num)
+
+    # Algorithms the extractor missed: fall back to the first page naming them
+    normalized = {p: normalize_text(pages[p]) for p in sorted(pages)}
+    for name in ALGO_DESC:
+        if name not in algo_pages:
+            for page_num, text in normalized.items():
+                if name in text:
+                    algo_pages[name] = page_num
+                    break
+
+    targets = [(name, page, "algorithm") for name, page in algo_pages.items() if name in ALGO_DESC]
+    targets += [(label, page, "theorem") for label, page in theorem_pages.items()]
+    return targets
+
+def completion_keys(label):
+    """Lowercase keys for a label: the whole label plus every later word onwards."""
+    words = label.lower().split()
+    return {' '.join(words[i:]) for i in range(len(words))}
+
+def front_code(keys):
+    """Split sorted keys into blocks of [shared_prefix_len, suffix] pairs."""
+    blocks = []
+    for start in range(0, len(keys), BLOCK_SIZE):
+        block = []
+        prev = ''
+        for key in keys[start:start + BLOCK_SIZE]:
+            shared = 0
+            while shared < min(len(prev), len(key)) and prev[shared] == key[shared]:
+                shared += 1
+            block.append([shared, key[shared:]])
+            prev = key
+        blocks.append(block)
+    return blocks
+
+def build_index(targets):
+    """Build the front-coded index from (label, page, kind) targets."""
+    targets = sorted(set(targets), key=lambda t: (t[1], t[0]))
+    entries = sorted((key, i) for i, target in enumerate(targets) for key in completion_keys(target[0]))
+    keys = [key for key, _ in entries]
+    blocks = front_code(keys)
+    return {
+        "version": 1,
+        "blockSize": BLOCK_SIZE,
+        # First key of every block, for the binary search
+        "heads": [keys[i] for i in range(0, len(keys), BLOCK_SIZE)],
+        "blocks": blocks,
+        # Entry i points at targets[refs[i]]
+        "refs": [i for _, i in entries],
+        "targets": [list(t) for t in targets],
+    }
+
+def decode_block(index, block_num):
+    """Expand one front-coded block back into full keys."""
+    keys = []
+    prev = ''
+    for shared, suffix in index["blocks"][block_num]:
+        prev = prev[:shared] + suffix
+        keys.append(prev)
+    return keys
+
+def complete(index, prefix, limit=10):
+    """Return up to `limit` distinct targets whose keys start with prefix."""
+    prefix = prefix.lower().strip()
+    heads = index["heads"]
+    lo, hi = 0, len(heads)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if heads[mid] < prefix:
+            lo = mid + 1
+        else:
+            hi = mid
+    block_num = max(lo - 1, 0)
+
+    results = []
+    seen = set()
+    while block_num < len(heads):
+        base = block_num * index["blockSize"]
+        for offset, key in enumerate(decode_block(index, block_num)):
+            if key < prefix:
+                continue
+            if not key.startswith(prefix):
+                return results
+            ref = index["refs"][base + offset]
+            if ref not in seen:
+                seen.add(ref)
+                results.append(index["targets"][ref])
+                if len(results) == limit:
+                    return results
+        block_num += 1
+    return results
+
+def main():
+    targets = section_targets() + page_entity_targets(load_pages())
+    index = build_index(targets)
+
+    AUTOCOMPLETE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(AUTOCOMPLETE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"Indexed {len(index['targets'])} targets under {len(index['refs'])} keys")
+    print(f"Wrote {AUTOCOMPLETE_FILE} ({AUTOCOMPLETE_FILE.stat().st_size // 1024} KB)")
+
+if __name__ == "__main__":
+    main()
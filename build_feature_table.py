@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Export per-page features as typed columns in reader/data/features.npz.
+
+One row per page. Scalar features are fixed-width integer columns; strings are
+stored once in string tables and referenced by code (-1 = none); list features
+(algorithms, theorems, complexity) are CSR-style: <name>_offsets[i]:<name>_offsets[i+1]
+slices <name>_codes for page i. Everything loads with np.load(allow_pickle=False).
+
+    page            int16     page number
+    chapter         int8      chapter number, 0 if none
+    section         int16     code into section_table (mapped section, else detected)
+    page_type       int8      code into page_type_table
+    text_chars      int32     characters of OCR text
+    algorithms_*    int32     codes into algorithm_table
+    theorems_*      int32     codes into theorem_table
+    complexity_*    int32     codes into complexity_table
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from batch_generate import PAGE_TO_SECTION
+from build_search_index import PAGES_DIR, load_pages
+from cbor_pages import page_features
+from generate_explanations import get_page_type
+
+FEATURES_FILE = PAGES_DIR.parent / "reader" / "data" / "features.npz"
+
+LIST_COLUMNS = {"algorithms": "algorithm_table", "theorems": "theorem_table", "complexity": "complexity_table"}
+
+def build_columns(pages):
+    """Extract features for every page and pack them into column arrays."""
+    rows = sorted(pages)
+    tables = {"section_table": {}, "page_type_table": {}, **{t: {} for t in LIST_COLUMNS.values()}}
+
+    def code(table, value):
+        if value is None:
+            return -1
+        return tables[table].setdefault(value, len(tables[table]))
+
+    columns = {
+        "page": np.array(rows, dtype=np.int16),
+        "chapter": np.zeros(len(rows), dtype=np.int8),
+        "section": np.full(len(rows), -1, dtype=np.int16),
+        "page_type": np.zeros(len(rows), dtype=np.int8),
+        "text_chars": np.zeros(len(rows), dtype=np.int32),
+    }
+    lists = {name: ([0], []) for name in LIST_COLUMNS}
+
+    for i, page_num in enumerate(rows):
+        text = pages[page_num].replace('\f', '').strip()
+        features = page_features(page_num)
+        columns["chapter"][i] = features.get("chapter") or 0
+        section = PAGE_TO_SECTION.get(page_num) or features.get("section")
+        columns["section"][i] = code("section_table", section)
+        columns["page_type"][i] = code("page_type_table", get_page_type(text, page_num))
+        columns["text_chars"][i] = len(text)
+        for name, table in LIST_COLUMNS.items():
+            offsets, codes = lists[name]
+            codes.extend(code(table, value) for value in features.get(name, []))
+            offsets.append(len(codes))
+
+    for name, (offsets, codes) in lists.items():
+        columns[f"{name}_offsets"] = np.array(offsets, dtype=np.int32)
+        columns[f"{name}_codes"] = np.array(codes, dtype=np.int32)
+    for table, values in tables.items():
+        columns[table] = np.array(list(values), dtype=str)
+    return columns
+
+def load_features(path=FEATURES_FILE):
+    """All columns as a dict of arrays."""
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+def page_values(columns, name, row):
+    """Decoded list feature (algorithms, theorems or complexity) for one row."""
+    offsets = columns[f"{name}_offsets"]
+    codes = columns[f"{name}_codes"][offsets[row]:offsets[row + 1]]
+    return columns[LIST_COLUMNS[name]][codes].tolist()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--benchmark', action='store_true', help="time loading the exported columns")
+    args = parser.parse_args()
+
+    columns = build_columns(load_pages())
+    np.savez(FEATURES_FILE, **columns)
+    print(f"Wrote {FEATURES_FILE} ({FEATURES_FILE.stat().st_size // 1024} KB, "
+          f"{len(columns['page'])} pages, {len(columns)} columns)")
+
+    if args.benchmark:
+        start = time.perf_counter()
+        loaded = load_features()
+        elapsed = (time.perf_counter() - start) * 1000
+        with_algos = int(np.count_nonzero(np.diff(loaded["algorithms_offsets"])))
+        print(f"Loaded all columns in {elapsed:.2f} ms; {with_algos} pages have pseudocode")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Cut the captioned figures out of the page scans as standalone images.
+
+Captions are found in the OCR text ("Figure 6.2 The operation of ..." at the
+start of a line). On those pages the scan is split into blocks of ink rows
+separated by at least BLOCK_GAP blank rows; a block is a drawing if it holds a
+run of ink rows taller than a text line or a horizontal rule of at least
+RULE_MIN pixels (the boxes of array figures), which running text never has.
+Drawing blocks closer than FIGURE_GAP are parts of one figure; figures are
+paired with the captions top to bottom (keeping the tallest when a formula
+also looked like a drawing) and saved as reader/assets/figures/figure-<number>.png.
+
+reader/data/figure-index.json maps
+    "figures": {number: {page, caption, src, x, y, width, height, bytes}}
+    "pages":   {page: [numbers]}
+so the text view can inline a figure instead of linking the full scan.
+Captions without a detected drawing are listed.
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from batch_generate import MANIFEST_FILE
+from build_image_derivatives import image_src, source_image
+from build_image_features import FIGURE_GAP, INK_LEVEL, TEXT_LINE_MAX, runs
+from build_precache import READER_DIR
+from build_search_index import PAGES_DIR
+
+FIGURES_DIR = READER_DIR / "assets" / "figures"
+FIGURE_INDEX_FILE = READER_DIR / "data" / "figure-index.json"
+
+# A caption starts a line and its text starts with a capital or "(a)"; running
+# text that begins a sentence with "Figure 6.2 shows" does not match
+CAPTION_PATTERN = re.compile(r'^[ \t]*Figure[ \t]+((?:\d+|[A-D])\.\d+)[ \t]+(?=[A-Z(])', re.MULTILINE)
+BLOCK_GAP = 20
+RULE_MIN = 120
+FIGURE_PADDING = 8
+
+def captions(text):
+    """(number, caption) for each caption on a page; a caption runs to the next blank line."""
+    found = []
+    for match in CAPTION_PATTERN.finditer(text):
+        paragraph = text[match.start():].split('\n\n', 1)[0]
+        found.append((match.group(1), ' '.join(paragraph.split())))
+    return found
+
+def longest_rules(ink):
+    """Length of the longest horizontal ink run in every row."""
+    edges = np.diff(np.pad(ink, ((0, 0), (1, 1))).view(np.int8), axis=1)
+    start_rows, start_cols = np.nonzero(edges == 1)
+    _, end_cols = np.nonzero(edges == -1)
+    longest = np.zeros(ink.shape[0], dtype=np.int64)
+    np.maximum.at(longest, start_rows, end_cols - start_cols)
+    return longest
+
+def drawing_blocks(ink):
+    """[y0, y1] row spans of the blocks that hold a drawing, top to bottom."""
+    lines = runs(ink.any(axis=1))
+    if not len(lines):
+        return []
+    rules = longest_rules(ink)
+
+    blocks = [[lines[0][0], lines[0][1], False]]
+    for y0, y1 in lines:
+        if y0 - blocks[-1][1] >= BLOCK_GAP:
+            blocks.append([y0, y1, False])
+        blocks[-1][1] = y1
+        blocks[-1][2] |= bool(y1 - y0 > TEXT_LINE_MAX or rules[y0:y1].max() >= RULE_MIN)
+    return [[y0, y1] for y0, y1, drawing in blocks if drawing]
+
+def figure_spans(blocks, count):
+    """Up to count figures: blocks closer than FIGURE_GAP are parts of one figure,
+    and when that leaves more figures than captions the tallest are kept."""
+    spans = []
+    for y0, y1 in blocks:
+        if spans and y0 - spans[-1][1] < FIGURE_GAP:
+            spans[-1][1] = y1
+        else:
+            spans.append([y0, y1])
+    if len(spans) > count:
+        spans = sorted(sorted(spans, key=lambda s: s[0] - s[1])[:count])
+    return spans
+
+def extract_figures(job):
+    """Write the figures of one page; returns (page, figure records, captions without a drawing)."""
+    page_num, page_captions = job
+    source = source_image(page_num)
+    if not source.exists():
+        return page_num, [], [number for number, _ in page_captions]
+    with Image.open(source) as image:
+        gray = image.convert('L')
+    ink = np.asarray(gray) < INK_LEVEL
+
+    spans = figure_spans(drawing_blocks(ink), len(page_captions))
+    if len(spans) < len(page_captions):
+        # Cannot tell which caption lost its drawing, so pair none of them
+        return page_num, [], [number for number, _ in page_captions]
+
+    records = []
+    for (number, caption), (y0, y1) in zip(page_captions, spans):
+        cols = np.flatnonzero(ink[y0:y1].any(axis=0))
+        box = (max(int(cols[0]) - FIGURE_PADDING, 0), max(int(y0) - FIGURE_PADDING, 0),
+               min(int(cols[-1]) + 1 + FIGURE_PADDING, gray.width), min(int(y1) + FIGURE_PADDING, gray.height))
+        target = FIGURES_DIR / f"figure-{number}.png"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        gray.crop(box).save(target, optimize=True)
+        records.append({"number": number, "page": page_num, "caption": caption, "src": image_src(target),
+                        "x": box[0], "y": box[1], "width": box[2] - box[0], "height": box[3] - box[1],
+                        "bytes": target.stat().st_size})
+    return page_num, records, []
+
+def figure_key(number):
+    chapter, index = number.split('.')
+    return (chapter.isdigit(), int(chapter) if chapter.isdigit() else chapter, int(index))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        total_pages = json.load(f)["totalPages"]
+
+    jobs = []
+    for page_num in range(1, total_pages + 1):
+        txt_file = PAGES_DIR / f"page-{page_num:04d}.txt"
+        if txt_file.exists():
+            page_captions = captions(txt_file.read_text(encoding='utf-8', errors='replace'))
+            if page_captions:
+                jobs.append((page_num, page_captions))
+
+    figures, pages, unmatched = {}, {}, []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for page_num, records, missing in pool.map(extract_figures, jobs, chunksize=4):
+            unmatched.extend((page_num, number) for number in missing)
+            for record in records:
+                number = record.pop("number")
+                if number in figures:
+                    unmatched.append((page_num, f"{number} (already on page {figures[number]['page']})"))
+                    continue
+                figures[number] = record
+                pages.setdefault(str(page_num), []).append(number)
+
+    index = {"figures": dict(sorted(figures.items(), key=lambda kv: figure_key(kv[0]))), "pages": pages}
+    with open(FIGURE_INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    total = sum(r["bytes"] for r in figures.values())
+    print(f"Extracted {len(figures)} figures from {len(pages)} pages to {FIGURES_DIR} ({total / 1e6:.1f} MB)")
+    if unmatched:
+        print(f"{len(unmatched)} caption(s) without a detected drawing:")
+        for page_num, number in unmatched[:20]:
+            print(f"  page {page_num}: Figure {number}")
+        if len(unmatched) > 20:
+            print(f"  ... and {len(unmatched) - 20} more")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Crop the blank margins off the page scans for the reader's image view.
+
+The text block of each clrs_pages/clrs-NNNN.png is found from row and column
+ink projections (rows/columns with at least MIN_INK ink pixels), padded by
+CROP_PADDING and cut out at every derivative width in WIDTHS plus the full
+scan, under reader/assets/cropped/w<width>/. The manifest entry of every page
+gets
+
+    "crop": {"x", "y", "width", "height", "pageWidth", "pageHeight",
+             "images": [{pageWidth, width, height, bytes, src}]}
+
+where x/y/width/height and the page size are in original scan pixels and each
+image's pageWidth is the width of the whole page at that image's scale. The reader places the crop at its
+offset inside a frame of the original page size, so positions on the page
+keep their meaning. Blank pages get no crop. Pages are processed in parallel
+and unchanged crops are skipped; changing MIN_INK, CROP_PADDING or the widths
+makes every crop stale (see is_fresh in build_image_derivatives.py).
+Run after a generator (it updates manifest.json in place).
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from batch_generate import MANIFEST_FILE
+from build_image_derivatives import (GRAY_TOLERANCE, WIDTHS, decode_page, image_src, is_fresh, params_key,
+                                     parse_pages, record_params, source_image)
+from build_image_features import ink_projections
+from build_precache import READER_DIR
+
+CROPPED_DIR = READER_DIR / "assets" / "cropped"
+# Ink pixels a row or column needs to count as content; ignores specks of scan noise
+MIN_INK = 2
+CROP_PADDING = 12
+CROPS_KEY = params_key(WIDTHS, GRAY_TOLERANCE, MIN_INK, CROP_PADDING)
+
+def text_block(row_ink, col_ink):
+    """(x0, y0, x1, y1) of the content from ink projections; None for a blank page."""
+    rows = np.flatnonzero(row_ink >= MIN_INK)
+    cols = np.flatnonzero(col_ink >= MIN_INK)
+    if not len(rows) or not len(cols):
+        return None
+    height, width = len(row_ink), len(col_ink)
+    return (max(int(cols[0]) - CROP_PADDING, 0), max(int(rows[0]) - CROP_PADDING, 0),
+            min(int(cols[-1]) + 1 + CROP_PADDING, width), min(int(rows[-1]) + 1 + CROP_PADDING, height))
+
+def write_crops(source, image, projections=None):
+    """Write the missing or stale crops of a decoded scan; returns (crop, written), None if blank."""
+    box = text_block(*(projections or ink_projections(image)))
+    if box is None:
+        return None
+
+    x0, y0, x1, y1 = box
+    cropped = image.crop(box)
+    written = 0
+    images = []
+    for page_width in [w for w in WIDTHS if w < image.width] + [image.width]:
+        scale = page_width / image.width
+        size = (max(round(cropped.width * scale), 1), max(round(cropped.height * scale), 1))
+        target = CROPPED_DIR / f"w{page_width}" / source.name
+        if not is_fresh(target, source, CROPPED_DIR, CROPS_KEY):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            scaled = cropped if page_width == image.width else cropped.resize(size, Image.LANCZOS)
+            scaled.save(target, optimize=True)
+            written += 1
+        images.append({"pageWidth": page_width, "width": size[0], "height": size[1],
+                       "bytes": target.stat().st_size, "src": image_src(target)})
+
+    return {"x": x0, "y": y0, "width": x1 - x0, "height": y1 - y0,
+            "pageWidth": image.width, "pageHeight": image.height, "images": images}, written
+
+def make_crops(page_num):
+    """Write the missing or stale crops of one page; returns (page, crop, original bytes, original pixels, written)."""
+    source = source_image(page_num)
+    if not source.exists():
+        return page_num, None, 0, 0, 0
+    image = decode_page(source)
+    crop, written = write_crops(source, image) or (None, 0)
+    return page_num, crop, source.stat().st_size, image.width * image.height, written
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--pages', metavar='FIRST-LAST', help="only process this page range")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    entries = {entry["page"]: entry for entry in manifest["pages"]}
+
+    written = 0
+    original_bytes = cropped_bytes = original_pixels = cropped_pixels = 0
+    built = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        pages = parse_pages(args.pages, manifest["totalPages"])
+        for page_num, crop, source_bytes, source_pixels, count in pool.map(make_crops, pages, chunksize=8):
+            if crop:
+                built.append(source_image(page_num).stem)
+            if page_num not in entries:
+                continue
+            entries[page_num].pop("crop", None)
+            if not crop:
+                continue
+            entries[page_num]["crop"] = crop
+            written += count
+            full = crop["images"][-1]
+            original_bytes += source_bytes
+            cropped_bytes += full["bytes"]
+            original_pixels += source_pixels
+            cropped_pixels += full["width"] * full["height"]
+
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    record_params(CROPPED_DIR, built, CROPS_KEY)
+
+    print(f"Wrote {written} cropped images to {CROPPED_DIR}")
+    if original_bytes:
+        print(f"Full scans {original_bytes / 1e6:.1f} MB -> cropped {cropped_bytes / 1e6:.1f} MB "
+              f"({(1 - cropped_bytes / original_bytes) * 100:.0f}% smaller), "
+              f"{(1 - cropped_pixels / original_pixels) * 100:.0f}% fewer pixels to decode")
+
+if __name__ == "__main__":
+    main()
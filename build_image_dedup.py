@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate images with perceptual hashes and serve each cluster from
+one canonical file.
+
+Every page scan and every reader/assets/images/*.png gets a 64-bit aHash (8x8
+mean threshold) and dHash (horizontal gradient signs of a 9x8 thumbnail).
+Pairs within HASH_DISTANCE bits on both hashes are only candidates: at 8x8
+most text pages look alike, so a pair counts as a duplicate only if at most
+MAX_CHANGED of its pixels differ by more than NOISE_LEVEL at full resolution.
+Confirmed pairs are clustered and the lowest page (or first file) is the
+canonical copy.
+
+The page -> image index from build_image_index.py is rewritten so duplicate
+pages reference the canonical scan ("duplicateOf" names its page) and share
+its derivatives, so the browser downloads and caches one file per cluster.
+The hashes are only needed by the build: they are added to the full records
+in image-records.json, not to the manifest.
+Prints the clusters and the bytes saved.
+Run after build_image_index.py and build_image_derivatives.py.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from batch_generate import MANIFEST_FILE
+from build_image_derivatives import source_image
+from build_image_index import image_record, manifest_image, save_image_records
+from build_precache import ASSET_GLOBS, READER_DIR, collect_files
+
+HASH_DISTANCE = 4
+NOISE_LEVEL = 32
+MAX_CHANGED = 0.0001
+
+def image_hashes(image):
+    """(aHash, dHash) of a decoded image as 64-bit ints."""
+    gray = image if image.mode == 'L' else image.convert('L')
+    small = np.asarray(gray.resize((8, 8), Image.BOX), dtype=np.float32)
+    wide = np.asarray(gray.resize((9, 8), Image.BOX), dtype=np.float32)
+    ahash = np.packbits(small > small.mean())
+    dhash = np.packbits(wide[:, 1:] > wide[:, :-1])
+    return int.from_bytes(ahash.tobytes(), 'big'), int.from_bytes(dhash.tobytes(), 'big')
+
+def perceptual_hashes(path):
+    """(aHash, dHash) of an image file."""
+    with Image.open(path) as image:
+        return image_hashes(image)
+
+def hamming(value, values):
+    """Bit distance from one uint64 to each of an array of them."""
+    return np.unpackbits((values ^ value).view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+def candidate_pairs(hashes):
+    """Index pairs (i < j) within HASH_DISTANCE on both hashes."""
+    ahash = np.array([a for a, _ in hashes], dtype=np.uint64)
+    dhash = np.array([d for _, d in hashes], dtype=np.uint64)
+    pairs = []
+    for i in range(len(hashes) - 1):
+        near = (hamming(ahash[i], ahash[i + 1:]) <= HASH_DISTANCE) & (hamming(dhash[i], dhash[i + 1:]) <= HASH_DISTANCE)
+        pairs.extend((i, i + 1 + j) for j in np.flatnonzero(near))
+    return pairs
+
+def same_pixels(pair):
+    """True if two images are identical apart from scan noise."""
+    first, second = pair
+    with Image.open(first) as a, Image.open(second) as b:
+        if a.size != b.size:
+            return False
+        diff = np.abs(np.asarray(a.convert('RGB'), dtype=np.int16) - np.asarray(b.convert('RGB'), dtype=np.int16))
+    return (diff.max(axis=2) > NOISE_LEVEL).mean() <= MAX_CHANGED
+
+def clusters(paths, pool):
+    """Groups of near-duplicate paths, canonical (first) path first; singletons are left out."""
+    hashes = list(pool.map(perceptual_hashes, paths, chunksize=8))
+    pairs = candidate_pairs(hashes)
+    confirmed = pool.map(same_pixels, [(paths[i], paths[j]) for i, j in pairs])
+
+    parent = list(range(len(paths)))
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for (i, j), same in zip(pairs, confirmed):
+        if same:
+            a, b = root(i), root(j)
+            parent[max(a, b)] = min(a, b)
+
+    groups = {}
+    for i in range(len(paths)):
+        groups.setdefault(root(i), []).append(i)
+    return hashes, len(pairs), [g for g in groups.values() if len(g) > 1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    entries = [entry for entry in manifest["pages"] if source_image(entry["page"]).exists()]
+    pages = [source_image(entry["page"]) for entry in entries]
+    assets = [READER_DIR / p for p in collect_files(ASSET_GLOBS)]
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        page_hashes, page_candidates, page_groups = clusters(pages, pool)
+        _, asset_candidates, asset_groups = clusters(assets, pool)
+
+    # Rebuild every page's record so pages that stopped being duplicates get their own scan back
+    records = {}
+    for entry, (ahash, dhash) in zip(entries, page_hashes):
+        records[entry["page"]] = {**image_record(source_image(entry["page"])),
+                                  "ahash": f"{ahash:016x}", "dhash": f"{dhash:016x}"}
+        entry["image"] = manifest_image(records[entry["page"]])
+    for group in page_groups:
+        canonical = entries[group[0]]
+        for i in group[1:]:
+            entry = entries[i]
+            entry["image"] = {**canonical["image"], "duplicateOf": canonical["page"]}
+            if "images" in canonical:
+                entry["images"] = canonical["images"]
+
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    save_image_records(records)
+
+    for title, paths, candidates, groups in (("Page scans", pages, page_candidates, page_groups),
+                                             ("reader/assets/images", assets, asset_candidates, asset_groups)):
+        saved = sum(paths[i].stat().st_size for group in groups for i in group[1:])
+        total = sum(p.stat().st_size for p in paths)
+        duplicates = sum(len(group) - 1 for group in groups)
+        print(f"{title}: {len(paths)} images, {candidates} hash candidates, "
+              f"{duplicates} duplicates in {len(groups)} clusters")
+        for group in groups:
+            print(f"  {paths[group[0]].name} <- {', '.join(paths[i].name for i in group[1:])}")
+        if total:
+            print(f"  saves {saved:,} of {total:,} bytes ({saved / total * 100:.2f}%)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Build downscaled copies of the page scans for the reader's image view.
+
+Each clrs_pages/clrs-NNNN.png is resized to every width in WIDTHS that is
+smaller than the scan (scans are never upscaled) and written to
+reader/assets/pages/w<width>/. The manifest entry of every page gets an
+"images" list of {width, height, bytes, src}, smallest first, ending with the
+original scan, so the reader can pick the smallest image that covers the
+current viewport and zoom. Pages are processed in parallel and unchanged
+derivatives are skipped: a derivative is stale when it is older than its scan
+or was built with other settings (image-params.json records the params_key
+each page's outputs were built with, per output directory).
+Run after a generator (it updates manifest.json in place).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from batch_generate import MANIFEST_FILE, PAGES_DIR
+from build_precache import READER_DIR
+
+DERIVATIVES_DIR = READER_DIR / "assets" / "pages"
+# Output directory -> scan stem -> params key its outputs were built with
+BUILD_PARAMS_FILE = READER_DIR.parent / "image-params.json"
+WIDTHS = (400, 800, 1200, 1700)
+# Scans are stored as RGB but are gray apart from rendering noise; derivatives
+# of pages whose channels never differ by more than this are written as 8-bit gray
+GRAY_TOLERANCE = 8
+# Rows per strip when scanning a decoded page; bounds the temporary NumPy buffers
+STRIP_ROWS = 128
+
+_built_params = None
+
+def params_key(*params):
+    """Short hash of the settings an output is built with."""
+    return hashlib.sha256(repr(params).encode()).hexdigest()[:12]
+
+def built_params(directory):
+    """Scan stem -> params key of the outputs under directory, as of the last record_params."""
+    global _built_params
+    if _built_params is None:
+        _built_params = {}
+        if BUILD_PARAMS_FILE.exists():
+            with open(BUILD_PARAMS_FILE, 'r', encoding='utf-8') as f:
+                _built_params = json.load(f)
+    return _built_params.get(str(directory), {})
+
+def record_params(directory, stems, key):
+    """Record that the outputs of these scans under directory were built with key."""
+    built_params(directory)
+    _built_params[str(directory)] = {**_built_params.get(str(directory), {}), **dict.fromkeys(stems, key)}
+    with open(BUILD_PARAMS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(_built_params, f, indent=2, sort_keys=True)
+
+def is_fresh(target, source, directory, key):
+    """True if target exists, is newer than its scan and was built with the settings in key."""
+    return (target.exists() and target.stat().st_mtime >= source.stat().st_mtime
+            and built_params(directory).get(source.stem) == key)
+
+DERIVATIVES_KEY = params_key(WIDTHS, GRAY_TOLERANCE)
+
+def source_image(page_num):
+    """The page scan the reader shows by default."""
+    return PAGES_DIR / f"clrs-{page_num:04d}.png"
+
+def image_src(path):
+    """URL of an image relative to reader/index.html."""
+    return os.path.relpath(path, READER_DIR).replace(os.sep, '/')
+
+def strips(image, mode, y0=0, y1=None):
+    """(y, array) for consecutive strips of STRIP_ROWS rows of an image, converted to mode."""
+    y1 = image.height if y1 is None else y1
+    for y in range(y0, y1, STRIP_ROWS):
+        yield y, np.asarray(image.crop((0, y, image.width, min(y + STRIP_ROWS, y1))).convert(mode))
+
+def is_gray(image):
+    """True if an RGB image only differs from grayscale by noise."""
+    if image.mode == 'L':
+        return True
+    return all(int((pixels.max(axis=2) - pixels.min(axis=2)).max()) <= GRAY_TOLERANCE
+               for _, pixels in strips(image, 'RGB'))
+
+def decode_page(source):
+    """Decode a scan once: 8-bit gray if it only differs from gray by noise, else RGB."""
+    with Image.open(source) as image:
+        image.load()
+        return image.convert('L') if is_gray(image) else image.convert('RGB')
+
+def write_derivatives(source, image):
+    """Write the missing or stale derivatives of a decoded scan; returns (entries, written)."""
+    written = 0
+    entries = []
+    for width in WIDTHS:
+        if width >= image.width:
+            break
+        height = round(image.height * width / image.width)
+        target = DERIVATIVES_DIR / f"w{width}" / source.name
+        if not is_fresh(target, source, DERIVATIVES_DIR, DERIVATIVES_KEY):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            image.resize((width, height), Image.LANCZOS).save(target)
+            written += 1
+        entries.append({"width": width, "height": height,
+                        "bytes": target.stat().st_size, "src": image_src(target)})
+    entries.append({"width": image.width, "height": image.height,
+                    "bytes": source.stat().st_size, "src": image_src(source)})
+    return entries, written
+
+def make_derivatives(page_num):
+    """Write the missing or stale derivatives of one page; returns (page, entries, written)."""
+    source = source_image(page_num)
+    if not source.exists():
+        return page_num, [], 0
+    return (page_num, *write_derivatives(source, decode_page(source)))
+
+def parse_pages(spec, total_pages):
+    """'1-50' -> range(1, 51); None -> every page."""
+    if not spec:
+        return range(1, total_pages + 1)
+    first, _, last = spec.partition('-')
+    return range(int(first), int(last or first) + 1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--pages', metavar='FIRST-LAST', help="only process this page range")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    entries = {entry["page"]: entry for entry in manifest["pages"]}
+
+    written = 0
+    original_bytes = smallest_bytes = 0
+    built = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        pages = parse_pages(args.pages, manifest["totalPages"])
+        for page_num, images, count in pool.map(make_derivatives, pages, chunksize=8):
+            if images:
+                built.append(source_image(page_num).stem)
+            if not images or page_num not in entries:
+                continue
+            entries[page_num]["images"] = images
+            written += count
+            original_bytes += images[-1]["bytes"]
+            smallest_bytes += images[0]["bytes"]
+
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    record_params(DERIVATIVES_DIR, built, DERIVATIVES_KEY)
+
+    print(f"Wrote {written} derivatives to {DERIVATIVES_DIR}")
+    print(f"Full scans {original_bytes / 1e6:.1f} MB, smallest width {smallest_bytes / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Measure ink on the page scans and export it as typed columns in
+reader/data/image-features.npz.
+
+Pixels darker than INK_LEVEL are ink. Per page:
+
+    page            int16     page number
+    ink_density     float32   fraction of ink pixels
+    content_box     int16     (x0, y0, x1, y1) bounding box of all ink, -1 if blank
+    bands_*         int16     CSR (y0, y1) rows of whitespace bands at least BAND_MIN high
+    figures_*       int16     CSR (x0, y0, x1, y1) figure regions
+    kind            int8      code into kind_table: text, blank or figure
+
+Text lines are at most TEXT_LINE_MAX rows of uninterrupted ink; taller runs
+are drawings. Runs closer than FIGURE_GAP are merged into one figure region.
+A page is "figure" when its figures cover FIGURE_SHARE of the content height.
+The generators use page_kind() in place of guessing from the OCR text length,
+and the manifest gets each page's "contentBox" (and "blank") so the reader can
+crop margins without another request.
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from batch_generate import MANIFEST_FILE, PAGES_DIR
+from build_image_derivatives import parse_pages, strips
+
+IMAGE_FEATURES_FILE = PAGES_DIR.parent / "reader" / "data" / "image-features.npz"
+
+# Tuned on the 150 dpi scans
+INK_LEVEL = 160
+BLANK_DENSITY = 0.001
+BAND_MIN = 20
+TEXT_LINE_MAX = 40
+FIGURE_GAP = 60
+FIGURE_SHARE = 0.5
+
+KINDS = ("text", "blank", "figure")
+
+def runs(mask):
+    """(start, end) of every run of True in a 1-D boolean array."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.view(np.int8), [0]))))
+    return edges.reshape(-1, 2)
+
+def ink_projections(image, y0=0, y1=None):
+    """Ink pixels in every row and every column of a decoded scan, a strip of rows at a time."""
+    y1 = image.height if y1 is None else y1
+    rows = np.zeros(y1 - y0, dtype=np.int32)
+    cols = np.zeros(image.width, dtype=np.int32)
+    for y, strip in strips(image, 'L', y0, y1):
+        ink = strip < INK_LEVEL
+        rows[y - y0:y - y0 + len(ink)] = ink.sum(axis=1)
+        cols += ink.sum(axis=0)
+    return rows, cols
+
+def measure_image(image, projections=None):
+    """Ink statistics of a decoded scan."""
+    row_ink, col_ink = projections or ink_projections(image)
+    density = float(row_ink.sum() / (image.width * image.height))
+    ink_rows = row_ink > 0
+    if density < BLANK_DENSITY or not ink_rows.any():
+        return {"density": density, "box": None, "bands": [[0, image.height]], "figures": [], "kind": "blank"}
+
+    rows, cols = np.flatnonzero(ink_rows), np.flatnonzero(col_ink)
+    box = [int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1]
+
+    blank = runs(~ink_rows)
+    bands = blank[blank[:, 1] - blank[:, 0] >= BAND_MIN]
+
+    # Drawings are runs of ink rows taller than a text line; merge runs that are close
+    figures = []
+    lines = runs(ink_rows)
+    for y0, y1 in lines[lines[:, 1] - lines[:, 0] > TEXT_LINE_MAX]:
+        if figures and y0 - figures[-1][1] < FIGURE_GAP:
+            figures[-1][1] = y1
+        else:
+            figures.append([y0, y1])
+    regions = []
+    for y0, y1 in figures:
+        cols = np.flatnonzero(ink_projections(image, int(y0), int(y1))[1])
+        regions.append([int(cols[0]), int(y0), int(cols[-1]) + 1, int(y1)])
+
+    figure_rows = sum(y1 - y0 for _, y0, _, y1 in regions)
+    kind = "figure" if figure_rows >= FIGURE_SHARE * (box[3] - box[1]) else "text"
+    return {"density": density, "box": box, "bands": bands.tolist(), "figures": regions, "kind": kind}
+
+def measure_page(page_num):
+    """Ink statistics of one scan; returns (page, stats) or (page, None) without a scan."""
+    source = PAGES_DIR / f"clrs-{page_num:04d}.png"
+    if not source.exists():
+        return page_num, None
+    with Image.open(source) as image:
+        return page_num, measure_image(image.convert('L'))
+
+def build_columns(stats):
+    """Pack per-page statistics into column arrays."""
+    rows = sorted(stats)
+    columns = {
+        "page": np.array(rows, dtype=np.int16),
+        "ink_density": np.array([stats[p]["density"] for p in rows], dtype=np.float32),
+        "content_box": np.array([stats[p]["box"] or [-1] * 4 for p in rows], dtype=np.int16).reshape(-1, 4),
+        "kind": np.array([KINDS.index(stats[p]["kind"]) for p in rows], dtype=np.int8),
+        "kind_table": np.array(KINDS, dtype=str),
+    }
+    for name, width in (("bands", 2), ("figures", 4)):
+        lists = [stats[p][name] for p in rows]
+        columns[f"{name}_offsets"] = np.cumsum([0] + [len(l) for l in lists], dtype=np.int32)
+        columns[f"{name}_values"] = np.array([v for l in lists for v in l], dtype=np.int16).reshape(-1, width)
+    return columns
+
+_kinds = None
+
+def page_kind(page_num):
+    """Page kind (text, blank or figure) from the exported image features; None if not measured."""
+    global _kinds
+    if _kinds is None:
+        _kinds = {}
+        if IMAGE_FEATURES_FILE.exists():
+            with np.load(IMAGE_FEATURES_FILE, allow_pickle=False) as data:
+                _kinds = dict(zip(data["page"].tolist(), data["kind_table"][data["kind"]].tolist()))
+    return _kinds.get(page_num)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    stats = {}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for page_num, page_stats in pool.map(measure_page, parse_pages(None, manifest["totalPages"]), chunksize=16):
+            if page_stats:
+                stats[page_num] = page_stats
+
+    columns = build_columns(stats)
+    np.savez(IMAGE_FEATURES_FILE, **columns)
+
+    for entry in manifest["pages"]:
+        page_stats = stats.get(entry["page"])
+        entry.pop("contentBox", None)
+        entry.pop("blank", None)
+        if page_stats and page_stats["box"]:
+            entry["contentBox"] = page_stats["box"]
+        elif page_stats:
+            entry["blank"] = True
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    counts = {kind: sum(s["kind"] == kind for s in stats.values()) for kind in KINDS}
+    print(f"Wrote {IMAGE_FEATURES_FILE} ({IMAGE_FEATURES_FILE.stat().st_size // 1024} KB, {len(stats)} pages)")
+    print(', '.join(f"{n} {kind}" for kind, n in counts.items()))
+
+if __name__ == "__main__":
+    main()
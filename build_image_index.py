@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Record which image belongs to which page and validate every mapping.
+
+The reader shows page N as clrs_pages/clrs-NNNN.png. Each manifest page entry
+gets "image": {src, bytes} for its scan, after checking that the file decodes
+(PNG chunk CRCs) and reporting scans whose size differs from the rest of the
+book. The full records ({src, width, height, bytes, hash} per page) are only
+needed by the build and go to image-records.json, outside reader/. Pages without a scan and images that no page maps
+to (e.g. reader/assets/images/*.png) are listed. Exits with status 1 when a
+mapped image is unreadable, so a broken scan never reaches the manifest.
+Run after a generator (it updates manifest.json in place).
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+
+from PIL import Image
+
+from batch_generate import MANIFEST_FILE
+from build_image_derivatives import image_src, source_image
+from build_precache import ASSET_GLOBS, READER_DIR, collect_files, file_hash
+
+IMAGE_RECORDS_FILE = READER_DIR.parent / "image-records.json"
+
+def image_record(path):
+    """Index entry for one image; raises if the file does not decode."""
+    with Image.open(path) as image:
+        width, height = image.size
+        image.verify()
+    return {"src": image_src(path), "width": width, "height": height,
+            "bytes": path.stat().st_size, "hash": file_hash(path)}
+
+def manifest_image(record):
+    """The part of an image record the reader uses."""
+    return {"src": record["src"], "bytes": record["bytes"]}
+
+def load_image_records():
+    """page -> full image record, as last written by save_image_records."""
+    if not IMAGE_RECORDS_FILE.exists():
+        return {}
+    with open(IMAGE_RECORDS_FILE, 'r', encoding='utf-8') as f:
+        return {int(page): record for page, record in json.load(f).items()}
+
+def save_image_records(records):
+    with open(IMAGE_RECORDS_FILE, 'w', encoding='utf-8') as f:
+        json.dump({str(page): records[page] for page in sorted(records)}, f, indent=2)
+
+def format_ranges(pages):
+    """[1, 2, 3, 7] -> '1-3, 7'"""
+    ranges = []
+    for page in sorted(pages):
+        if ranges and page == ranges[-1][1] + 1:
+            ranges[-1][1] = page
+        else:
+            ranges.append([page, page])
+    return ', '.join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--top', type=int, default=10, help="problems to list per kind")
+    args = parser.parse_args()
+
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    missing, broken = [], []
+    mapped = set()
+    records = {}
+    for entry in manifest["pages"]:
+        entry.pop("image", None)
+        source = source_image(entry["page"])
+        if not source.exists():
+            missing.append(entry["page"])
+            continue
+        try:
+            records[entry["page"]] = image_record(source)
+        except Exception as e:
+            broken.append(f"page {entry['page']}: {source.name}: {e}")
+            continue
+        entry["image"] = manifest_image(records[entry["page"]])
+        mapped.add(source.resolve())
+
+    sizes = Counter((r["width"], r["height"]) for r in records.values())
+    odd = []
+    if sizes:
+        usual = sizes.most_common(1)[0][0]
+        odd = [f"page {page}: {r['width']}x{r['height']}"
+               for page, r in records.items() if (r["width"], r["height"]) != usual]
+
+    scans = {p.resolve() for p in source_image(1).parent.glob("clrs-*.png")}
+    assets = {(READER_DIR / p).resolve() for p in collect_files(ASSET_GLOBS)}
+    unmapped = sorted(p.name for p in (scans | assets) - mapped)
+
+    if not broken:
+        with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        save_image_records(records)
+
+    print(f"Mapped {len(records)} of {len(manifest['pages'])} pages to images "
+          f"({sum(r['bytes'] for r in records.values()) / 1e6:.1f} MB)")
+    if missing:
+        print(f"\n{len(missing)} page(s) without an image: {format_ranges(missing)}")
+    for title, problems in (("with an unusual size", odd), ("mapped to no page", unmapped),
+                            ("that do not decode", broken)):
+        if problems:
+            print(f"\n{len(problems)} image(s) {title}:")
+            for problem in problems[:args.top]:
+                print(f"  {problem}")
+            if len(problems) > args.top:
+                print(f"  ... and {len(problems) - args.top} more")
+
+    if broken:
+        print("\nManifest not updated")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Run the per-page image stages on a single decode of each scan.
+
+Run on their own, build_image_derivatives, build_image_crops,
+build_image_tiles, build_image_features and the hashing in build_image_dedup
+each decode every scan. This pipeline decodes a page once (decode_page) and
+hands the same image to every stage:
+
+    features, crops     share one pass of ink projections over row strips of
+                        STRIP_ROWS, so no full-page NumPy mask is built
+    derivatives, tiles  resample from the shared image; tile levels are halved
+                        from the previous level, so at most two are alive
+    hashes              perceptual hashes and the page -> image record
+                        (image-records.json; the manifest gets src and bytes)
+
+This is not a streaming decode: decode_page loads the whole bitmap (and
+converts it once to 8-bit gray or RGB), and the derivatives and tiles resize
+the whole image. Only the ink projections and the gray test work a strip at a
+time. A worker's peak is therefore a few full-page bitmaps, once per page
+instead of once per stage.
+
+--max-memory caps each worker. On Linux it sets the address space limit
+(virtual size, RLIMIT_AS), the same quantity as the "address space" peak
+printed per worker (VmPeak); the resident peak is printed alongside for
+reference. Workers start with the address space of this process, so the cap
+must leave room above it, and a page that would exceed it fails with
+MemoryError. Elsewhere (macOS accepts RLIMIT_AS but does not enforce it) a
+warning is printed and the cap is checked against resident size instead: a
+page is refused when the worker's starting resident size plus DECODE_FACTOR
+times its decoded size (from the PNG header) exceeds the cap, and a page that
+raises the worker's resident peak (ru_maxrss) above the cap is reported after
+it ran. Either way a page over the cap is reported, not the whole build.
+Outputs are the same as the individual stages: the manifest's "images",
+"crop", "contentBox"/"blank" and "image" entries, reader/data/tile-index.json,
+reader/data/image-features.npz and image-records.json.
+Clustering near-duplicates still runs in build_image_dedup.py, after this.
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import build_image_crops
+import build_image_derivatives
+import build_image_tiles
+from batch_generate import MANIFEST_FILE
+from build_image_crops import CROPPED_DIR, CROPS_KEY, make_crops, write_crops
+from build_image_dedup import image_hashes, perceptual_hashes
+from build_image_derivatives import (DERIVATIVES_DIR, DERIVATIVES_KEY, decode_page, make_derivatives, parse_pages,
+                                     record_params, source_image, write_derivatives)
+from build_image_features import IMAGE_FEATURES_FILE, build_columns, ink_projections, measure_image, measure_page
+from build_image_index import image_record, load_image_records, manifest_image, save_image_records
+from build_image_tiles import (TILE_FORMAT, TILE_INDEX_FILE, TILE_SIZE, TILES_DIR, TILES_KEY, make_tiles,
+                               write_tiles)
+
+STAGES = ("features", "crops", "derivatives", "tiles", "hashes")
+# Held by a capped worker and freed when a page hits the cap, so the worker
+# still has room to report the page instead of dying
+RESERVE_BYTES = 8 * 2**20
+# Bytes a page needs per byte of its decoded bitmap where only resident size can
+# be checked: the decode, its gray/RGB conversion and the largest resized copy
+DECODE_FACTOR = 3
+_reserve = None
+# Resident-size fallback: (cap, resident size of the worker before its first page)
+_resident_cap = None
+
+def proc_size(field):
+    """A /proc/self/status size (VmSize now, VmPeak at most) in bytes; None without /proc."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            return next((int(line.split()[1]) * 1024 for line in f if line.startswith(f'{field}:')), None)
+    except OSError:
+        return None
+
+def peak_memory():
+    """(peak address space, peak resident size) of this process in bytes."""
+    resident = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return proc_size('VmPeak'), resident if sys.platform == 'darwin' else resident * 1024
+
+def address_space_enforced():
+    """True where RLIMIT_AS is enforced; macOS accepts the limit but ignores it."""
+    return sys.platform.startswith('linux')
+
+def decoded_size(source):
+    """Bytes of a scan's decoded bitmap, from its header."""
+    with Image.open(source) as image:
+        return image.width * image.height * len(image.getbands())
+
+def limit_memory(max_bytes):
+    """Worker initializer: cap the memory of the worker so an oversized page fails alone."""
+    global _reserve, _resident_cap
+    if not max_bytes:
+        return
+    if address_space_enforced():
+        resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
+        _reserve = bytearray(RESERVE_BYTES)
+    else:
+        _resident_cap = (max_bytes, peak_memory()[1])
+
+def process_page(job):
+    """Decode one scan and run the selected stages on it; returns (page, results or error, pid, peak_memory())."""
+    page_num, stages = job
+    source = source_image(page_num)
+    if not source.exists():
+        return page_num, None, os.getpid(), peak_memory()
+
+    global _reserve
+    results = {}
+    if _resident_cap:
+        cap, start = _resident_cap
+        if start + DECODE_FACTOR * decoded_size(source) > cap:
+            return page_num, "over the memory cap (estimated from its size)", os.getpid(), peak_memory()
+        before = peak_memory()[1]
+    try:
+        if _reserve is not None and not len(_reserve):
+            _reserve = bytearray(RESERVE_BYTES)
+        image = decode_page(source)
+        projections = ink_projections(image) if {"features", "crops"} & stages else None
+        if "features" in stages:
+            results["features"] = measure_image(image, projections)
+        if "crops" in stages:
+            results["crop"] = write_crops(source, image, projections) or (None, 0)
+        if "derivatives" in stages:
+            results["images"] = write_derivatives(source, image)
+        if "tiles" in stages:
+            results["tiles"] = write_tiles(source, image)
+        if "hashes" in stages:
+            ahash, dhash = image_hashes(image)
+            results["image"] = {**image_record(source), "ahash": f"{ahash:016x}", "dhash": f"{dhash:016x}"}
+    except MemoryError:
+        if _reserve is not None:
+            _reserve = bytearray()
+        return page_num, "over the memory cap", os.getpid(), peak_memory()
+    peak = peak_memory()
+    # Only the page that raised the peak over the cap is reported, not every later one
+    if _resident_cap and peak[1] > cap and peak[1] > before:
+        return page_num, f"went over the memory cap ({peak[1] / 2**20:.0f} MB resident)", os.getpid(), peak
+    return page_num, results, os.getpid(), peak
+
+def benchmark(pages):
+    """Time the stages run one after another (a decode each) against one shared decode, in a scratch dir."""
+    def separate(page_num):
+        make_features = measure_page(page_num)
+        make_derivatives(page_num)
+        make_crops(page_num)
+        make_tiles(page_num)
+        return make_features, perceptual_hashes(source_image(page_num))
+
+    timings = {}
+    with tempfile.TemporaryDirectory() as scratch:
+        for name, run in (("separate stages", separate), ("shared decode", lambda p: process_page((p, set(STAGES))))):
+            out = Path(scratch) / name.replace(' ', '-')
+            build_image_derivatives.DERIVATIVES_DIR = out / "pages"
+            build_image_crops.CROPPED_DIR = out / "cropped"
+            build_image_tiles.TILES_DIR = out / "tiles"
+            start = time.perf_counter()
+            for page_num in pages:
+                run(page_num)
+            timings[name] = time.perf_counter() - start
+
+    for name, elapsed in timings.items():
+        print(f"  {name:>16}: {elapsed:.2f} s ({elapsed / len(pages) * 1000:.0f} ms/page)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--pages', metavar='FIRST-LAST', help="only process this page range")
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"comma-separated subset of {','.join(STAGES)}")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--max-memory', type=int, metavar='MB',
+                        help="cap the address space of each worker (compare with the printed address-space peak); "
+                             "resident size where that cannot be enforced")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="time separate stages against the shared decode on --pages, without touching outputs")
+    args = parser.parse_args()
+
+    stages = set(args.stages.split(','))
+    if stages - set(STAGES):
+        parser.error(f"unknown stage(s): {', '.join(sorted(stages - set(STAGES)))}")
+
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    entries = {entry["page"]: entry for entry in manifest["pages"]}
+    pages = parse_pages(args.pages, manifest["totalPages"])
+
+    if args.benchmark:
+        print(f"Benchmark on {len(pages)} pages:")
+        benchmark(pages)
+        return
+
+    tile_index = {"pages": {}}
+    if "tiles" in stages and TILE_INDEX_FILE.exists():
+        with open(TILE_INDEX_FILE, 'r', encoding='utf-8') as f:
+            tile_index = json.load(f)
+
+    stats = {}
+    failed = []
+    peaks = {}
+    written = dict.fromkeys(("crops", "derivatives", "tiles"), 0)
+    built = {"crops": [], "derivatives": [], "tiles": []}
+    records = load_image_records() if "hashes" in stages else {}
+    max_bytes = args.max_memory * 1024 * 1024 if args.max_memory else None
+    enforced = address_space_enforced()
+    if max_bytes and not enforced:
+        print(f"Warning: the address space cannot be capped on {sys.platform}; --max-memory "
+              f"{args.max_memory} is checked against each worker's resident size instead", file=sys.stderr)
+    # Workers are forked from this process, so they start with its address space
+    # (or, where only resident size is checked, roughly its resident size)
+    baseline = proc_size('VmSize') if enforced else peak_memory()[1]
+    if max_bytes and baseline and max_bytes <= baseline + RESERVE_BYTES:
+        parser.error(f"--max-memory {args.max_memory} leaves no room above the "
+                     f"{(baseline + RESERVE_BYTES) / 2**20:.0f} MB a worker starts with")
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=limit_memory, initargs=(max_bytes,)) as pool:
+            for page_num, results, pid, peak in pool.map(process_page, [(p, stages) for p in pages], chunksize=4):
+                peaks[pid] = [max(old or 0, new or 0) if new is not None else old
+                              for old, new in zip(peaks.get(pid, peak), peak)]
+                if isinstance(results, str):
+                    failed.append(f"page {page_num}: {results}")
+                    continue
+                if not results or page_num not in entries:
+                    continue
+                stem = source_image(page_num).stem
+                entry = entries[page_num]
+                if "features" in results:
+                    stats[page_num] = results["features"]
+                    entry.pop("contentBox", None)
+                    entry.pop("blank", None)
+                    if results["features"]["box"]:
+                        entry["contentBox"] = results["features"]["box"]
+                    else:
+                        entry["blank"] = True
+                if "crop" in results:
+                    crop, count = results["crop"]
+                    entry.pop("crop", None)
+                    if crop:
+                        entry["crop"] = crop
+                        built["crops"].append(stem)
+                    written["crops"] += count
+                if "images" in results:
+                    entry["images"], count = results["images"]
+                    written["derivatives"] += count
+                    built["derivatives"].append(stem)
+                if "tiles" in results:
+                    info, count = results["tiles"]
+                    tile_index["pages"][str(page_num)] = info
+                    written["tiles"] += count
+                    built["tiles"].append(stem)
+                if "image" in results:
+                    records[page_num] = results["image"]
+                    entry["image"] = manifest_image(results["image"])
+    except BrokenProcessPool:
+        # A worker can still die outright when the cap leaves it no room at all
+        sys.exit(f"A worker died under the {args.max_memory} MB cap; raise --max-memory" if max_bytes else "A worker died")
+
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    for stage, directory, key in (("crops", CROPPED_DIR, CROPS_KEY), ("derivatives", DERIVATIVES_DIR, DERIVATIVES_KEY),
+                                  ("tiles", TILES_DIR, TILES_KEY)):
+        if built[stage]:
+            record_params(directory, built[stage], key)
+    if "hashes" in stages:
+        save_image_records(records)
+    if "tiles" in stages:
+        tile_index.update(tileSize=TILE_SIZE, overlap=0, format=TILE_FORMAT,
+                          base=build_image_derivatives.image_src(TILES_DIR))
+        tile_index["pages"] = dict(sorted(tile_index["pages"].items(), key=lambda kv: int(kv[0])))
+        with open(TILE_INDEX_FILE, 'w', encoding='utf-8') as f:
+            json.dump(tile_index, f, separators=(',', ':'))
+    if "features" in stages:
+        if args.pages:
+            print(f"Not writing {IMAGE_FEATURES_FILE.name} for a partial page range")
+        else:
+            np.savez(IMAGE_FEATURES_FILE, **build_columns(stats))
+
+    print(f"Processed {len(pages)} pages with one decode each: "
+          + ', '.join(f"{count} {name} written" for name, count in written.items()))
+    cap = ""
+    if args.max_memory:
+        cap = f" ({'address space capped' if enforced else 'resident size checked'} at {args.max_memory} MB)"
+    print(f"Peak memory per worker{cap}:")
+    for virtual, resident in peaks.values():
+        address_space = f"{virtual / 2**20:.0f} MB address space, " if virtual is not None else ""
+        print(f"  {address_space}{resident / 2**20:.0f} MB resident")
+    if failed:
+        print(f"{len(failed)} page(s) failed:")
+        for failure in failed:
+            print(f"  {failure}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
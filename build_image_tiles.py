@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Cut the page scans into deep-zoom tile pyramids for the reader's image view.
+
+Each clrs_pages/clrs-NNNN.png becomes a DZI-style pyramid under
+reader/assets/tiles/:
+
+    clrs-NNNN.dzi                       descriptor (size, tile size, format)
+    clrs-NNNN_files/<level>/<col>_<row>.png
+
+Level L is the scan scaled by 1/2^(maxLevel-L), where maxLevel = ceil(log2 of
+the longer side) is the full scan, so the numbering matches Deep Zoom viewers.
+Levels stop at the first one that fits in a single tile. Tiles are TILE_SIZE
+pixels square (edge tiles are smaller) with no overlap.
+
+reader/data/tile-index.json lists every page's [width, height, maxLevel,
+minLevel], so the reader can fetch only the tiles in the viewport at the
+current zoom. Pages are processed in parallel and unchanged pages are skipped;
+changing TILE_SIZE or TILE_FORMAT makes every pyramid stale (see is_fresh in
+build_image_derivatives.py).
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from batch_generate import MANIFEST_FILE
+from build_image_derivatives import (GRAY_TOLERANCE, decode_page, image_src, is_fresh, params_key, parse_pages,
+                                     record_params, source_image)
+from build_precache import READER_DIR
+
+TILES_DIR = READER_DIR / "assets" / "tiles"
+TILE_INDEX_FILE = READER_DIR / "data" / "tile-index.json"
+TILE_SIZE = 256
+TILE_FORMAT = "png"
+TILES_KEY = params_key(TILE_SIZE, TILE_FORMAT, GRAY_TOLERANCE)
+
+DZI_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" TileSize="{tile}" Overlap="0" Format="{fmt}">
+  <Size Width="{width}" Height="{height}"/>
+</Image>
+"""
+
+def pyramid_levels(width, height):
+    """(maxLevel, minLevel) of a Deep Zoom pyramid that stops at one tile."""
+    max_level = math.ceil(math.log2(max(width, height)))
+    level = max_level
+    while max(width, height) > TILE_SIZE:
+        width, height = math.ceil(width / 2), math.ceil(height / 2)
+        level -= 1
+    return max_level, level
+
+def level_size(width, height, max_level, level):
+    """Pixel size of one pyramid level."""
+    scale = 2 ** (max_level - level)
+    return math.ceil(width / scale), math.ceil(height / scale)
+
+def tiles_fresh(source):
+    """True if the pyramid of a scan is newer than the scan and built with the current settings."""
+    return is_fresh(TILES_DIR / f"{source.stem}.dzi", source, TILES_DIR, TILES_KEY)
+
+def write_tiles(source, image):
+    """Write the pyramid of a decoded scan if missing or stale; returns (info, tiles written)."""
+    max_level, min_level = pyramid_levels(image.width, image.height)
+    info = [image.width, image.height, max_level, min_level]
+    if tiles_fresh(source):
+        return info, 0
+
+    # Tiles cut with another size or format would otherwise be left behind
+    shutil.rmtree(TILES_DIR / f"{source.stem}_files", ignore_errors=True)
+    written = 0
+    scaled = image
+    for level in range(max_level, min_level - 1, -1):
+        width, height = level_size(image.width, image.height, max_level, level)
+        # Each level is halved from the one above, so at most two levels are in memory
+        if scaled.size != (width, height):
+            scaled = scaled.resize((width, height), Image.LANCZOS)
+        level_dir = TILES_DIR / f"{source.stem}_files" / str(level)
+        level_dir.mkdir(parents=True, exist_ok=True)
+        for row in range(math.ceil(height / TILE_SIZE)):
+            for col in range(math.ceil(width / TILE_SIZE)):
+                box = (col * TILE_SIZE, row * TILE_SIZE,
+                       min((col + 1) * TILE_SIZE, width), min((row + 1) * TILE_SIZE, height))
+                scaled.crop(box).save(level_dir / f"{col}_{row}.{TILE_FORMAT}", optimize=True)
+                written += 1
+
+    # The descriptor is written last, so an interrupted page is redone next run
+    (TILES_DIR / f"{source.stem}.dzi").write_text(
+        DZI_TEMPLATE.format(tile=TILE_SIZE, fmt=TILE_FORMAT, width=info[0], height=info[1]), encoding='utf-8')
+    return info, written
+
+def make_tiles(page_num):
+    """Write the pyramid of one page if missing or stale; returns (page, info, tiles written)."""
+    source = source_image(page_num)
+    if not source.exists():
+        return page_num, None, 0
+    if tiles_fresh(source):
+        with Image.open(source) as image:
+            return page_num, [image.width, image.height, *pyramid_levels(image.width, image.height)], 0
+    return (page_num, *write_tiles(source, decode_page(source)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--pages', metavar='FIRST-LAST', help="only process this page range")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        total_pages = json.load(f)["totalPages"]
+
+    index = {"pages": {}}
+    if TILE_INDEX_FILE.exists():
+        with open(TILE_INDEX_FILE, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+
+    written = 0
+    built = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for page_num, info, count in pool.map(make_tiles, parse_pages(args.pages, total_pages), chunksize=4):
+            if info:
+                index["pages"][str(page_num)] = info
+                written += count
+                built.append(source_image(page_num).stem)
+
+    index.update(tileSize=TILE_SIZE, overlap=0, format=TILE_FORMAT, base=image_src(TILES_DIR))
+    index["pages"] = dict(sorted(index["pages"].items(), key=lambda kv: int(kv[0])))
+    with open(TILE_INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    record_params(TILES_DIR, built, TILES_KEY)
+
+    print(f"Wrote {written} tiles to {TILES_DIR}")
+    print(f"Tile index: {len(index['pages'])} pages in {TILE_INDEX_FILE}")
+
+if __name__ == "__main__":
+    main()
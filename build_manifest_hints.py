@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Add prefetch hints to manifest.json.
+Each page entry gets its raw and gzip byte sizes, a content hash and a short
+list of likely next pages, so the reader can prefetch within a byte budget.
+Run after a generator and build_xref_index.py.
+"""
+
+import gzip
+import hashlib
+import json
+
+from batch_generate import OUTPUT_DIR, MANIFEST_FILE, PAGE_TO_SECTION
+from build_xref_index import XREF_INDEX_FILE, decode_postings
+
+# Upper bound on hints per page; order is next page, next section, cross-refs
+MAX_PREFETCH = 4
+
+def page_stats(page_file):
+    """Raw bytes, gzip bytes and short sha256 of one page JSON."""
+    data = page_file.read_bytes()
+    return {
+        "bytes": len(data),
+        "gzipBytes": len(gzip.compress(data, compresslevel=9, mtime=0)),
+        "hash": hashlib.sha256(data).hexdigest()[:16],
+    }
+
+def section_starts():
+    """Sorted first pages of every mapped section."""
+    first_page = {}
+    for page_num, section in PAGE_TO_SECTION.items():
+        first_page[section] = min(page_num, first_page.get(section, page_num))
+    return sorted(set(first_page.values()))
+
+def xref_targets():
+    """{page: definition pages of the algorithms and theorems it uses}."""
+    if not XREF_INDEX_FILE.exists():
+        return {}
+    with open(XREF_INDEX_FILE, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+
+    targets = {}
+    for kind in ("algorithms", "theorems"):
+        for defs, uses in index[kind].values():
+            def_pages = decode_postings(defs)
+            for page_num in decode_postings(uses):
+                for target in def_pages:
+                    if target != page_num:
+                        targets.setdefault(page_num, []).append(target)
+    return targets
+
+def prefetch_hints(page_num, total_pages, starts, xrefs):
+    """Likely next pages for page_num, most likely first."""
+    hints = []
+    if page_num < total_pages:
+        hints.append(page_num + 1)
+    next_start = next((p for p in starts if p > page_num + 1), None)
+    if next_start:
+        hints.append(next_start)
+    for target in xrefs.get(page_num, []):
+        if target not in hints and target != page_num:
+            hints.append(target)
+    return hints[:MAX_PREFETCH]
+
+def main():
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    total_pages = manifest["totalPages"]
+    starts = section_starts()
+    xrefs = xref_targets()
+    total_bytes = 0
+
+    for entry in manifest["pages"]:
+        page_file = OUTPUT_DIR / f"page-{entry['page']:04d}.json"
+        if page_file.exists():
+            entry.update(page_stats(page_file))
+            total_bytes += entry["gzipBytes"]
+        entry["prefetch"] = prefetch_hints(entry["page"], total_pages, starts, xrefs)
+
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"Added hints for {len(manifest['pages'])} pages ({total_bytes // 1024} KB gzipped total)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Emit binary deltas between the previous and current build of each page JSON
+and data bundle, so cached clients can patch instead of re-downloading.
+
+The previous generation is kept in reader/deltas/base/. For every file whose
+hash changed, a patch old -> new is written to reader/deltas/, and
+reader/deltas/index.json maps each file to its current hash and the patches
+that reach it. Hashes match build_precache.py, so the service worker can patch
+the copy it already holds.
+
+Patch format: b'CLD1', varint new length, then ops until the end:
+    0x00 varint offset varint length   copy bytes from the old file
+    0x01 varint length <bytes>         insert literal bytes
+"""
+
+import json
+import shutil
+
+from build_precache import READER_DIR, PAGE_GLOBS, collect_files, file_hash
+
+DELTAS_DIR = READER_DIR / "deltas"
+BASE_DIR = DELTAS_DIR / "base"
+DELTA_INDEX_FILE = DELTAS_DIR / "index.json"
+
+# Page JSON plus the shared data bundles; images are not delta-encoded
+DELTA_GLOBS = PAGE_GLOBS + ["data/*.json"]
+
+MAGIC = b'CLD1'
+OP_COPY = 0
+OP_INSERT = 1
+# Shortest run worth a COPY op; also the block size of the match index
+MIN_MATCH = 16
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+def make_delta(old, new):
+    """Greedy block-matching diff of two byte strings."""
+    index = {}
+    for i in range(len(old) - MIN_MATCH + 1):
+        index.setdefault(old[i:i + MIN_MATCH], i)
+
+    out = bytearray(MAGIC)
+    write_varint(out, len(new))
+    literal_start = 0
+    pos = 0
+
+    def flush_literal(end):
+        if end > literal_start:
+            out.append(OP_INSERT)
+            write_varint(out, end - literal_start)
+            out.extend(new[literal_start:end])
+
+    while pos + MIN_MATCH <= len(new):
+        start = index.get(new[pos:pos + MIN_MATCH])
+        if start is None:
+            pos += 1
+            continue
+        length = MIN_MATCH
+        while pos + length < len(new) and start + length < len(old) and new[pos + length] == old[start + length]:
+            length += 1
+        flush_literal(pos)
+        out.append(OP_COPY)
+        write_varint(out, start)
+        write_varint(out, length)
+        pos += length
+        literal_start = pos
+
+    flush_literal(len(new))
+    return bytes(out)
+
+def apply_delta(old, delta):
+    """Rebuild the new bytes from the old bytes and a patch."""
+    if delta[:4] != MAGIC:
+        raise ValueError("not a CLD1 patch")
+    size, pos = read_varint(delta, 4)
+    out = bytearray()
+    while pos < len(delta):
+        op = delta[pos]
+        pos += 1
+        if op == OP_COPY:
+            start, pos = read_varint(delta, pos)
+            length, pos = read_varint(delta, pos)
+            out.extend(old[start:start + length])
+        elif op == OP_INSERT:
+            length, pos = read_varint(delta, pos)
+            out.extend(delta[pos:pos + length])
+            pos += length
+        else:
+            raise ValueError(f"unknown patch op {op}")
+    if len(out) != size:
+        raise ValueError("patch produced the wrong length")
+    return bytes(out)
+
+def load_index():
+    if DELTA_INDEX_FILE.exists():
+        with open(DELTA_INDEX_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {"generation": 0, "files": {}}
+
+def main():
+    index = load_index()
+    generation = index["generation"] + 1
+    files = {}
+    written = saved = full = 0
+
+    for rel_path in collect_files(DELTA_GLOBS):
+        url = rel_path.as_posix()
+        current = READER_DIR / rel_path
+        base = BASE_DIR / rel_path
+        new_hash = file_hash(current)
+        entry = index["files"].get(url, {})
+
+        if entry.get("hash") == new_hash:
+            files[url] = entry
+            continue
+
+        patches = {}
+        if base.exists():
+            old_hash = file_hash(base)
+            old = base.read_bytes()
+            new = current.read_bytes()
+            delta = make_delta(old, new)
+            if apply_delta(old, delta) != new:
+                raise RuntimeError(f"patch for {url} does not round-trip")
+            if len(delta) < len(new):
+                patch = rel_path.with_name(f"{rel_path.stem}.{old_hash}-{new_hash}.delta")
+                (DELTAS_DIR / patch).parent.mkdir(parents=True, exist_ok=True)
+                (DELTAS_DIR / patch).write_bytes(delta)
+                patches[old_hash] = f"deltas/{patch.as_posix()}"
+                written += 1
+                saved += len(new) - len(delta)
+            else:
+                full += 1
+
+        files[url] = {"hash": new_hash, "generation": generation, "patches": patches}
+        base.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(current, base)
+
+    # Patches whose target is no longer current are dead
+    live = {p for entry in files.values() for p in entry["patches"].values()}
+    for path in DELTAS_DIR.rglob('*.delta'):
+        if f"deltas/{path.relative_to(DELTAS_DIR).as_posix()}" not in live:
+            path.unlink()
+
+    with open(DELTA_INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump({"generation": generation, "files": files}, f, ensure_ascii=False, indent=2)
+
+    print(f"Generation {generation}: {len(files)} files, {written} patches "
+          f"({saved // 1024} KB saved), {full} changed files better sent whole")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Build a single SQLite page store and optionally serve queries from it.
+
+reader/data/pages.db holds:
+    pages(page, title, section, content, hash)    generated page JSON, one row each
+    page_text                                     FTS5 over cleaned OCR text and the
+                                                  plain text of the explanations
+    algorithms(page, name, params, description)   detected pseudocode blocks
+    theorems(page, type, number, name, statement) detected theorems and lemmas
+    xrefs(kind, name, role, page)                 def/use cross-references
+
+`python build_page_store.py --serve 8765` answers, on 127.0.0.1 unless --host
+is given,
+    /page/<n>                        page row
+    /search?q=<query>[&limit=n]      FTS5 ranked pages with snippets (n <= MAX_SEARCH_LIMIT)
+    /xref?kind=<kind>&name=<name>    defining and using pages
+with indexed lookups against the one database file.
+"""
+
+import argparse
+import html
+import json
+import re
+import sqlite3
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from batch_generate import OUTPUT_DIR, PAGE_TO_SECTION
+from build_precache import file_hash
+from build_search_index import PAGES_DIR, load_pages, normalize_text
+from build_xref_index import collect_entities, restore_bounds
+from process_pages_v3 import detect_section, extract_algorithms, extract_theorems
+
+PAGE_STORE_FILE = PAGES_DIR.parent / "reader" / "data" / "pages.db"
+
+TAG_PATTERN = re.compile(r'<[^>]+>')
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+
+SCHEMA = """
+CREATE TABLE pages (page INTEGER PRIMARY KEY, title TEXT, section TEXT, content TEXT, hash TEXT);
+CREATE INDEX pages_section ON pages (section);
+CREATE VIRTUAL TABLE page_text USING fts5(
+    page UNINDEXED, text, explanation, tokenize = 'porter unicode61 remove_diacritics 2');
+CREATE TABLE algorithms (page INTEGER, name TEXT, params TEXT, description TEXT);
+CREATE INDEX algorithms_name ON algorithms (name);
+CREATE TABLE theorems (page INTEGER, type TEXT, number TEXT, name TEXT, statement TEXT);
+CREATE INDEX theorems_number ON theorems (number);
+CREATE TABLE xrefs (kind TEXT, name TEXT, role TEXT, page INTEGER);
+CREATE INDEX xrefs_name ON xrefs (kind, name);
+"""
+
+def plain_text(content):
+    """Visible text of a generated HTML fragment."""
+    return ' '.join(html.unescape(TAG_PATTERN.sub(' ', content)).split())
+
+def build_store(path=PAGE_STORE_FILE):
+    """Write the page store from the page JSON and the OCR text."""
+    pages = load_pages()
+    tmp = path.with_suffix('.tmp')
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp)
+    conn.executescript(SCHEMA)
+
+    for page_num in sorted(pages):
+        text = pages[page_num].replace('\f', '').strip()
+        page_file = OUTPUT_DIR / f"page-{page_num:04d}.json"
+        record = {"title": f"Page {page_num}", "content": ""}
+        if page_file.exists():
+            with open(page_file, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        section = PAGE_TO_SECTION.get(page_num) or detect_section(text)[0]
+
+        conn.execute("INSERT INTO pages VALUES (?, ?, ?, ?, ?)",
+                     (page_num, record["title"], section, record["content"],
+                      file_hash(page_file) if page_file.exists() else None))
+        conn.execute("INSERT INTO page_text VALUES (?, ?, ?)",
+                     (page_num, normalize_text(restore_bounds(text)), plain_text(record["content"])))
+        conn.executemany("INSERT INTO algorithms VALUES (?, ?, ?, ?)",
+                         [(page_num, a['name'], a['params'], a['description']) for a in extract_algorithms(text)])
+        conn.executemany("INSERT INTO theorems VALUES (?, ?, ?, ?, ?)",
+                         [(page_num, t['type'], t['number'], t['name'], t['statement'])
+                          for t in extract_theorems(text)])
+
+    for kind, names in collect_entities(pages).items():
+        conn.executemany("INSERT INTO xrefs VALUES (?, ?, ?, ?)",
+                         [(kind, name, role, p)
+                          for name, roles in names.items()
+                          for role, page_set in roles.items()
+                          for p in sorted(page_set)])
+
+    conn.execute("INSERT INTO page_text(page_text) VALUES ('optimize')")
+    conn.commit()
+    conn.close()
+    tmp.replace(path)
+    return len(pages)
+
+def positive_int(text):
+    """Parse a positive integer from a URL; None for anything else."""
+    if not (text.isascii() and text.isdigit()) or int(text) < 1:
+        return None
+    return int(text)
+
+def get_page(conn, page_num):
+    row = conn.execute("SELECT page, title, section, hash, content FROM pages WHERE page = ?",
+                       (page_num,)).fetchone()
+    return dict(zip(("page", "title", "section", "hash", "content"), row)) if row else None
+
+def search(conn, query, limit=SEARCH_LIMIT):
+    """FTS5 search; every word is quoted so user input is never FTS syntax."""
+    terms = ' '.join('"' + word.replace('"', '""') + '"' for word in query.split())
+    if not terms:
+        return []
+    rows = conn.execute("""
+        SELECT page_text.page, pages.title, snippet(page_text, 1, char(1), char(2), '…', 12)
+        FROM page_text JOIN pages ON pages.page = page_text.page
+        WHERE page_text MATCH ? ORDER BY bm25(page_text) LIMIT ?""", (terms, limit))
+    # Snippets are OCR text; escape it and only then turn the match markers into <mark>
+    return [{"page": p, "title": t,
+             "snippet": html.escape(s).replace('\x01', '<mark>').replace('\x02', '</mark>')}
+            for p, t, s in rows]
+
+def xref(conn, kind, name):
+    """Pages that define and use an algorithm, theorem or complexity bound."""
+    result = {"def": [], "use": []}
+    for role, page_num in conn.execute(
+            "SELECT role, page FROM xrefs WHERE kind = ? AND name = ? ORDER BY page", (kind, name)):
+        result[role].append(page_num)
+    return {"definitions": result["def"], "uses": result["use"]}
+
+class StoreHandler(BaseHTTPRequestHandler):
+    """JSON endpoints over the page store; one read-only connection per request."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        limit = positive_int(params.get('limit', str(SEARCH_LIMIT)))
+        if limit is None:
+            self.send_json(400, {"error": "limit must be a positive integer"})
+            return
+        page_num = positive_int(url.path[6:]) if url.path.startswith('/page/') else None
+        if url.path.startswith('/page/') and page_num is None:
+            self.send_json(400, {"error": "page must be a positive integer"})
+            return
+
+        conn = sqlite3.connect(f"file:{PAGE_STORE_FILE}?mode=ro", uri=True)
+        try:
+            if page_num is not None:
+                # SQLite integers are 64-bit; anything larger cannot be a page
+                body = get_page(conn, page_num) if page_num < 2**63 else None
+            elif url.path == '/search':
+                body = search(conn, params.get('q', ''), min(limit, MAX_SEARCH_LIMIT))
+            elif url.path == '/xref':
+                body = xref(conn, params.get('kind', 'algorithms'), params.get('name', ''))
+            else:
+                body = None
+        finally:
+            conn.close()
+        self.send_json(200 if body is not None else 404, body)
+
+    def send_json(self, status, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--serve', type=int, metavar='PORT',
+                        help="serve page, search and xref queries instead of building")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="interface to serve on (default: local connections only)")
+    args = parser.parse_args()
+
+    if args.serve:
+        print(f"Serving {PAGE_STORE_FILE} on http://{args.host}:{args.serve}")
+        ThreadingHTTPServer((args.host, args.serve), StoreHandler).serve_forever()
+        return
+
+    count = build_store()
+    print(f"Wrote {PAGE_STORE_FILE} ({PAGE_STORE_FILE.stat().st_size // 1024} KB, {count} pages)")
+
+if __name__ == "__main__":
+    main()
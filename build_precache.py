@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Build the service-worker precache for offline reading.
+Page JSON, data bundles and the images the reader shows are copied to
+content-hashed filenames under reader/hashed/, and reader/precache-manifest.json
+lists every file with its hash and size. The service worker (reader/sw.js)
+caches the hashed copies once and only downloads files whose hash changed.
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+from pathlib import Path
+
+READER_DIR = Path("/Users/adrian/personal/clrs/reader")
+HASHED_DIR = READER_DIR / "hashed"
+PRECACHE_MANIFEST_FILE = READER_DIR / "precache-manifest.json"
+
+# Globs relative to READER_DIR; "bundles" are the shared JSON indexes and app code
+PAGE_GLOBS = ["data/pages/page-*.json", "data/pages-cbor/page-*.cbor"]
+BUNDLE_GLOBS = ["data/*.json", "js/*.js", "css/**/*.css", "index.html"]
+# The images the reader shows: page derivatives, cropped pages, TOC sprites and
+# figures. Deep-zoom tiles are left out (a full set is larger than the scans);
+# offline, the reader shows the cropped page instead
+IMAGE_GLOBS = ["assets/pages/w*/*.png", "assets/cropped/w*/*.png", "assets/sprites/*.png", "assets/figures/*.png"]
+# Loose images that no page refers to; checked by the image index, never precached
+ASSET_GLOBS = ["assets/images/*.png"]
+
+HASH_LENGTH = 10
+
+def file_hash(path):
+    """Short sha256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:HASH_LENGTH]
+
+def hashed_name(rel_path, digest):
+    """data/pages/page-0500.json -> data/pages/page-0500.<hash>.json"""
+    return rel_path.with_name(f"{rel_path.stem}.{digest}{rel_path.suffix}")
+
+def collect_files(globs):
+    """Reader-relative paths matching the globs, sorted and de-duplicated."""
+    found = set()
+    for pattern in globs:
+        found.update(p.relative_to(READER_DIR) for p in READER_DIR.glob(pattern) if p.is_file())
+    return sorted(found)
+
+def build_precache(include_images=True):
+    """Copy changed files to hashed names and return the precache manifest."""
+    globs = PAGE_GLOBS + BUNDLE_GLOBS + (IMAGE_GLOBS if include_images else [])
+    entries = []
+    copied = 0
+
+    for rel_path in collect_files(globs):
+        source = READER_DIR / rel_path
+        digest = file_hash(source)
+        hashed = Path("hashed") / hashed_name(rel_path, digest)
+        target = READER_DIR / hashed
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, target)
+            copied += 1
+        entries.append({
+            "url": rel_path.as_posix(),
+            "hashed": hashed.as_posix(),
+            "hash": digest,
+            "bytes": source.stat().st_size,
+        })
+
+    version = hashlib.sha256(''.join(e["url"] + e["hash"] for e in entries).encode()).hexdigest()
+    return {"version": version[:HASH_LENGTH], "files": entries}, copied
+
+def remove_stale(manifest):
+    """Delete hashed copies no longer referenced by the manifest."""
+    live = {READER_DIR / e["hashed"] for e in manifest["files"]}
+    removed = 0
+    for path in HASHED_DIR.rglob('*'):
+        if path.is_file() and path not in live:
+            path.unlink()
+            removed += 1
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--no-images', action='store_true',
+                        help="leave page images out of the offline cache")
+    args = parser.parse_args()
+
+    manifest, copied = build_precache(include_images=not args.no_images)
+    removed = remove_stale(manifest)
+
+    with open(PRECACHE_MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    total = sum(e["bytes"] for e in manifest["files"])
+    print(f"Precache {manifest['version']}: {len(manifest['files'])} files, {total / 1e6:.1f} MB")
+    print(f"Copied {copied} changed files, removed {removed} stale copies")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Build a BM25 search index for the reader.
+Document frequencies, page lengths and per-page term weights are precomputed
+here, so the reader can rank queries without loading any page bodies.
+"""
+
+import json
+import math
+import re
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+from process_pages_v3 import detect_section, extract_algorithms
+
+PAGES_DIR = Path("/Users/adrian/personal/clrs/clrs_pages")
+SEARCH_INDEX_FILE = Path("/Users/adrian/personal/clrs/reader/data/search-index.json")
+TOTAL_PAGES = 1313
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# A term found in a boosted field counts as this many body occurrences
+FIELD_BOOSTS = {
+    "body": 1,
+    "section": 3,
+    "algorithm": 5,
+}
+
+# OCR splits small caps: "I NSERTION -S ORT" -> "INSERTION-SORT"
+SMALL_CAPS_GAP = re.compile(r'\b([A-Z]) ([A-Z]{2,})\b')
+TOKEN_PATTERN = re.compile(r'\d+(?:\.\d+)+|[a-z0-9]+')
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in",
+    "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "was",
+    "we", "which", "with",
+}
+
+def normalize_text(text):
+    """Fold OCR ligatures and small-caps gaps so tokens match what readers type."""
+    text = unicodedata.normalize('NFKC', text.replace('\f', ''))
+    return SMALL_CAPS_GAP.sub(r'\1\2', text)
+
+def tokenize(text):
+    """Split text into lowercase search terms."""
+    return [t for t in TOKEN_PATTERN.findall(normalize_text(text).lower())
+            if len(t) > 1 and t not in STOP_WORDS]
+
+def page_fields(text):
+    """Return the weighted term frequencies for one page."""
+    tf = Counter()
+    for term in tokenize(text):
+        tf[term] += FIELD_BOOSTS["body"]
+
+    section_num, section_title = detect_section(text)
+    if section_num:
+        for term in [section_num] + tokenize(section_title):
+            tf[term] += FIELD_BOOSTS["section"]
+
+    for algo in extract_algorithms(text):
+        for term in tokenize(algo['name'].replace('-', ' ')):
+            tf[term] += FIELD_BOOSTS["algorithm"]
+
+    return tf
+
+def build_index(pages):
+    """Build the BM25 index from a {page_num: text} mapping."""
+    page_tf = {page_num: page_fields(text) for page_num, text in pages.items()}
+    lengths = {page_num: sum(tf.values()) for page_num, tf in page_tf.items()}
+    n = len(page_tf)
+    avg_length = sum(lengths.values()) / n if n else 0
+
+    df = Counter()
+    for tf in page_tf.values():
+        df.update(tf.keys())
+
+    postings = {}
+    for page_num in sorted(page_tf):
+        tf = page_tf[page_num]
+        norm = K1 * (1 - B + B * lengths[page_num] / avg_length)
+        for term, freq in tf.items():
+            idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+            weight = idf * freq * (K1 + 1) / (freq + norm)
+            postings.setdefault(term, []).extend([page_num, round(weight, 3)])
+
+    return {
+        "version": 1,
+        "k1": K1,
+        "b": B,
+        "boosts": FIELD_BOOSTS,
+        "totalPages": n,
+        "avgLength": round(avg_length, 2),
+        # lengths[i] is the weighted length of page i + 1
+        "lengths": [lengths.get(p, 0) for p in range(1, max(lengths, default=0) + 1)],
+        "df": {term: df[term] for term in sorted(df)},
+        # term -> flat [page, weight, page, weight, ...]
+        "postings": {term: postings[term] for term in sorted(postings)},
+    }
+
+def search(index, query, limit=10):
+    """Rank pages for a query by summing their precomputed BM25 weights."""
+    scores = Counter()
+    for term in set(tokenize(query)):
+        flat = index["postings"].get(term, [])
+        for i in range(0, len(flat), 2):
+            scores[flat[i]] += flat[i + 1]
+    return scores.most_common(limit)
+
+def load_pages():
+    """Read all page texts from PAGES_DIR."""
+    pages = {}
+    for page_num in range(1, TOTAL_PAGES + 1):
+        txt_file = PAGES_DIR / f"page-{page_num:04d}.txt"
+        if txt_file.exists():
+            with open(txt_file, 'r', encoding='utf-8', errors='replace') as f:
+                pages[page_num] = f.read()
+    return pages
+
+def main():
+    index = build_index(load_pages())
+
+    SEARCH_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(SEARCH_INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"Indexed {index['totalPages']} pages, {len(index['df'])} terms")
+    print(f"Wrote {SEARCH_INDEX_FILE} ({SEARCH_INDEX_FILE.stat().st_size // 1024} KB)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Check generated page JSON against size budgets.
+Records raw and gzip bytes per page and per section, compares them with the
+previous build's reader/data/size-report.json, prints the largest pages,
+sections and growth, and exits with status 1 when a budget is exceeded.
+The report is only saved as the new baseline when every budget holds.
+Run after a generator.
+"""
+
+import argparse
+import json
+import sys
+
+from batch_generate import OUTPUT_DIR, PAGE_TO_SECTION
+from build_manifest_hints import page_stats
+
+SIZE_REPORT_FILE = OUTPUT_DIR.parent / "size-report.json"
+
+# Default budgets; each can be overridden on the command line
+PAGE_BUDGET = 8 * 1024
+PAGE_GZIP_BUDGET = 4 * 1024
+SECTION_GZIP_BUDGET = 32 * 1024
+TOTAL_GZIP_BUDGET = 1024 * 1024
+# Allowed growth of the total gzip size over the previous build, in percent
+GROWTH_BUDGET = 10.0
+
+UNMAPPED = "unmapped"
+
+def measure():
+    """Per-page and per-section byte counts for the current build."""
+    pages = {}
+    for page_file in sorted(OUTPUT_DIR.glob("page-*.json")):
+        stats = page_stats(page_file)
+        pages[int(page_file.stem[5:])] = {"bytes": stats["bytes"], "gzipBytes": stats["gzipBytes"]}
+
+    sections = {}
+    for page_num, stats in pages.items():
+        entry = sections.setdefault(PAGE_TO_SECTION.get(page_num, UNMAPPED), {"bytes": 0, "gzipBytes": 0, "pages": 0})
+        entry["bytes"] += stats["bytes"]
+        entry["gzipBytes"] += stats["gzipBytes"]
+        entry["pages"] += 1
+
+    return {
+        "totalBytes": sum(s["bytes"] for s in pages.values()),
+        "totalGzipBytes": sum(s["gzipBytes"] for s in pages.values()),
+        "pages": {str(p): s for p, s in pages.items()},
+        "sections": sections,
+    }
+
+def check_budgets(report, previous, args):
+    """List of budget violations as printable strings."""
+    failures = []
+    for page, stats in report["pages"].items():
+        if stats["bytes"] > args.page_budget:
+            failures.append(f"page {page}: {stats['bytes']:,} bytes > {args.page_budget:,}")
+        if stats["gzipBytes"] > args.page_gzip_budget:
+            failures.append(f"page {page}: {stats['gzipBytes']:,} gzip bytes > {args.page_gzip_budget:,}")
+    for section, stats in report["sections"].items():
+        if section != UNMAPPED and stats["gzipBytes"] > args.section_gzip_budget:
+            failures.append(f"section {section}: {stats['gzipBytes']:,} gzip bytes > {args.section_gzip_budget:,}")
+    if report["totalGzipBytes"] > args.total_gzip_budget:
+        failures.append(f"total: {report['totalGzipBytes']:,} gzip bytes > {args.total_gzip_budget:,}")
+    # An empty previous build has no meaningful growth percentage
+    if previous and previous["totalGzipBytes"]:
+        growth = (report["totalGzipBytes"] / previous["totalGzipBytes"] - 1) * 100
+        if growth > args.growth_budget:
+            failures.append(f"total gzip grew {growth:.1f}% since the previous build (budget {args.growth_budget}%)")
+    return failures
+
+def print_report(report, previous, top):
+    """Top offenders by size and by growth since the previous build."""
+    pages = report["pages"]
+    print(f"{len(pages)} pages, {report['totalBytes']:,} bytes, {report['totalGzipBytes']:,} gzip bytes")
+    if previous:
+        delta = report["totalGzipBytes"] - previous["totalGzipBytes"]
+        print(f"Previous build: {previous['totalGzipBytes']:,} gzip bytes ({delta:+,})")
+
+    print("\nLargest pages (gzip):")
+    for page, stats in sorted(pages.items(), key=lambda kv: -kv[1]["gzipBytes"])[:top]:
+        print(f"  page {page:>5} {stats['gzipBytes']:>8,} {stats['bytes']:>9,} raw")
+
+    print("\nLargest sections (gzip):")
+    for section, stats in sorted(report["sections"].items(), key=lambda kv: -kv[1]["gzipBytes"])[:top]:
+        print(f"  {section:>9} {stats['gzipBytes']:>8,} {stats['pages']:>4} pages")
+
+    if previous:
+        old = previous["pages"]
+        growth = sorted(((stats["gzipBytes"] - old.get(page, {}).get("gzipBytes", 0), page)
+                         for page, stats in pages.items()), reverse=True)
+        growth = [(d, p) for d, p in growth[:top] if d > 0]
+        if growth:
+            print("\nLargest growth since previous build (gzip):")
+            for delta, page in growth:
+                print(f"  page {page:>5} {delta:>+8,}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--page-budget', type=int, default=PAGE_BUDGET)
+    parser.add_argument('--page-gzip-budget', type=int, default=PAGE_GZIP_BUDGET)
+    parser.add_argument('--section-gzip-budget', type=int, default=SECTION_GZIP_BUDGET)
+    parser.add_argument('--total-gzip-budget', type=int, default=TOTAL_GZIP_BUDGET)
+    parser.add_argument('--growth-budget', type=float, default=GROWTH_BUDGET,
+                        help="allowed total gzip growth over the previous build, in percent")
+    parser.add_argument('--top', type=int, default=10, help="offenders to list")
+    args = parser.parse_args()
+
+    previous = None
+    if SIZE_REPORT_FILE.exists():
+        with open(SIZE_REPORT_FILE, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+
+    report = measure()
+    print_report(report, previous, args.top)
+    failures = check_budgets(report, previous, args)
+
+    if failures:
+        print(f"\n{len(failures)} budget(s) exceeded:")
+        for failure in failures[:args.top]:
+            print(f"  {failure}")
+        if len(failures) > args.top:
+            print(f"  ... and {len(failures) - args.top} more")
+        sys.exit(1)
+
+    with open(SIZE_REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nAll budgets met; saved {SIZE_REPORT_FILE}")
+
+if __name__ == "__main__":
+    main()
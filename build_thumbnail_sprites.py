@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Pack page thumbnails into sprite sheets for the TOC previews.
+
+Every clrs_pages/clrs-NNNN.png is scaled to fit a THUMB_WIDTH x THUMB_HEIGHT
+cell and up to SHEET_COLUMNS x SHEET_ROWS cells are packed into one sheet under
+reader/assets/sprites/. The pages the reader previews (the chapter rows of
+reader/data/toc.json) go on sheet 0, so opening the TOC fetches one sheet; the
+other pages follow in page order. Sheet file names carry a hash of their
+pages, so a repacked sheet is never served from a stale cache. The manifest
+gets
+
+    "thumbnails": {"width", "height", "sheets": {number: {"src", "width", "height"}}}
+
+and every page entry a "thumb": [sheet, x, y, width, height] offset into its
+sheet. Thumbnails are stored at twice their CSS size for high-density screens.
+Sheets are built in parallel and skipped when newer than all their pages.
+Run after a generator (it updates manifest.json in place).
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image
+
+from batch_generate import MANIFEST_FILE
+from build_image_derivatives import image_src, is_gray, source_image
+from build_precache import READER_DIR
+
+SPRITES_DIR = READER_DIR / "assets" / "sprites"
+THUMB_WIDTH = 96
+THUMB_HEIGHT = 108
+SHEET_COLUMNS = 10
+SHEET_ROWS = 10
+
+TOC_FILE = READER_DIR / "data" / "toc.json"
+
+def previewed_pages():
+    """Pages the reader shows a thumbnail for: the TOC chapter rows, in TOC order."""
+    with open(TOC_FILE, 'r', encoding='utf-8') as f:
+        toc = json.load(f)
+    return list(dict.fromkeys(item["page"] for item in toc if item["type"] == "chapter"))
+
+def sheet_jobs(total_pages):
+    """(sheet, pages) for every sheet: the previewed pages first, then the rest in page order."""
+    per_sheet = SHEET_COLUMNS * SHEET_ROWS
+    previewed = [p for p in previewed_pages() if 1 <= p <= total_pages]
+    rest = [p for p in range(1, total_pages + 1) if p not in set(previewed)]
+    groups = [previewed[i:i + per_sheet] for i in range(0, len(previewed), per_sheet)]
+    groups += [rest[i:i + per_sheet] for i in range(0, len(rest), per_sheet)]
+    return list(enumerate(groups))
+
+def make_sheet(job):
+    """Write one sheet if missing or stale; returns (sheet, sheet info, page offsets, written)."""
+    sheet_num, pages = job
+    sources = [(page_num, source_image(page_num)) for page_num in pages]
+    sources = [(page_num, source) for page_num, source in sources if source.exists()]
+    digest = hashlib.sha256(','.join(str(p) for p, _ in sources).encode()).hexdigest()[:8]
+    target = SPRITES_DIR / f"sprite-{sheet_num:03d}-{digest}.png"
+    stale = not target.exists() or any(s.stat().st_mtime > target.stat().st_mtime for _, s in sources)
+
+    thumbs = []
+    offsets = {}
+    for i, (page_num, source) in enumerate(sources):
+        with Image.open(source) as image:
+            x, y = i % SHEET_COLUMNS * THUMB_WIDTH, i // SHEET_COLUMNS * THUMB_HEIGHT
+            scale = min(THUMB_WIDTH / image.width, THUMB_HEIGHT / image.height)
+            size = (round(image.width * scale), round(image.height * scale))
+            offsets[page_num] = [sheet_num, x, y, *size]
+            if stale:
+                thumbs.append(((x, y), image.convert('RGB').resize(size, Image.LANCZOS)))
+
+    rows = -(-len(sources) // SHEET_COLUMNS)
+    width, height = min(len(sources), SHEET_COLUMNS) * THUMB_WIDTH, rows * THUMB_HEIGHT
+    if stale and thumbs:
+        sheet = Image.new('RGB', (width, height), 'white')
+        for position, thumb in thumbs:
+            sheet.paste(thumb, position)
+        if all(is_gray(thumb) for _, thumb in thumbs):
+            sheet = sheet.convert('L')
+        target.parent.mkdir(parents=True, exist_ok=True)
+        sheet.save(target, optimize=True)
+    info = {"src": image_src(target), "width": width, "height": height}
+    return sheet_num, info, offsets, stale and bool(thumbs)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    entries = {entry["page"]: entry for entry in manifest["pages"]}
+
+    for entry in entries.values():
+        entry.pop("thumb", None)
+
+    sheets = {}
+    written = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for sheet_num, info, offsets, changed in pool.map(make_sheet, sheet_jobs(manifest["totalPages"])):
+            if not offsets:
+                continue
+            sheets[str(sheet_num)] = info
+            written += changed
+            for page_num, offset in offsets.items():
+                if page_num in entries:
+                    entries[page_num]["thumb"] = offset
+
+    manifest["thumbnails"] = {"width": THUMB_WIDTH, "height": THUMB_HEIGHT, "sheets": sheets}
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    live = {os.path.basename(s["src"]) for s in sheets.values()}
+    for path in SPRITES_DIR.glob("sprite-*.png"):
+        if path.name not in live:
+            path.unlink()
+
+    total = sum((SPRITES_DIR / name).stat().st_size for name in live)
+    first = (SPRITES_DIR / os.path.basename(sheets["0"]["src"])).stat().st_size if "0" in sheets else 0
+    print(f"Wrote {written} of {len(sheets)} sprite sheets to {SPRITES_DIR} ({total / 1e6:.1f} MB)")
+    print(f"TOC previews: {len(previewed_pages())} pages on sheet 0 ({first / 1e3:.0f} KB)")
+
+if __name__ == "__main__":
+    main()
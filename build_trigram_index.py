@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Build a trigram index for typo-tolerant search over the OCR page text.
+Text is folded to lowercase alphanumerics before indexing, so small-caps gaps
+("I NSERTION -S ORT"), hyphenation and OCR glyphs like '‚' for Θ still match.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from collections import Counter
+
+from build_search_index import PAGES_DIR, load_pages, normalize_text
+
+TRIGRAM_INDEX_FILE = PAGES_DIR.parent / "reader" / "data" / "trigram-index.json"
+
+# The OCR renders Θ as '‚'; brackets and other punctuation are dropped by fold()
+OCR_GLYPHS = str.maketrans({'‚': 'θ'})
+
+# Fuzzy matches need at least this fraction of the query's trigrams
+MIN_SIMILARITY = 0.6
+
+BENCHMARK_QUERIES = [
+    "insertion sort",
+    "INSERTION-SORT",
+    "I NSERTION -S ORT",
+    "heap extract max",
+    "red-black tree",
+    "dijkstra",
+    "dijkstras algoritm",
+    "knuth morris pratt",
+    "‚(n lg n)",
+    "strongly connected components",
+    "fibonnaci heap",
+    "master theorem",
+]
+
+def fold(text):
+    """Reduce text to the lowercase alphanumeric stream that gets trigrammed."""
+    text = normalize_text(text).translate(OCR_GLYPHS).lower()
+    return ''.join(ch for ch in text if ch.isalnum())
+
+def trigrams(folded):
+    """Return the set of trigrams in a folded string."""
+    return {folded[i:i + 3] for i in range(len(folded) - 2)}
+
+def build_index(pages):
+    """Build {trigram: sorted page list} from a {page_num: text} mapping."""
+    postings = {}
+    for page_num in sorted(pages):
+        for tri in trigrams(fold(pages[page_num])):
+            postings.setdefault(tri, []).append(page_num)
+    return postings
+
+def encode_index(postings):
+    """Delta-encode the posting lists for the JSON written next to the pages."""
+    encoded = {}
+    for tri in sorted(postings):
+        prev = 0
+        deltas = []
+        for page_num in postings[tri]:
+            deltas.append(page_num - prev)
+            prev = page_num
+        encoded[tri] = deltas
+    return {"version": 1, "trigrams": encoded}
+
+def decode_index(data):
+    """Inverse of encode_index."""
+    postings = {}
+    for tri, deltas in data["trigrams"].items():
+        pages = []
+        prev = 0
+        for delta in deltas:
+            prev += delta
+            pages.append(prev)
+        postings[tri] = pages
+    return postings
+
+def substring_candidates(postings, query):
+    """Pages containing every trigram of the query, smallest posting list first."""
+    grams = trigrams(fold(query))
+    if not grams:
+        return []
+    lists = sorted((postings.get(tri, []) for tri in grams), key=len)
+    result = set(lists[0])
+    for pages in lists[1:]:
+        result.intersection_update(pages)
+        if not result:
+            break
+    return sorted(result)
+
+def substring_search(postings, folded_pages, query):
+    """Exact substring search: filter by trigrams, then verify on folded text."""
+    needle = fold(query)
+    if len(needle) < 3:
+        return [p for p, text in sorted(folded_pages.items()) if needle in text]
+    return [p for p in substring_candidates(postings, query) if needle in folded_pages[p]]
+
+def fuzzy_search(postings, query, min_similarity=MIN_SIMILARITY, limit=10):
+    """Rank pages by the fraction of query trigrams they contain."""
+    grams = trigrams(fold(query))
+    if not grams:
+        return []
+    overlap = Counter()
+    for tri in grams:
+        overlap.update(postings.get(tri, ()))
+    needed = min_similarity * len(grams)
+    ranked = [(p, count / len(grams)) for p, count in overlap.most_common() if count >= needed]
+    return ranked[:limit]
+
+def benchmark(postings, folded_pages, rounds=20):
+    """Time substring and fuzzy queries over the whole book."""
+    print(f"{'query':<32} {'hits':>5} {'fuzzy':>5} {'p50 ms':>8} {'max ms':>8}")
+    all_times = []
+    for query in BENCHMARK_QUERIES:
+        times = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            hits = substring_search(postings, folded_pages, query)
+            fuzzy = fuzzy_search(postings, query)
+            times.append((time.perf_counter() - start) * 1000)
+        all_times.extend(times)
+        print(f"{query:<32} {len(hits):>5} {len(fuzzy):>5} "
+              f"{statistics.median(times):>8.3f} {max(times):>8.3f}")
+    all_times.sort()
+    p95 = all_times[int(len(all_times) * 0.95) - 1]
+    print(f"\nAll queries: p50 {statistics.median(all_times):.3f} ms, "
+          f"p95 {p95:.3f} ms, max {all_times[-1]:.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--benchmark', action='store_true',
+                        help="time queries against the freshly built index")
+    args = parser.parse_args()
+
+    pages = load_pages()
+    start = time.perf_counter()
+    postings = build_index(pages)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    TRIGRAM_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(TRIGRAM_INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(encode_index(postings), f, ensure_ascii=False, separators=(',', ':'))
+
+    print(f"Indexed {len(pages)} pages, {len(postings)} trigrams in {build_ms:.0f} ms")
+    print(f"Wrote {TRIGRAM_INDEX_FILE} ({TRIGRAM_INDEX_FILE.stat().st_size // 1024} KB)")
+
+    if args.benchmark:
+        print()
+        benchmark(postings, {p: fold(text) for p, text in pages.items()})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Build the cross-reference index: which pages define or mention each algorithm,
+define or cite each theorem, use each complexity bound, and make up each section.
+Page lists are stored as base64 varint posting lists keyed by entity name, so the
+reader answers "jump to definition" and "where else is this used" with one lookup.
+"""
+
+import base64
+import json
+import re
+
+from batch_generate import PAGE_TO_SECTION
+from build_search_index import PAGES_DIR, load_pages, normalize_text
+from process_pages_v3 import extract_algorithms, extract_complexity, extract_theorems
+
+XREF_INDEX_FILE = PAGES_DIR.parent / "reader" / "data" / "xref-index.json"
+
+ALGO_NAME_PATTERN = re.compile(r'(?<![A-Z\-])[A-Z]{2,}(?:-[A-Z]+)*(?![A-Z\-])')
+# normalize_text closes the gaps inside small caps but not around hyphens: "INSERTION -SORT"
+SMALL_CAPS_HYPHEN = re.compile(r'(?<=[A-Z])[ \t]*-[ \t]*(?=[A-Z])')
+THEOREM_REF_PATTERN = re.compile(r'\b(Theorem|Lemma|Corollary)\s+(\d+\.\d+)')
+# The OCR renders "Θ(n lg n)" as "‚.n lg n/"
+OCR_BOUND_PATTERN = re.compile(r'([OΘΩ‚])\s*\.([^/\n]{1,30})/')
+
+def restore_bounds(text):
+    """Rewrite OCR'd asymptotic bounds into the form extract_complexity expects."""
+    return OCR_BOUND_PATTERN.sub(lambda m: f"{m.group(1).replace('‚', 'Θ')}({m.group(2)})", text)
+
+def encode_postings(pages):
+    """Delta + LEB128 varint encode a sorted page list, as base64 text."""
+    out = bytearray()
+    prev = 0
+    for page_num in pages:
+        delta = page_num - prev
+        prev = page_num
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return base64.b64encode(bytes(out)).decode('ascii')
+
+def decode_postings(encoded):
+    """Inverse of encode_postings."""
+    pages = []
+    prev = 0
+    value = shift = 0
+    for byte in base64.b64decode(encoded):
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        prev += value
+        pages.append(prev)
+        value = shift = 0
+    return pages
+
+def collect_entities(pages):
+    """Scan every page once and gather {kind: {name: {role: set(pages)}}}."""
+    entities = {"algorithms": {}, "theorems": {}, "complexity": {}}
+
+    def add(kind, name, role, page_num):
+        entities[kind].setdefault(name, {}).setdefault(role, set()).add(page_num)
+
+    for page_num in sorted(pages):
+        text = pages[page_num].replace('\f', '').strip()
+        for algo in extract_algorithms(text):
+            add("algorithms", algo['name'], "def", page_num)
+        for thm in extract_theorems(text):
+            add("theorems", f"{thm['type']} {thm['number']}", "def", page_num)
+        for bound in extract_complexity(restore_bounds(text)):
+            if bound.isprintable():
+                add("complexity", bound, "use", page_num)
+
+    # Mentions are only recorded for names that some page defines
+    for page_num in sorted(pages):
+        text = SMALL_CAPS_HYPHEN.sub('-', normalize_text(pages[page_num]))
+        for name in set(ALGO_NAME_PATTERN.findall(text)):
+            if name in entities["algorithms"]:
+                add("algorithms", name, "use", page_num)
+        for kind_word, number in set(THEOREM_REF_PATTERN.findall(text)):
+            add("theorems", f"{kind_word} {number}", "use", page_num)
+
+    return entities
+
+def section_spans():
+    """{section: sorted page list} from the explicit page mapping."""
+    spans = {}
+    for page_num, section in PAGE_TO_SECTION.items():
+        spans.setdefault(section, []).append(page_num)
+    return {section: sorted(p) for section, p in spans.items()}
+
+def build_index(pages):
+    """Build the encoded cross-reference index."""
+    index = {"version": 1}
+    for kind, names in collect_entities(pages).items():
+        index[kind] = {
+            name: [encode_postings(sorted(roles.get("def", ()))),
+                   encode_postings(sorted(roles.get("use", ())))]
+            for name, roles in sorted(names.items())
+        }
+    # section -> [first page, last page, postings]
+    index["sections"] = {
+        section: [p[0], p[-1], encode_postings(p)]
+        for section, p in sorted(section_spans().items())
+    }
+    return index
+
+def lookup(index, kind, name):
+    """Return (defining pages, using pages) for an entity."""
+    if kind == "sections":
+        entry = index["sections"].get(name)
+        return (decode_postings(entry[2]), []) if entry else ([], [])
+    entry = index[kind].get(name)
+    if not entry:
+        return [], []
+    return decode_postings(entry[0]), decode_postings(entry[1])
+
+def main():
+    index = build_index(load_pages())
+
+    XREF_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(XREF_INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    counts = ', '.join(f"{len(index[k])} {k}" for k in ("algorithms", "theorems", "complexity", "sections"))
+    print(f"Indexed {counts}")
+    print(f"Wrote {XREF_INDEX_FILE} ({XREF_INDEX_FILE.stat().st_size // 1024} KB)")
+
+if __name__ == "__main__":
+    main()
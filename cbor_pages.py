@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Binary page output: each page record (page, title, content plus extracted
+features) encoded as CBOR (RFC 8949) instead of indented JSON.
+
+Only the subset the records use is supported: unsigned/negative ints, floats,
+text, bytes, arrays, maps, booleans and null. reader/js/cbor.js is the matching
+decoder; read_page() is the Python reader API.
+"""
+
+import argparse
+import json
+import statistics
+import struct
+import time
+
+from batch_generate import OUTPUT_DIR, MANIFEST_FILE
+from build_search_index import PAGES_DIR
+from build_xref_index import restore_bounds
+from process_pages_v3 import (detect_chapter, detect_section, extract_algorithms,
+                              extract_complexity, extract_theorems)
+
+CBOR_DIR = OUTPUT_DIR.parent / "pages-cbor"
+
+# Major types
+UNSIGNED, NEGATIVE, BYTES, TEXT, ARRAY, MAP, SIMPLE = 0, 1, 2, 3, 4, 5, 7
+FALSE, TRUE, NULL, FLOAT64 = 0xF4, 0xF5, 0xF6, 0xFB
+
+def _head(out, major, value):
+    if value < 24:
+        out.append(major << 5 | value)
+    elif value < 0x100:
+        out.append(major << 5 | 24)
+        out.append(value)
+    elif value < 0x10000:
+        out.append(major << 5 | 25)
+        out.extend(struct.pack('>H', value))
+    elif value < 0x100000000:
+        out.append(major << 5 | 26)
+        out.extend(struct.pack('>I', value))
+    else:
+        out.append(major << 5 | 27)
+        out.extend(struct.pack('>Q', value))
+
+def _encode(out, obj):
+    if obj is None:
+        out.append(NULL)
+    elif obj is True:
+        out.append(TRUE)
+    elif obj is False:
+        out.append(FALSE)
+    elif isinstance(obj, int):
+        if obj >= 0:
+            _head(out, UNSIGNED, obj)
+        else:
+            _head(out, NEGATIVE, -1 - obj)
+    elif isinstance(obj, float):
+        out.append(FLOAT64)
+        out.extend(struct.pack('>d', obj))
+    elif isinstance(obj, str):
+        data = obj.encode('utf-8')
+        _head(out, TEXT, len(data))
+        out.extend(data)
+    elif isinstance(obj, (bytes, bytearray)):
+        _head(out, BYTES, len(obj))
+        out.extend(obj)
+    elif isinstance(obj, (list, tuple)):
+        _head(out, ARRAY, len(obj))
+        for item in obj:
+            _encode(out, item)
+    elif isinstance(obj, dict):
+        _head(out, MAP, len(obj))
+        for key, value in obj.items():
+            _encode(out, key)
+            _encode(out, value)
+    else:
+        raise TypeError(f"cannot CBOR-encode {type(obj).__name__}")
+
+def encode(obj):
+    """Encode a JSON-like object as CBOR bytes."""
+    out = bytearray()
+    _encode(out, obj)
+    return bytes(out)
+
+def _decode(data, pos):
+    initial = data[pos]
+    pos += 1
+    major, info = initial >> 5, initial & 0x1F
+
+    if major == SIMPLE:
+        if initial == FALSE:
+            return False, pos
+        if initial == TRUE:
+            return True, pos
+        if initial == NULL:
+            return None, pos
+        if initial == FLOAT64:
+            return struct.unpack_from('>d', data, pos)[0], pos + 8
+        raise ValueError(f"unsupported CBOR simple value {initial:#x}")
+
+    if info < 24:
+        value = info
+    elif info == 24:
+        value = data[pos]
+        pos += 1
+    elif info == 25:
+        value = struct.unpack_from('>H', data, pos)[0]
+        pos += 2
+    elif info == 26:
+        value = struct.unpack_from('>I', data, pos)[0]
+        pos += 4
+    elif info == 27:
+        value = struct.unpack_from('>Q', data, pos)[0]
+        pos += 8
+    else:
+        raise ValueError(f"unsupported CBOR length encoding {info}")
+
+    if major == UNSIGNED:
+        return value, pos
+    if major == NEGATIVE:
+        return -1 - value, pos
+    if major == BYTES:
+        return bytes(data[pos:pos + value]), pos + value
+    if major == TEXT:
+        return data[pos:pos + value].decode('utf-8'), pos + value
+    if major == ARRAY:
+        items = []
+        for _ in range(value):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return items, pos
+    if major == MAP:
+        result = {}
+        for _ in range(value):
+            key, pos = _decode(data, pos)
+            result[key], pos = _decode(data, pos)
+        return result, pos
+    raise ValueError(f"unsupported CBOR major type {major}")
+
+def decode(data):
+    """Decode CBOR bytes produced by encode()."""
+    obj, pos = _decode(data, 0)
+    if pos != len(data):
+        raise ValueError("trailing bytes after CBOR item")
+    return obj
+
+def page_features(page_num):
+    """Features extracted from the page text, as plain JSON-like values."""
+    txt_file = PAGES_DIR / f"page-{page_num:04d}.txt"
+    if not txt_file.exists():
+        return {}
+    with open(txt_file, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read().replace('\f', '').strip()
+
+    section_num, section_title = detect_section(text)
+    return {
+        "chapter": detect_chapter(text),
+        "section": section_num,
+        "sectionTitle": section_title,
+        "algorithms": [a['name'] for a in extract_algorithms(text)],
+        "theorems": [f"{t['type']} {t['number']}" for t in extract_theorems(text)],
+        "complexity": sorted(b for b in extract_complexity(restore_bounds(text)) if b.isprintable()),
+    }
+
+def page_record(page_num):
+    """The page JSON written by the generators plus its extracted features."""
+    with open(OUTPUT_DIR / f"page-{page_num:04d}.json", 'r', encoding='utf-8') as f:
+        record = json.load(f)
+    record["features"] = page_features(page_num)
+    return record
+
+def read_page(page_num):
+    """Python reader API: load one page record from its CBOR file."""
+    return decode((CBOR_DIR / f"page-{page_num:04d}.cbor").read_bytes())
+
+def benchmark(records, rounds=5):
+    """Compare encode/decode time and size against json.dump(..., indent=2)."""
+    formats = {
+        "json indent=2": (lambda r: json.dumps(r, ensure_ascii=False, indent=2).encode('utf-8'),
+                          lambda b: json.loads(b)),
+        "json compact": (lambda r: json.dumps(r, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+                         lambda b: json.loads(b)),
+        "cbor": (encode, decode),
+    }
+    print(f"{'format':<16} {'encode ms':>10} {'decode ms':>10} {'bytes':>12} {'vs json':>8}")
+    baseline = None
+    for name, (enc, dec) in formats.items():
+        encode_times, decode_times = [], []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            blobs = [enc(r) for r in records]
+            encode_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            for blob in blobs:
+                dec(blob)
+            decode_times.append(time.perf_counter() - start)
+        size = sum(len(b) for b in blobs)
+        baseline = baseline or size
+        print(f"{name:<16} {statistics.median(encode_times) * 1000:>10.1f} "
+              f"{statistics.median(decode_times) * 1000:>10.1f} {size:>12,} {size / baseline:>7.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--benchmark', action='store_true',
+                        help="compare against the JSON page output")
+    parser.add_argument('--use-in-reader', action='store_true',
+                        help="set pageFormat=cbor in manifest.json so the reader loads .cbor pages")
+    args = parser.parse_args()
+
+    with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    CBOR_DIR.mkdir(parents=True, exist_ok=True)
+    records = []
+    for entry in manifest["pages"]:
+        if not (OUTPUT_DIR / f"page-{entry['page']:04d}.json").exists():
+            continue
+        record = page_record(entry["page"])
+        (CBOR_DIR / f"page-{entry['page']:04d}.cbor").write_bytes(encode(record))
+        records.append(record)
+
+    if args.use_in_reader:
+        manifest["pageFormat"] = "cbor"
+        with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    print(f"Wrote {len(records)} CBOR pages to {CBOR_DIR}")
+
+    if args.benchmark:
+        print()
+        benchmark(records)
+
+if __name__ == "__main__":
+    main()
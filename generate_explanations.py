@@ -4,14 +4,20 @@ Generate educational explanations for all CLRS pages.
 This script creates rich, educational content for each page.
 """
 
-import json
+import argparse
 import re
 import html
 from pathlib import Path
 
+from output_sinks import add_sink_arguments, json_bytes, open_sinks
+from templates import compile_template, render_each
+
 PAGES_DIR = Path("/Users/adrian/personal/clrs/clrs_pages")
 OUTPUT_DIR = Path("/Users/adrian/personal/clrs/reader/data/pages")
 MANIFEST_FILE = Path("/Users/adrian/personal/clrs/reader/data/manifest.json")
+# Display math and matrices make prose pages look like figures in the scans, so
+# the scan verdict only counts when the OCR text is this short (labels only)
+FIGURE_TEXT_MAX = 600
 
 # ============== ALGORITHM EXPLANATIONS ==============
 ALGO_EXPLANATIONS = {
@@ -488,10 +494,138 @@ def get_page_type(text, page_num):
         return "preface"
     return "content"
 
+# Pseudocode keywords in bold, case-insensitive, written in their canonical case
+KEYWORDS = ['for', 'while', 'if', 'else', 'elseif', 'return', 'error', 'to', 'downto', 'do', 'and', 'or', 'not', 'NIL', 'TRUE', 'FALSE', 'then']
+KEYWORD_CASE = {kw.lower(): kw for kw in KEYWORDS}
+KEYWORD_PATTERN = re.compile(r'\b(' + '|'.join(KEYWORDS) + r')\b', re.IGNORECASE)
+
+CODE_LINE = compile_template('<span style="color:#64748b">{num}</span>  {content|raw}')
+
+EXPLANATION_LINE = compile_template('<p><strong>{label}:</strong> {text}</p>')
+
+COMPLEXITY_LINE = compile_template('<p><strong>Complexity:</strong> <span class="complexity">{text}</span></p>')
+
+ALGO_BLOCK = compile_template('''
+<div class="definition-box">
+    <h4>{name}({params})</h4>
+    <p><em>{simple}</em></p>
+</div>
+<div class="algorithm">
+    <pre style="font-size:0.82rem;line-height:1.7;">{code_html|raw}</pre>
+</div>
+<div class="highlight-box">
+    <h4>Understanding {name}</h4>
+    {explanation_html|raw}
+</div>''')
+
+THEOREM_BLOCK = compile_template('''
+<div class="theorem-box">
+    <h4>{type_n} {num}{name}</h4>
+    <p style="font-style:italic;">{statement}</p>
+</div>''')
+
+LIST_ITEM = compile_template('<li>{text}</li>')
+
+CHAPTER_INTRO = compile_template('''
+<div class="definition-box">
+    <h4>Chapter Overview</h4>
+    <p>{summary}</p>
+</div>
+<div class="highlight-box">
+    <h4>Key Concepts</h4>
+    <ul>{concepts_html|raw}</ul>
+</div>
+<div class="figure-box">
+    <h4>Real-World Applications</h4>
+    <p>{real_world}</p>
+</div>''')
+
+TOC_PAGE = '''<div class="article-header">
+    <div class="section-label">Front Matter</div>
+    <h1>Table of Contents</h1>
+</div>
+<div class="original-content">
+    <p>This page contains the table of contents. Use the image view (press <kbd>V</kbd>) to see the full layout.</p>
+    <div class="highlight-box">
+        <h4>Navigation Tip</h4>
+        <p>You can use the search function in the menu to find specific topics or algorithms.</p>
+    </div>
+</div>'''
+
+EXERCISES_PAGE = compile_template('''<div class="article-header">
+    <div class="section-label">{label}</div>
+    <h1>Exercises</h1>
+</div>
+<div class="original-content">
+    <div class="highlight-box">
+        <h4>Practice Problems</h4>
+        <p>This page contains exercises to test your understanding. Working through problems is essential for mastering algorithms!</p>
+    </div>
+    <p><strong>Tip:</strong> Try solving problems on paper before looking at solutions. The struggle is part of learning.</p>
+</div>
+<div class="analysis-section">
+    <h3>Study Tips</h3>
+    <div class="analysis-block">
+        <div class="analysis-item">
+            <h5>How to Approach Problems</h5>
+            <ul>
+                <li>Read the problem carefully - what are the inputs and outputs?</li>
+                <li>Think about edge cases</li>
+                <li>Consider multiple approaches before coding</li>
+                <li>Analyze time and space complexity</li>
+            </ul>
+        </div>
+    </div>
+</div>''')
+
+FIGURE_PAGE = compile_template('''<div class="article-header">
+    <div class="section-label">{label}</div>
+    <h1>{title}</h1>
+</div>
+<div class="original-content">
+    <p><em>This page contains primarily figures or diagrams. Switch to image view (press <kbd>V</kbd>) to see the visual content.</em></p>
+</div>''')
+
+PARAGRAPH = compile_template('<p>{text}</p>')
+
+ALGO_SUMMARY = compile_template('<li><strong>{name}</strong>: {simple}</li>')
+
+ALGO_SUMMARY_ITEM = compile_template('''
+<div class="analysis-item">
+    <h5>Algorithms Summary</h5>
+    <ul>{summaries_html|raw}</ul>
+</div>''')
+
+CHAPTER_CONTEXT_ITEM = compile_template('''
+<div class="analysis-item">
+    <h5>Chapter Context</h5>
+    <p><strong>Chapter {chapter}: {name}</strong></p>
+    <p>{summary}</p>
+</div>''')
+
+STUDY_NOTE_ITEM = '''
+<div class="analysis-item">
+    <h5>Study Note</h5>
+    <p>This page covers foundational material from CLRS. Take time to understand each concept before moving on.</p>
+</div>'''
+
+PAGE = compile_template('''<div class="article-header">
+    <div class="section-label">{label}</div>
+    <h1>{title}</h1>
+</div>
+<div class="original-content">
+    {content|raw}
+</div>
+<div class="analysis-section">
+    <h3>Quick Reference</h3>
+    <div class="analysis-block">
+        {analysis_html|raw}
+    </div>
+</div>''')
+
 def create_algo_html(algo):
     """Create HTML for algorithm with explanation."""
     name = algo['name']
-    params = html.escape(algo['params'])
 
     # Get explanation
     expl = ALGO_EXPLANATIONS.get(name, {})
@@ -508,67 +642,55 @@ def create_algo_html(algo):
             continue
         match = re.match(r'^(\d+)\s+(.*)$', line)
         if match:
-            num = match.group(1)
-            content = html.escape(match.group(2))
-            for kw in ['for', 'while', 'if', 'else', 'elseif', 'return', 'error', 'to', 'downto', 'do', 'and', 'or', 'not', 'NIL', 'TRUE', 'FALSE', 'then']:
-                content = re.sub(rf'\b{kw}\b', f'<b>{kw}</b>', content, flags=re.IGNORECASE)
-            code_lines.append(f'<span style="color:#64748b">{num:>2}</span>  {content}')
-    code_html = '\n'.join(code_lines)
+            content = KEYWORD_PATTERN.sub(lambda m: f'<b>{KEYWORD_CASE[m.group(1).lower()]}</b>',
+                                          html.escape(match.group(2)))
+            code_lines.append(CODE_LINE.render(num=f"{match.group(1):>2}", content=content))
 
     explanation_parts = []
     if how:
-        explanation_parts.append(f'<p><strong>How it works:</strong> {html.escape(how)}</p>')
+        explanation_parts.append(EXPLANATION_LINE.render(label="How it works", text=how))
     if when:
-        explanation_parts.append(f'<p><strong>When to use:</strong> {html.escape(when)}</p>')
+        explanation_parts.append(EXPLANATION_LINE.render(label="When to use", text=when))
     if complexity:
-        explanation_parts.append(f'<p><strong>Complexity:</strong> <span class="complexity">{html.escape(complexity)}</span></p>')
-
-    explanation_html = '\n'.join(explanation_parts)
-
-    return f'''
-<div class="definition-box">
-    <h4>{html.escape(name)}({params})</h4>
-    <p><em>{html.escape(simple)}</em></p>
-</div>
-<div class="algorithm">
-    <pre style="font-size:0.82rem;line-height:1.7;">{code_html}</pre>
-</div>
-<div class="highlight-box">
-    <h4>Understanding {html.escape(name)}</h4>
-    {explanation_html}
-</div>'''
+        explanation_parts.append(COMPLEXITY_LINE.render(text=complexity))
+
+    return ALGO_BLOCK.render(
+        name=name,
+        params=algo['params'],
+        simple=simple,
+        code_html='\n'.join(code_lines),
+        explanation_html='\n'.join(explanation_parts),
+    )
 
 def create_theorem_html(thm):
     """Create HTML for theorem."""
-    return f'''
-<div class="theorem-box">
-    <h4>{html.escape(thm["type"])} {html.escape(thm["number"])}{" (" + html.escape(thm["name"]) + ")" if thm["name"] else ""}</h4>
-    <p style="font-style:italic;">{html.escape(thm["statement"])}</p>
-</div>'''
+    return THEOREM_BLOCK.render(
+        type_n=thm["type"],
+        num=thm["number"],
+        name=f" ({thm['name']})" if thm["name"] else "",
+        statement=thm["statement"],
+    )
 
 def create_chapter_intro_html(chapter):
     """Create chapter introduction."""
     info = CHAPTER_INFO.get(chapter, {})
-    name = info.get('name', f'Chapter {chapter}')
-    summary = info.get('summary', '')
     concepts = info.get('key_concepts', [])
-    real_world = info.get('real_world', '')
 
-    concepts_html = ''.join([f'<li>{html.escape(c)}</li>' for c in concepts])
+    return CHAPTER_INTRO.render(
+        summary=info.get('summary', ''),
+        concepts_html=render_each(LIST_ITEM, [{"text": c} for c in concepts], sep=''),
+        real_world=info.get('real_world', ''),
+    )
 
-    return f'''
-<div class="definition-box">
-    <h4>Chapter Overview</h4>
-    <p>{html.escape(summary)}</p>
-</div>
-<div class="highlight-box">
-    <h4>Key Concepts</h4>
-    <ul>{concepts_html}</ul>
-</div>
-<div class="figure-box">
-    <h4>Real-World Applications</h4>
-    <p>{html.escape(real_world)}</p>
-</div>'''
+def figure_page(page_num, text):
+    """True if a page is mostly figures: almost no text, or a blank or figure scan with sparse text."""
+    if len(text) < 50:
+        return True
+    if len(text) >= FIGURE_TEXT_MAX:
+        return False
+    # Imported here so the generators do not load NumPy and PIL just to start
+    from build_image_features import page_kind
+    return page_kind(page_num) in ("blank", "figure")
 
 def process_page(page_num):
     """Process a single page."""
@@ -605,61 +727,22 @@ def process_page(page_num):
         return {
             "page": page_num,
             "title": "Table of Contents",
-            "content": f'''<div class="article-header">
-    <div class="section-label">Front Matter</div>
-    <h1>Table of Contents</h1>
-</div>
-<div class="original-content">
-    <p>This page contains the table of contents. Use the image view (press <kbd>V</kbd>) to see the full layout.</p>
-    <div class="highlight-box">
-        <h4>Navigation Tip</h4>
-        <p>You can use the search function in the menu to find specific topics or algorithms.</p>
-    </div>
-</div>'''
+            "content": TOC_PAGE
         }
 
     if page_type == "exercises":
         return {
             "page": page_num,
             "title": title if section_num else "Exercises",
-            "content": f'''<div class="article-header">
-    <div class="section-label">{html.escape(label)}</div>
-    <h1>Exercises</h1>
-</div>
-<div class="original-content">
-    <div class="highlight-box">
-        <h4>Practice Problems</h4>
-        <p>This page contains exercises to test your understanding. Working through problems is essential for mastering algorithms!</p>
-    </div>
-    <p><strong>Tip:</strong> Try solving problems on paper before looking at solutions. The struggle is part of learning.</p>
-</div>
-<div class="analysis-section">
-    <h3>Study Tips</h3>
-    <div class="analysis-block">
-        <div class="analysis-item">
-            <h5>How to Approach Problems</h5>
-            <ul>
-                <li>Read the problem carefully - what are the inputs and outputs?</li>
-                <li>Think about edge cases</li>
-                <li>Consider multiple approaches before coding</li>
-                <li>Analyze time and space complexity</li>
-            </ul>
-        </div>
-    </div>
-</div>'''
+            "content": EXERCISES_PAGE.render(label=label)
         }
 
-    if len(text) < 50:
+    # Scan statistics (build_image_features.py) catch figure pages with OCR'd labels
+    if figure_page(page_num, text):
         return {
             "page": page_num,
             "title": title,
-            "content": f'''<div class="article-header">
-    <div class="section-label">{html.escape(label)}</div>
-    <h1>{html.escape(title)}</h1>
-</div>
-<div class="original-content">
-    <p><em>This page contains primarily figures or diagrams. Switch to image view (press <kbd>V</kbd>) to see the visual content.</em></p>
-</div>'''
+            "content": FIGURE_PAGE.render(label=label, title=title)
         }
 
     # Build main content
@@ -681,58 +764,31 @@ def process_page(page_num):
     if not algorithms and not theorems:
         paragraphs = [p.strip() for p in text.split('\n\n') if len(p.strip()) > 80]
         for p in paragraphs[:3]:
-            parts.append(f'<p>{html.escape(p)}</p>')
+            parts.append(PARAGRAPH.render(text=p))
 
-    content = '\n'.join(parts) if parts else f'<p>{html.escape(text[:800])}</p>'
+    content = '\n'.join(parts) if parts else PARAGRAPH.render(text=text[:800])
 
     # Analysis section
     analysis_items = []
 
     if algorithms:
-        algo_summaries = ''.join([
-            f'<li><strong>{html.escape(a["name"])}</strong>: {html.escape(ALGO_EXPLANATIONS.get(a["name"], {}).get("simple", "See details above"))}</li>'
+        summaries = [
+            {"name": a["name"], "simple": ALGO_EXPLANATIONS.get(a["name"], {}).get("simple", "See details above")}
             for a in algorithms[:3]
-        ])
-        analysis_items.append(f'''
-<div class="analysis-item">
-    <h5>Algorithms Summary</h5>
-    <ul>{algo_summaries}</ul>
-</div>''')
+        ]
+        analysis_items.append(ALGO_SUMMARY_ITEM.render(summaries_html=render_each(ALGO_SUMMARY, summaries, sep='')))
 
     if chapter and chapter in CHAPTER_INFO:
         info = CHAPTER_INFO[chapter]
-        analysis_items.append(f'''
-<div class="analysis-item">
-    <h5>Chapter Context</h5>
-    <p><strong>Chapter {chapter}: {html.escape(info["name"])}</strong></p>
-    <p>{html.escape(info["summary"])}</p>
-</div>''')
+        analysis_items.append(CHAPTER_CONTEXT_ITEM.render(chapter=chapter, name=info["name"], summary=info["summary"]))
 
     if not analysis_items:
-        analysis_items.append('''
-<div class="analysis-item">
-    <h5>Study Note</h5>
-    <p>This page covers foundational material from CLRS. Take time to understand each concept before moving on.</p>
-</div>''')
-
-    analysis_html = '\n'.join(analysis_items)
+        analysis_items.append(STUDY_NOTE_ITEM)
 
     return {
         "page": page_num,
         "title": title,
-        "content": f'''<div class="article-header">
-    <div class="section-label">{html.escape(label)}</div>
-    <h1>{html.escape(title)}</h1>
-</div>
-<div class="original-content">
-    {content}
-</div>
-<div class="analysis-section">
-    <h3>Quick Reference</h3>
-    <div class="analysis-block">
-        {analysis_html}
-    </div>
-</div>'''
+        "content": PAGE.render(label=label, title=title, content=content, analysis_html='\n'.join(analysis_items))
     }
 
 def create_front_matter_page(page_num, text):
@@ -845,28 +901,30 @@ def create_front_matter_page(page_num, text):
     return None
 
 def main():
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    manifest_pages = []
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    add_sink_arguments(parser)
+    args = parser.parse_args()
 
-    for page_num in range(1, 1314):
-        data = process_page(page_num)
-        if data:
-            with open(OUTPUT_DIR / f"page-{page_num:04d}.json", 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            manifest_pages.append({"page": page_num, "title": data["title"], "hasContent": True})
+    manifest_pages = []
+    with open_sinks(args, OUTPUT_DIR.parent) as sinks:
+        for page_num in range(1, 1314):
+            data = process_page(page_num)
+            if data:
+                sinks.write(f"pages/page-{page_num:04d}.json", json_bytes(data))
+                manifest_pages.append({"page": page_num, "title": data["title"], "hasContent": True})
 
-        if page_num % 100 == 0:
-            print(f"{page_num}/1313...")
+            if page_num % 100 == 0:
+                print(f"{page_num}/1313...")
 
-    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
-        json.dump({
+        sinks.write("manifest.json", json_bytes({
             "title": "Introduction to Algorithms, Third Edition",
             "authors": "Cormen, Leiserson, Rivest, Stein",
             "totalPages": 1313,
             "pages": manifest_pages
-        }, f, ensure_ascii=False, indent=2)
+        }))
 
-    print("Done!")
+        # Still inside the sinks, so with --tar these go to stderr
+        print("Done!")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Lazy, indexed access to the knowledge tables in knowledge_data.py.
+
+The tables are validated against SCHEMAS and compiled into a SQLite snapshot
+with one marshal-encoded row per (table, key). load_table() returns a
+read-only mapping that fetches rows on first use, so importing a generator
+costs nothing and a tool that needs one section only decodes that section.
+
+The snapshot is rebuilt automatically when knowledge_data.py or SCHEMAS
+change; `python knowledge_base.py` rebuilds it explicitly.
+"""
+
+import argparse
+import importlib
+import marshal
+import os
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+
+KNOWLEDGE_SOURCE = Path(__file__).with_name("knowledge_data.py")
+KNOWLEDGE_DB = Path("/Users/adrian/personal/clrs/knowledge.db")
+
+# table -> source variable, key type, required fields, optional fields.
+# A field type is a type, [type] for a list of it, or {type: type} for a dict.
+SCHEMAS = {
+    "sections": {
+        "source": "SECTIONS",
+        "key": str,
+        "fields": {"title": str, "summary": str, "key_points": [str], "why_matters": str},
+        "optional": {"pseudocode": str, "example": str},
+    },
+    "page_to_section": {
+        "source": "PAGE_TO_SECTION",
+        "key": int,
+        "value": str,
+    },
+    "specific_pages": {
+        "source": "SPECIFIC_PAGES",
+        "key": int,
+        "fields": {"title": str, "content": str},
+        "optional": {},
+    },
+    "algorithms": {
+        "source": "ALGORITHMS",
+        "key": str,
+        "fields": {"name": str, "simple": str, "analogy": str, "steps": [str],
+                   "complexity": {str: str}, "when_to_use": [str]},
+        "optional": {"when_not_to_use": [str]},
+    },
+    "chapters": {
+        "source": "CHAPTERS",
+        "key": int,
+        "fields": {"name": str, "part": str, "summary": str, "key_points": [str], "real_world": str},
+        "optional": {},
+    },
+    "math_concepts": {
+        "source": "MATH_CONCEPTS",
+        "key": str,
+        "fields": {"title": str, "content": str},
+        "optional": {},
+    },
+}
+
+_connection = None
+
+def _check_type(value, spec, where):
+    if isinstance(spec, list):
+        if not isinstance(value, list):
+            raise ValueError(f"{where}: expected list, got {type(value).__name__}")
+        for i, item in enumerate(value):
+            _check_type(item, spec[0], f"{where}[{i}]")
+    elif isinstance(spec, dict):
+        if not isinstance(value, dict):
+            raise ValueError(f"{where}: expected dict, got {type(value).__name__}")
+        (key_spec, value_spec), = spec.items()
+        for k, v in value.items():
+            _check_type(k, key_spec, f"{where} key {k!r}")
+            _check_type(v, value_spec, f"{where}[{k!r}]")
+    elif type(value) is not spec:
+        raise ValueError(f"{where}: expected {spec.__name__}, got {type(value).__name__}")
+
+def validate(name, table):
+    """Raise ValueError if a table does not match its schema."""
+    schema = SCHEMAS[name]
+    for key, value in table.items():
+        where = f"{schema['source']}[{key!r}]"
+        _check_type(key, schema["key"], f"{where} key")
+        if "value" in schema:
+            _check_type(value, schema["value"], where)
+            continue
+        if not isinstance(value, dict):
+            raise ValueError(f"{where}: expected dict, got {type(value).__name__}")
+        missing = schema["fields"].keys() - value.keys()
+        if missing:
+            raise ValueError(f"{where}: missing {', '.join(sorted(missing))}")
+        for field, field_value in value.items():
+            spec = schema["fields"].get(field, schema["optional"].get(field))
+            if spec is None:
+                raise ValueError(f"{where}: unknown field {field!r}")
+            _check_type(field_value, spec, f"{where}[{field!r}]")
+
+def source_version():
+    """Hash of the table source and the schemas the snapshot was built from."""
+    import hashlib
+    digest = hashlib.sha256(KNOWLEDGE_SOURCE.read_bytes())
+    digest.update(repr(SCHEMAS).encode())
+    return digest.hexdigest()[:16]
+
+def compile_store():
+    """Validate every table and write a fresh snapshot; returns row counts."""
+    import sqlite3
+    data = importlib.import_module("knowledge_data")
+    tables = {name: getattr(data, schema["source"]) for name, schema in SCHEMAS.items()}
+    for name, table in tables.items():
+        validate(name, table)
+
+    tmp = KNOWLEDGE_DB.with_suffix(f".{os.getpid()}.tmp")
+    conn = sqlite3.connect(tmp)
+    conn.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("CREATE TABLE entries (tbl TEXT, key TEXT, pos INTEGER, value BLOB, PRIMARY KEY (tbl, key))")
+    conn.execute("INSERT INTO meta VALUES ('version', ?)", (source_version(),))
+    for name, table in tables.items():
+        conn.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)",
+                         [(name, str(k), pos, marshal.dumps(v))
+                          for pos, (k, v) in enumerate(table.items())])
+    conn.commit()
+    conn.close()
+    os.replace(tmp, KNOWLEDGE_DB)
+    return {name: len(table) for name, table in tables.items()}
+
+def _connect():
+    """Open the snapshot on first lookup, rebuilding it if it is stale."""
+    global _connection
+    if _connection is None:
+        # sqlite3 costs more to import than the lookups themselves, so it is
+        # only imported once something is actually read
+        import sqlite3
+        if KNOWLEDGE_DB.exists():
+            conn = sqlite3.connect(f"file:{KNOWLEDGE_DB}?mode=ro", uri=True)
+            row = conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row and row[0] == source_version():
+                _connection = conn
+                return conn
+            conn.close()
+        compile_store()
+        _connection = sqlite3.connect(f"file:{KNOWLEDGE_DB}?mode=ro", uri=True)
+    return _connection
+
+class LazyTable(Mapping):
+    """Read-only mapping over one snapshot table; rows are decoded on first access."""
+
+    def __init__(self, name):
+        if name not in SCHEMAS:
+            raise KeyError(f"unknown knowledge table {name!r}")
+        self.name = name
+        self._key_type = SCHEMAS[name]["key"]
+        self._cache = {}
+        self._keys = None
+        self._complete = False
+
+    def __getitem__(self, key):
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        if self._complete:
+            raise KeyError(key)
+        # Keys are stored as text; anything of another type cannot be present
+        if type(key) is not self._key_type:
+            raise KeyError(key)
+        row = _connect().execute("SELECT value FROM entries WHERE tbl = ? AND key = ?",
+                                 (self.name, str(key))).fetchone()
+        if row is None:
+            raise KeyError(key)
+        value = self._cache[key] = marshal.loads(row[0])
+        return value
+
+    def __iter__(self):
+        if self._keys is None:
+            rows = _connect().execute("SELECT key FROM entries WHERE tbl = ? ORDER BY pos", (self.name,))
+            self._keys = [self._key_type(key) for key, in rows]
+        return iter(self._keys)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def _load_all(self):
+        # One query instead of one per key when the whole table is walked
+        if not self._complete:
+            rows = _connect().execute("SELECT key, value FROM entries WHERE tbl = ? ORDER BY pos", (self.name,))
+            self._cache = {self._key_type(k): marshal.loads(v) for k, v in rows}
+            self._keys = list(self._cache)
+            self._complete = True
+        return self._cache
+
+    def items(self):
+        return self._load_all().items()
+
+    def values(self):
+        return self._load_all().values()
+
+    def __repr__(self):
+        return f"LazyTable({self.name!r})"
+
+def load_table(name):
+    """Lazy mapping for one knowledge table; nothing is read until it is used."""
+    return LazyTable(name)
+
+def benchmark(rounds=5):
+    """Time eager vs lazy loading in fresh interpreters."""
+    import subprocess
+    cases = [
+        ("eager: import knowledge_data", "import knowledge_data"),
+        ("lazy: import both generators", "import batch_generate, generate_all_explanations"),
+        ("lazy: one section lookup", "from knowledge_base import load_table; load_table('sections')['2.1']"),
+        ("lazy: full sections walk", "from knowledge_base import load_table; dict(load_table('sections').items())"),
+    ]
+    # Stdlib modules every case needs are imported before the clock starts
+    timer = ("import json, re, html, argparse, marshal, hashlib, sqlite3, pathlib, collections.abc, time; "
+             "start = time.perf_counter(); {code}; print((time.perf_counter() - start) * 1000)")
+    cwd = Path(__file__).parent
+    print(f"{'case':<32} {'ms':>8}")
+    for label, code in cases:
+        times = []
+        for _ in range(rounds):
+            out = subprocess.run([sys.executable, "-c", timer.format(code=code)],
+                                 cwd=cwd, capture_output=True, text=True, check=True)
+            times.append(float(out.stdout))
+        print(f"{label:<32} {min(times):>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the knowledge tables into the lazy snapshot.")
+    parser.add_argument('--benchmark', action='store_true',
+                        help="compare import and lookup time against loading knowledge_data")
+    args = parser.parse_args()
+
+    counts = compile_store()
+    print(f"Wrote {KNOWLEDGE_DB} ({KNOWLEDGE_DB.stat().st_size // 1024} KB, version {source_version()})")
+    for name, count in counts.items():
+        print(f"  {name:<16} {count:>5} rows")
+
+    if args.benchmark:
+        print()
+        benchmark()
+
+if __name__ == "__main__":
+    main()
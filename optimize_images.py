@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Losslessly recompress the reader's PNG images in place.
+
+Every reader/assets/images/*.png is re-encoded in each candidate form
+(compacted palette with the smallest bit depth, 8-bit gray when every used
+colour is gray, exact palette for RGB images with few colours) under each
+deflate strategy in STRATEGIES, and the smallest encoding replaces the file
+only if it is smaller and decodes to exactly the same RGBA pixels.
+The colour information is carried over (dpi, the iCCP profile and the gAMA,
+cHRM and sRGB chunks), so a re-encoded image displays the same as the
+original; images with an ICC profile are not turned into gray, which would
+need a gray profile.
+Images whose hash matches the last run (optimized-images.json) are skipped.
+Images are processed in parallel.
+"""
+
+import argparse
+import io
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, PngImagePlugin
+
+from build_precache import READER_DIR, file_hash
+
+IMAGES_DIR = READER_DIR / "assets" / "images"
+HASH_CACHE_FILE = READER_DIR.parent / "optimized-images.json"
+STRATEGIES = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED)
+
+def palette_image(indices, palette, size):
+    """P image from an index array and an (n, 3) palette, at the smallest bit depth."""
+    image = Image.frombytes('P', size, indices.astype(np.uint8).tobytes())
+    image.putpalette(palette.astype(np.uint8).tobytes())
+    bits = next(b for b in (1, 2, 4, 8) if len(palette) <= 2 ** b)
+    return image, ({"bits": bits} if bits < 8 else {})
+
+def candidates(image):
+    """Lossless re-encodings of an image as (image, extra save options)."""
+    yield image, {}
+    if 'transparency' in image.info:
+        return
+    # An RGB profile is invalid on a gray PNG
+    gray_ok = 'icc_profile' not in image.info
+
+    if image.mode == 'P':
+        pixels = np.asarray(image)
+        used, indices = np.unique(pixels, return_inverse=True)
+        palette = np.asarray(image.getpalette(), dtype=np.uint8).reshape(-1, 3)[used]
+    elif image.mode == 'RGB':
+        pixels = np.asarray(image).astype(np.uint32)
+        packed = (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+        colors, indices = np.unique(packed, return_inverse=True)
+        if len(colors) > 256:
+            if gray_ok and (pixels.max(axis=2) == pixels.min(axis=2)).all():
+                yield image.convert('L'), {}
+            return
+        palette = np.stack([colors >> 16, (colors >> 8) & 0xFF, colors & 0xFF], axis=1)
+    else:
+        return
+
+    indices = indices.reshape(image.height, image.width)
+    yield palette_image(indices, palette, image.size)
+    if gray_ok and (palette.max(axis=1) == palette.min(axis=1)).all():
+        yield Image.fromarray(palette[:, 0][indices].astype(np.uint8)), {}
+
+def color_options(info):
+    """Save options that carry over the resolution and colour chunks Pillow read from a PNG."""
+    options = {key: info[key] for key in ('dpi', 'icc_profile') if info.get(key)}
+    chunks = PngImagePlugin.PngInfo()
+    if 'gamma' in info:
+        chunks.add(b"gAMA", struct.pack('>I', round(info['gamma'] * 100000)))
+    if 'chromaticity' in info:
+        chunks.add(b"cHRM", struct.pack('>8I', *(round(v * 100000) for v in info['chromaticity'])))
+    if 'srgb' in info:
+        chunks.add(b"sRGB", bytes([info['srgb']]))
+    if chunks.chunks:
+        options["pnginfo"] = chunks
+    return options
+
+def encode(image, options, strategy, info):
+    data = io.BytesIO()
+    options = {**options, **color_options(info)}
+    image.save(data, 'PNG', optimize=True, compress_type=strategy, **options)
+    return data.getvalue()
+
+def rgba(image):
+    return np.asarray(image.convert('RGBA'))
+
+def optimize_image(path):
+    """Rewrite one PNG if a smaller lossless encoding exists; returns (name, old bytes, new bytes, hash)."""
+    old_size = path.stat().st_size
+    with Image.open(path) as image:
+        image.load()
+        reference = rgba(image)
+        best = None
+        for candidate, options in candidates(image):
+            for strategy in STRATEGIES:
+                data = encode(candidate, options, strategy, image.info)
+                if best is None or len(data) < len(best):
+                    best = data
+
+    if len(best) < old_size:
+        with Image.open(io.BytesIO(best)) as rewritten:
+            if not np.array_equal(rgba(rewritten), reference):
+                print(f"  {path.name}: re-encoded pixels differ, left unchanged")
+                return path.name, old_size, old_size, file_hash(path)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_bytes(best)
+        tmp.replace(path)
+    return path.name, old_size, path.stat().st_size, file_hash(path)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--dir', type=Path, default=IMAGES_DIR, help="directory of PNGs to optimize")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--force', action='store_true', help="also retry images optimized before")
+    args = parser.parse_args()
+
+    cache = {}
+    if HASH_CACHE_FILE.exists():
+        with open(HASH_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    seen = cache.setdefault(str(args.dir), {})
+
+    images = sorted(args.dir.glob("*.png"))
+    paths = [p for p in images if args.force or seen.get(p.name) != file_hash(p)]
+    skipped = len(images) - len(paths)
+
+    old_total = new_total = rewritten = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for name, old_size, new_size, digest in pool.map(optimize_image, paths):
+            seen[name] = digest
+            old_total += old_size
+            new_total += new_size
+            if new_size < old_size:
+                rewritten += 1
+                print(f"  {name}: {old_size:,} -> {new_size:,} ({(1 - new_size / old_size) * 100:.1f}%)")
+
+    with open(HASH_CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+    print(f"Rewrote {rewritten} of {len(paths)} images ({skipped} unchanged since the last run)")
+    if old_total:
+        print(f"Saved {old_total - new_total:,} bytes ({(1 - new_total / old_total) * 100:.1f}%): "
+              f"{old_total / 1e6:.1f} MB -> {new_total / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
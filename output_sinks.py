@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Output sinks for the page generators.
+
+A generator writes each file once, by its path relative to reader/data (e.g.
+"pages/page-0001.json", "manifest.json"), and every selected sink receives it
+in the same pass:
+
+    --no-dir              skip the loose files under reader/data
+    --zip PATH            zip archive with stored (uncompressed) entries, so a
+                          static server can answer Range requests into it
+    --sqlite PATH         SQLite database, one row per file (page -> blob)
+    --tar -               uncompressed tar streamed to stdout
+
+With --tar - the progress output of the generator moves to stderr while the
+sinks are open. The zip and SQLite files are written under a ".partial" name
+and renamed into place only when the generator finishes; after an error the
+partial file is removed and the tar stream is left unterminated, so a failed
+run never looks like a complete archive.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import sys
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+
+class DirectorySink:
+    """Loose files under a root directory (the original generator output)."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def write(self, name, data):
+        path = self.root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+    def close(self, complete=True):
+        pass
+
+def partial_path(path):
+    """Where a file sink writes until the run completes."""
+    path = Path(path)
+    return path.with_name(path.name + ".partial")
+
+def finish(path, complete):
+    """Move a completed partial file into place, or remove an incomplete one."""
+    if complete:
+        os.replace(partial_path(path), path)
+    else:
+        partial_path(path).unlink(missing_ok=True)
+
+class ZipSink:
+    """Zip archive with stored entries, readable by byte range."""
+
+    def __init__(self, path):
+        self.path = path
+        self.archive = zipfile.ZipFile(partial_path(path), 'w', compression=zipfile.ZIP_STORED)
+        self.date_time = time.localtime()[:6]
+
+    def write(self, name, data):
+        self.archive.writestr(zipfile.ZipInfo(name, date_time=self.date_time), data)
+
+    def close(self, complete=True):
+        self.archive.close()
+        finish(self.path, complete)
+
+class SQLiteSink:
+    """One row per file; page files also carry their page number."""
+
+    def __init__(self, path):
+        self.path = path
+        partial_path(path).unlink(missing_ok=True)
+        self.conn = sqlite3.connect(partial_path(path))
+        self.conn.execute("CREATE TABLE files (name TEXT PRIMARY KEY, page INTEGER, data BLOB)")
+        self.conn.execute("CREATE INDEX files_page ON files (page)")
+
+    def write(self, name, data):
+        stem = Path(name).stem
+        page = int(stem[5:]) if stem.startswith("page-") and stem[5:].isdigit() else None
+        self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?)", (name, page, data))
+
+    def close(self, complete=True):
+        if complete:
+            self.conn.commit()
+        self.conn.close()
+        finish(self.path, complete)
+
+class TarSink:
+    """Uncompressed tar written as a stream; nothing is buffered or seeked."""
+
+    def __init__(self, stream):
+        self.archive = tarfile.open(fileobj=stream, mode='w|')
+        self.mtime = int(time.time())
+
+    def write(self, name, data):
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self.mtime
+        self.archive.addfile(info, io.BytesIO(data))
+
+    def close(self, complete=True):
+        # An incomplete run gets no end-of-archive blocks, so the stream ends truncated
+        if complete:
+            self.archive.close()
+
+class MultiSink:
+    """Fan each write out to every selected sink; use it as a context manager."""
+
+    def __init__(self, sinks, redirect_stdout=False):
+        self.sinks = sinks
+        self.redirect_stdout = redirect_stdout
+        self.stdout = contextlib.ExitStack()
+
+    def write(self, name, data):
+        for sink in self.sinks:
+            sink.write(name, data)
+
+    def close(self, complete=True):
+        """Close every sink, even if one fails, then raise the first error."""
+        error = None
+        for sink in self.sinks:
+            try:
+                sink.close(complete)
+            except Exception as e:
+                error = error or e
+        self.stdout.close()
+        if error:
+            raise error
+
+    def __enter__(self):
+        if self.redirect_stdout:
+            # stdout carries the archive, so progress messages go to stderr until close
+            self.stdout.enter_context(contextlib.redirect_stdout(sys.stderr))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
+
+def json_bytes(obj):
+    """Encode page and manifest JSON exactly as the generators always wrote it."""
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+def add_sink_arguments(parser):
+    """Add the sink selection flags to a generator's argument parser."""
+    parser.add_argument('--no-dir', action='store_true',
+                        help="do not write loose files under reader/data")
+    parser.add_argument('--zip', metavar='PATH', help="also write a zip with stored entries")
+    parser.add_argument('--sqlite', metavar='PATH', help="also write a SQLite database of files")
+    parser.add_argument('--tar', metavar='-', choices=['-'], help="also stream a tar to stdout")
+
+def open_sinks(args, root):
+    """Build the sinks selected by args; root is the loose-file directory."""
+    sinks = []
+    if not args.no_dir:
+        sinks.append(DirectorySink(root))
+    if args.zip:
+        sinks.append(ZipSink(args.zip))
+    if args.sqlite:
+        sinks.append(SQLiteSink(args.sqlite))
+    if args.tar:
+        sinks.append(TarSink(sys.stdout.buffer))
+    if not sinks:
+        raise SystemExit("no output selected: --no-dir needs --zip, --sqlite or --tar")
+    return MultiSink(sinks, redirect_stdout=bool(args.tar))
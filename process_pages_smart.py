@@ -4,12 +4,14 @@ Smart processor for CLRS pages - extracts structure and creates formatted HTML c
 Identifies chapters, sections, algorithms, theorems, definitions, etc.
 """
 
-import json
+import argparse
 import os
 import re
-import html
 from pathlib import Path
 
+from output_sinks import add_sink_arguments, json_bytes, open_sinks
+from templates import compile_template
+
 PAGES_DIR = Path("/Users/adrian/personal/clrs/clrs_pages")
 OUTPUT_DIR = Path("/Users/adrian/personal/clrs/reader/data/pages")
 MANIFEST_FILE = Path("/Users/adrian/personal/clrs/reader/data/manifest.json")
@@ -114,12 +116,78 @@ def extract_section_info(text):
 
     return info
 
+HEADING = compile_template('<h3>{text}</h3>')
+PSEUDOCODE = compile_template('<pre class="algorithm">{text}</pre>')
+PARAGRAPH = compile_template('<p>{text}</p>')
+
+THEOREMS_BOX = compile_template('''
+        <div class="highlight-box">
+            <h4>Theorems & Lemmas</h4>
+            <p>{names}</p>
+        </div>''')
+
+ALGORITHMS_BOX = compile_template('''
+        <div class="definition-box">
+            <h4>Algorithms</h4>
+            <p><strong>{names}</strong></p>
+        </div>''')
+
+COMPLEXITY_BOX = compile_template('''
+        <div class="figure-box">
+            <h4>Complexity</h4>
+            <p>{bounds}</p>
+        </div>''')
+
+CHAPTER_START_ITEM = '''
+        <div class="analysis-item">
+            <h5>Chapter Overview</h5>
+            <p>This page introduces a new chapter. Key concepts and algorithms will be developed throughout this section.</p>
+        </div>'''
+
+KEY_ALGORITHMS_ITEM = compile_template('''
+        <div class="analysis-item">
+            <h5>Key Algorithms</h5>
+            <p>This page discusses: <strong>{names}</strong></p>
+        </div>''')
+
+FOUNDATIONS_ITEM = compile_template('''
+        <div class="analysis-item">
+            <h5>Mathematical Foundations</h5>
+            <p>Important results: {names}</p>
+        </div>''')
+
+SUMMARY_ITEM = '''
+        <div class="analysis-item">
+            <h5>Content Summary</h5>
+            <p>This page continues the discussion of algorithms and data structures fundamental to computer science.</p>
+        </div>'''
+
+PAGE = compile_template('''<div class="article-header">
+    <div class="section-label">{label}</div>
+    <h1>{title}</h1>
+</div>
+<div class="original-content">
+    {concept_html|raw}
+    {main_content|raw}
+</div>
+<div class="analysis-section">
+    <h3>Quick Reference</h3>
+    <div class="analysis-block">
+        {analysis_html|raw}
+    </div>
+</div>''')
+
+EMPTY_PAGE = compile_template('''<div class="article-header">
+    <div class="section-label">Page {page_num}</div>
+    <h1>Page {page_num}</h1>
+</div>
+<div class="original-content">
+    <p><em>This page contains minimal text content (diagrams, figures, or blank space).</em></p>
+</div>''')
+
 def format_content_html(text, page_num, page_type, concepts, section_info):
     """Generate formatted HTML content for the page."""
 
-    # Escape HTML in text
-    safe_text = html.escape(text)
-
     # Determine section label
     if section_info["section"]:
         section_label = f"Section {section_info['section'].split()[0]}"
@@ -138,9 +206,6 @@ def format_content_html(text, page_num, page_type, concepts, section_info):
         lines = [l.strip() for l in text.split('\n') if l.strip() and len(l.strip()) > 3]
         title = lines[0][:80] if lines else f"Page {page_num}"
 
-    # Build content sections
-    content_parts = []
-
     # Main content - format the text nicely
     paragraphs = text.split('\n\n')
     formatted_paragraphs = []
@@ -152,92 +217,48 @@ def format_content_html(text, page_num, page_type, concepts, section_info):
 
         # Check if it's a heading
         if re.match(r'^\d+(\.\d+)*\s+[A-Z]', para) and len(para) < 100:
-            formatted_paragraphs.append(f'<h3>{html.escape(para)}</h3>')
+            formatted_paragraphs.append(HEADING.render(text=para))
         # Check if it looks like pseudocode/algorithm
         elif re.search(r'^\s*(for|while|if|return|else)\s', para, re.IGNORECASE) or para.strip().startswith('1 '):
-            formatted_paragraphs.append(f'<pre class="algorithm">{html.escape(para)}</pre>')
+            formatted_paragraphs.append(PSEUDOCODE.render(text=para))
         else:
-            formatted_paragraphs.append(f'<p>{html.escape(para)}</p>')
-
-    main_content = '\n'.join(formatted_paragraphs)
+            formatted_paragraphs.append(PARAGRAPH.render(text=para))
 
     # Build definition boxes for key concepts
     concept_boxes = []
 
     if concepts["theorems"]:
-        theorems_list = ', '.join(concepts["theorems"][:5])
-        concept_boxes.append(f'''
-        <div class="highlight-box">
-            <h4>Theorems & Lemmas</h4>
-            <p>{html.escape(theorems_list)}</p>
-        </div>''')
+        concept_boxes.append(THEOREMS_BOX.render(names=', '.join(concepts["theorems"][:5])))
 
     if concepts["algorithms"]:
-        algos_list = ', '.join(concepts["algorithms"][:5])
-        concept_boxes.append(f'''
-        <div class="definition-box">
-            <h4>Algorithms</h4>
-            <p><strong>{html.escape(algos_list)}</strong></p>
-        </div>''')
+        concept_boxes.append(ALGORITHMS_BOX.render(names=', '.join(concepts["algorithms"][:5])))
 
     if concepts["complexities"]:
-        complexity_list = ', '.join(list(set(concepts["complexities"]))[:5])
-        concept_boxes.append(f'''
-        <div class="figure-box">
-            <h4>Complexity</h4>
-            <p>{html.escape(complexity_list)}</p>
-        </div>''')
-
-    concept_html = '\n'.join(concept_boxes)
+        concept_boxes.append(COMPLEXITY_BOX.render(bounds=', '.join(list(set(concepts["complexities"]))[:5])))
 
     # Build analysis section
     analysis_items = []
 
     if page_type == "chapter_start":
-        analysis_items.append('''
-        <div class="analysis-item">
-            <h5>Chapter Overview</h5>
-            <p>This page introduces a new chapter. Key concepts and algorithms will be developed throughout this section.</p>
-        </div>''')
+        analysis_items.append(CHAPTER_START_ITEM)
 
     if concepts["algorithms"]:
-        analysis_items.append(f'''
-        <div class="analysis-item">
-            <h5>Key Algorithms</h5>
-            <p>This page discusses: <strong>{html.escape(', '.join(concepts["algorithms"][:3]))}</strong></p>
-        </div>''')
+        analysis_items.append(KEY_ALGORITHMS_ITEM.render(names=', '.join(concepts["algorithms"][:3])))
 
     if concepts["theorems"]:
-        analysis_items.append(f'''
-        <div class="analysis-item">
-            <h5>Mathematical Foundations</h5>
-            <p>Important results: {html.escape(', '.join(concepts["theorems"][:3]))}</p>
-        </div>''')
+        analysis_items.append(FOUNDATIONS_ITEM.render(names=', '.join(concepts["theorems"][:3])))
 
     if not analysis_items:
-        analysis_items.append('''
-        <div class="analysis-item">
-            <h5>Content Summary</h5>
-            <p>This page continues the discussion of algorithms and data structures fundamental to computer science.</p>
-        </div>''')
-
-    analysis_html = '\n'.join(analysis_items)
+        analysis_items.append(SUMMARY_ITEM)
 
     # Assemble final HTML
-    html_content = f'''<div class="article-header">
-    <div class="section-label">{html.escape(section_label)}</div>
-    <h1>{html.escape(title)}</h1>
-</div>
-<div class="original-content">
-    {concept_html}
-    {main_content}
-</div>
-<div class="analysis-section">
-    <h3>Quick Reference</h3>
-    <div class="analysis-block">
-        {analysis_html}
-    </div>
-</div>'''
+    html_content = PAGE.render(
+        label=section_label,
+        title=title,
+        concept_html='\n'.join(concept_boxes),
+        main_content='\n'.join(formatted_paragraphs),
+        analysis_html='\n'.join(analysis_items),
+    )
 
     return html_content, title
 
@@ -258,13 +279,7 @@ def process_page(page_num):
         return {
             "page": page_num,
             "title": f"Page {page_num}",
-            "content": f'''<div class="article-header">
-    <div class="section-label">Page {page_num}</div>
-    <h1>Page {page_num}</h1>
-</div>
-<div class="original-content">
-    <p><em>This page contains minimal text content (diagrams, figures, or blank space).</em></p>
-</div>'''
+            "content": EMPTY_PAGE.render(page_num=page_num)
         }
 
     page_type = identify_page_type(text, page_num)
@@ -281,40 +296,36 @@ def process_page(page_num):
 
 def main():
     """Process all pages."""
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    add_sink_arguments(parser)
+    args = parser.parse_args()
 
     manifest_pages = []
-
-    for page_num in range(1, 1314):
-        page_data = process_page(page_num)
-
-        if page_data:
-            # Save page JSON
-            output_file = OUTPUT_DIR / f"page-{page_num:04d}.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(page_data, f, ensure_ascii=False, indent=2)
-
-            manifest_pages.append({
-                "page": page_num,
-                "title": page_data["title"],
-                "hasContent": True
-            })
-
-        if page_num % 100 == 0:
-            print(f"Processed {page_num}/1313...")
-
-    # Update manifest
-    manifest = {
-        "title": "Introduction to Algorithms, Third Edition",
-        "authors": "Thomas H. Cormen, Charles E. Leiserson, Ronald L. Rivest, Clifford Stein",
-        "totalPages": 1313,
-        "pages": manifest_pages
-    }
-
-    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, ensure_ascii=False, indent=2)
-
-    print(f"\nDone! Processed 1313 pages.")
+    with open_sinks(args, OUTPUT_DIR.parent) as sinks:
+        for page_num in range(1, 1314):
+            page_data = process_page(page_num)
+
+            if page_data:
+                sinks.write(f"pages/page-{page_num:04d}.json", json_bytes(page_data))
+                manifest_pages.append({
+                    "page": page_num,
+                    "title": page_data["title"],
+                    "hasContent": True
+                })
+
+            if page_num % 100 == 0:
+                print(f"Processed {page_num}/1313...")
+
+        # Update manifest
+        sinks.write("manifest.json", json_bytes({
+            "title": "Introduction to Algorithms, Third Edition",
+            "authors": "Thomas H. Cormen, Charles E. Leiserson, Ronald L. Rivest, Clifford Stein",
+            "totalPages": 1313,
+            "pages": manifest_pages
+        }))
+
+        # Still inside the sinks, so with --tar this goes to stderr
+        print(f"\nDone! Processed 1313 pages.")
 
 if __name__ == "__main__":
     main()
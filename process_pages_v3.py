@@ -3,14 +3,20 @@
 Enhanced processor for CLRS - handles spaced algorithm names like H EAP -E XTRACT-M AX.
 """
 
-import json
+import argparse
 import re
 import html
 from pathlib import Path
 
+from output_sinks import add_sink_arguments, json_bytes, open_sinks
+from templates import compile_template, render_each
+
 PAGES_DIR = Path("/Users/adrian/personal/clrs/clrs_pages")
 OUTPUT_DIR = Path("/Users/adrian/personal/clrs/reader/data/pages")
 MANIFEST_FILE = Path("/Users/adrian/personal/clrs/reader/data/manifest.json")
+# Display math and matrices make prose pages look like figures in the scans, so
+# the scan verdict only counts when the OCR text is this short (labels only)
+FIGURE_TEXT_MAX = 600
 
 # Algorithm descriptions
 ALGO_DESC = {
@@ -261,51 +267,113 @@ def detect_section(text):
         return match.group(1), match.group(2).strip()
     return None, None
 
+# Pseudocode keywords in bold; one pass replaces the per-keyword re.sub loop
+KEYWORD_PATTERN = re.compile(r'\b(for|while|if|else|return|error|to|downto|do|and|or|not|NIL|TRUE|FALSE)\b')
+
+CODE_LINE = compile_template('<span style="color:#64748b">{num}</span>  {content|raw}')
+
+ALGO_BLOCK = compile_template('''
+<div class="algorithm">
+    <span class="algorithm-name">{name}({params})</span>
+    <p style="margin:0.3rem 0;color:#475569;font-size:0.85rem;font-family:var(--font-sans);">{description}</p>
+    <pre style="margin-top:0.5rem;font-size:0.82rem;line-height:1.7;">{code_html|raw}</pre>
+</div>''')
+
+THEOREM_BLOCK = compile_template('''
+<div class="theorem-box">
+    <h4>{type_n} {num}{name}</h4>
+    <p style="font-style:italic;">{statement}</p>
+</div>''')
+
+FIGURE_PAGE = compile_template('''<div class="article-header">
+    <div class="section-label">Page {page_num}</div>
+    <h1>Page {page_num}</h1>
+</div>
+<div class="original-content">
+    <p><em>Primarily figures or diagrams.</em></p>
+</div>''')
+
+COMPLEXITY_SPAN = compile_template('<span class="complexity">{bound}</span>')
+
+COMPLEXITY_BOX = compile_template('''
+<div class="highlight-box">
+    <h4>Complexity Analysis</h4>
+    <p>{comp_html|raw}</p>
+</div>''')
+
+PARAGRAPH = compile_template('<p>{text}</p>')
+
+ALGO_ITEM = compile_template('<li><strong>{name}</strong>: {description}</li>')
+
+ANALYSIS_ITEM = compile_template('''
+<div class="analysis-item">
+    <h5>{heading}</h5>
+    {body|raw}
+</div>''')
+
+CHAPTER_ITEM = compile_template('<p><strong>{chapter}. {name}</strong></p>')
+
+OVERVIEW_ITEM = '''
+<div class="analysis-item">
+    <h5>Overview</h5>
+    <p>Foundational material from Introduction to Algorithms (CLRS).</p>
+</div>'''
+
+PAGE = compile_template('''<div class="article-header">
+    <div class="section-label">{label}</div>
+    <h1>{title}</h1>
+</div>
+<div class="original-content">
+    {content|raw}
+</div>
+<div class="analysis-section">
+    <h3>Quick Reference</h3>
+    <div class="analysis-block">
+        {analysis_html|raw}
+    </div>
+</div>''')
+
 def create_algo_html(algo):
     """Create formatted HTML for algorithm."""
-    name = html.escape(algo['name'])
-    params = html.escape(algo['params'])
-    code_lines = algo['code'].split('\n')
     formatted_lines = []
 
-    for line in code_lines:
+    for line in algo['code'].split('\n'):
         line = line.strip()
         if not line:
             continue
         # Extract line number and content
         match = re.match(r'^(\d+)\s+(.*)$', line)
         if match:
-            num = match.group(1)
-            content = html.escape(match.group(2))
-            # Highlight keywords
-            for kw in ['for', 'while', 'if', 'else', 'return', 'error', 'to', 'downto', 'do', 'and', 'or', 'not', 'NIL', 'TRUE', 'FALSE']:
-                content = re.sub(rf'\b{kw}\b', f'<b>{kw}</b>', content)
-            formatted_lines.append(f'<span style="color:#64748b">{num:>2}</span>  {content}')
+            content = KEYWORD_PATTERN.sub(r'<b>\1</b>', html.escape(match.group(2)))
+            formatted_lines.append(CODE_LINE.render(num=f"{match.group(1):>2}", content=content))
         else:
             formatted_lines.append(html.escape(line))
 
-    code_html = '\n'.join(formatted_lines)
-    desc = html.escape(algo['description'])
-
-    return f'''
-<div class="algorithm">
-    <span class="algorithm-name">{name}({params})</span>
-    <p style="margin:0.3rem 0;color:#475569;font-size:0.85rem;font-family:var(--font-sans);">{desc}</p>
-    <pre style="margin-top:0.5rem;font-size:0.82rem;line-height:1.7;">{code_html}</pre>
-</div>'''
+    return ALGO_BLOCK.render(
+        name=algo['name'],
+        params=algo['params'],
+        description=algo['description'],
+        code_html='\n'.join(formatted_lines),
+    )
 
 def create_theorem_html(thm):
     """Create formatted HTML for theorem."""
-    type_n = html.escape(thm['type'])
-    num = html.escape(thm['number'])
-    name = f" ({html.escape(thm['name'])})" if thm['name'] else ""
-    stmt = html.escape(thm['statement'])
+    return THEOREM_BLOCK.render(
+        type_n=thm['type'],
+        num=thm['number'],
+        name=f" ({thm['name']})" if thm['name'] else "",
+        statement=thm['statement'],
+    )
 
-    return f'''
-<div class="theorem-box">
-    <h4>{type_n} {num}{name}</h4>
-    <p style="font-style:italic;">{stmt}</p>
-</div>'''
+def figure_page(page_num, text):
+    """True if a page is mostly figures: almost no text, or a blank or figure scan with sparse text."""
+    if len(text) < 50:
+        return True
+    if len(text) >= FIGURE_TEXT_MAX:
+        return False
+    # Imported here so the generators do not load NumPy and PIL just to start
+    from build_image_features import page_kind
+    return page_kind(page_num) in ("blank", "figure")
 
 def process_page(page_num):
     """Process a single page."""
@@ -316,17 +384,12 @@ def process_page(page_num):
     with open(txt_file, 'r', encoding='utf-8', errors='replace') as f:
         text = f.read().replace('\f', '').strip()
 
-    if len(text) < 50:
+    # Scan statistics (build_image_features.py) catch figure pages with OCR'd labels
+    if figure_page(page_num, text):
         return {
             "page": page_num,
             "title": f"Page {page_num}",
-            "content": f'''<div class="article-header">
-    <div class="section-label">Page {page_num}</div>
-    <h1>Page {page_num}</h1>
-</div>
-<div class="original-content">
-    <p><em>Primarily figures or diagrams.</em></p>
-</div>'''
+            "content": FIGURE_PAGE.render(page_num=page_num)
         }
 
     chapter = detect_chapter(text)
@@ -360,104 +423,69 @@ def process_page(page_num):
 
     # Complexity box
     if complexities and not algorithms:
-        comp_html = ', '.join([f'<span class="complexity">{html.escape(c)}</span>' for c in complexities])
-        parts.append(f'''
-<div class="highlight-box">
-    <h4>Complexity Analysis</h4>
-    <p>{comp_html}</p>
-</div>''')
+        comp_html = render_each(COMPLEXITY_SPAN, [{"bound": c} for c in complexities], sep=', ')
+        parts.append(COMPLEXITY_BOX.render(comp_html=comp_html))
 
     # Text summary (if no algorithms found)
     if not algorithms:
         paragraphs = [p.strip() for p in text.split('\n\n') if len(p.strip()) > 50]
         for p in paragraphs[:4]:
-            parts.append(f'<p>{html.escape(p)}</p>')
+            parts.append(PARAGRAPH.render(text=p))
 
-    content = '\n'.join(parts) if parts else f'<p>{html.escape(text[:1000])}</p>'
+    content = '\n'.join(parts) if parts else PARAGRAPH.render(text=text[:1000])
 
     # Analysis section
     analysis = []
 
     if algorithms:
-        algo_items = ''.join([f'<li><strong>{html.escape(a["name"])}</strong>: {html.escape(a["description"])}</li>' for a in algorithms[:4]])
-        analysis.append(f'''
-<div class="analysis-item">
-    <h5>Algorithms on This Page</h5>
-    <ul>{algo_items}</ul>
-</div>''')
+        algo_items = render_each(ALGO_ITEM, algorithms[:4], sep='')
+        analysis.append(ANALYSIS_ITEM.render(heading="Algorithms on This Page", body=f'<ul>{algo_items}</ul>'))
 
     if theorems:
         thm_names = ', '.join([f'{t["type"]} {t["number"]}' for t in theorems])
-        analysis.append(f'''
-<div class="analysis-item">
-    <h5>Key Results</h5>
-    <p>{html.escape(thm_names)}</p>
-</div>''')
+        analysis.append(ANALYSIS_ITEM.render(heading="Key Results", body=PARAGRAPH.render(text=thm_names)))
 
     if complexities and algorithms:
-        analysis.append(f'''
-<div class="analysis-item">
-    <h5>Running Times</h5>
-    <p>{', '.join([html.escape(c) for c in complexities])}</p>
-</div>''')
+        analysis.append(ANALYSIS_ITEM.render(heading="Running Times", body=PARAGRAPH.render(text=', '.join(complexities))))
 
     if chapter:
-        analysis.append(f'''
-<div class="analysis-item">
-    <h5>Chapter</h5>
-    <p><strong>{chapter}. {html.escape(CHAPTERS.get(chapter, ""))}</strong></p>
-</div>''')
+        chapter_html = CHAPTER_ITEM.render(chapter=chapter, name=CHAPTERS.get(chapter, ""))
+        analysis.append(ANALYSIS_ITEM.render(heading="Chapter", body=chapter_html))
 
     if not analysis:
-        analysis.append('''
-<div class="analysis-item">
-    <h5>Overview</h5>
-    <p>Foundational material from Introduction to Algorithms (CLRS).</p>
-</div>''')
-
-    analysis_html = '\n'.join(analysis)
+        analysis.append(OVERVIEW_ITEM)
 
     return {
         "page": page_num,
         "title": title,
-        "content": f'''<div class="article-header">
-    <div class="section-label">{html.escape(label)}</div>
-    <h1>{html.escape(title)}</h1>
-</div>
-<div class="original-content">
-    {content}
-</div>
-<div class="analysis-section">
-    <h3>Quick Reference</h3>
-    <div class="analysis-block">
-        {analysis_html}
-    </div>
-</div>'''
+        "content": PAGE.render(label=label, title=title, content=content, analysis_html='\n'.join(analysis))
     }
 
 def main():
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    manifest_pages = []
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    add_sink_arguments(parser)
+    args = parser.parse_args()
 
-    for page_num in range(1, 1314):
-        data = process_page(page_num)
-        if data:
-            with open(OUTPUT_DIR / f"page-{page_num:04d}.json", 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            manifest_pages.append({"page": page_num, "title": data["title"], "hasContent": True})
+    manifest_pages = []
+    with open_sinks(args, OUTPUT_DIR.parent) as sinks:
+        for page_num in range(1, 1314):
+            data = process_page(page_num)
+            if data:
+                sinks.write(f"pages/page-{page_num:04d}.json", json_bytes(data))
+                manifest_pages.append({"page": page_num, "title": data["title"], "hasContent": True})
 
-        if page_num % 100 == 0:
-            print(f"{page_num}/1313...")
+            if page_num % 100 == 0:
+                print(f"{page_num}/1313...")
 
-    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
-        json.dump({
+        sinks.write("manifest.json", json_bytes({
             "title": "Introduction to Algorithms, Third Edition",
             "authors": "Cormen, Leiserson, Rivest, Stein",
             "totalPages": 1313,
             "pages": manifest_pages
-        }, f, ensure_ascii=False, indent=2)
+        }))
 
-    print("Done!")
+        # Still inside the sinks, so with --tar these go to stderr
+        print("Done!")
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,6 @@
 // app.js - Application initialization and core functions
 import { State } from './state.js';
+import { decodeCBOR } from './cbor.js';
 
 const TOTAL_PAGES = 1313;
 const ZOOM_LEVELS = [70, 80, 90, 100, 110, 120, 130, 140];
@@ -10,199 +11,17 @@ let menuOpen = false;
 let tocOpen = false;
 const pageCache = {};
 
-// Full TOC structure
-const TOC_DATA = [
-    { type: 'part', title: 'PART I: FOUNDATIONS' },
-    { type: 'chapter', title: '1. The Role of Algorithms in Computing', page: 5 },
-    { type: 'section', title: '1.1 Algorithms', page: 5 },
-    { type: 'section', title: '1.2 Algorithms as a technology', page: 12 },
-    { type: 'chapter', title: '2. Getting Started', page: 16 },
-    { type: 'section', title: '2.1 Insertion sort', page: 16 },
-    { type: 'section', title: '2.2 Analyzing algorithms', page: 23 },
-    { type: 'section', title: '2.3 Designing algorithms', page: 30 },
-    { type: 'chapter', title: '3. Growth of Functions', page: 43 },
-    { type: 'section', title: '3.1 Asymptotic notation', page: 43 },
-    { type: 'section', title: '3.2 Standard notations and common functions', page: 54 },
-    { type: 'chapter', title: '4. Divide-and-Conquer', page: 65 },
-    { type: 'section', title: '4.1 The maximum-subarray problem', page: 65 },
-    { type: 'section', title: '4.2 Strassen\'s algorithm', page: 76 },
-    { type: 'section', title: '4.3 Substitution method', page: 83 },
-    { type: 'section', title: '4.4 Recursion-tree method', page: 91 },
-    { type: 'section', title: '4.5 Master method', page: 99 },
-    { type: 'chapter', title: '5. Probabilistic Analysis', page: 114 },
-    { type: 'section', title: '5.1 The hiring problem', page: 114 },
-    { type: 'section', title: '5.2 Indicator random variables', page: 121 },
-    { type: 'section', title: '5.3 Randomized algorithms', page: 129 },
-
-    { type: 'part', title: 'PART II: SORTING AND ORDER STATISTICS' },
-    { type: 'chapter', title: '6. Heapsort', page: 151 },
-    { type: 'section', title: '6.1 Heaps', page: 151 },
-    { type: 'section', title: '6.2 Maintaining the heap property', page: 156 },
-    { type: 'section', title: '6.3 Building a heap', page: 160 },
-    { type: 'section', title: '6.4 The heapsort algorithm', page: 163 },
-    { type: 'section', title: '6.5 Priority queues', page: 166 },
-    { type: 'chapter', title: '7. Quicksort', page: 170 },
-    { type: 'section', title: '7.1 Description of quicksort', page: 170 },
-    { type: 'section', title: '7.2 Performance of quicksort', page: 179 },
-    { type: 'section', title: '7.3 Randomized quicksort', page: 183 },
-    { type: 'chapter', title: '8. Sorting in Linear Time', page: 191 },
-    { type: 'section', title: '8.1 Lower bounds for sorting', page: 191 },
-    { type: 'section', title: '8.2 Counting sort', page: 196 },
-    { type: 'section', title: '8.3 Radix sort', page: 200 },
-    { type: 'section', title: '8.4 Bucket sort', page: 205 },
-    { type: 'chapter', title: '9. Medians and Order Statistics', page: 213 },
-    { type: 'section', title: '9.1 Minimum and maximum', page: 213 },
-    { type: 'section', title: '9.2 Selection in expected linear time', page: 216 },
-    { type: 'section', title: '9.3 Selection in worst-case linear time', page: 223 },
-
-    { type: 'part', title: 'PART III: DATA STRUCTURES' },
-    { type: 'chapter', title: '10. Elementary Data Structures', page: 232 },
-    { type: 'section', title: '10.1 Stacks and queues', page: 232 },
-    { type: 'section', title: '10.2 Linked lists', page: 237 },
-    { type: 'section', title: '10.3 Implementing pointers and objects', page: 242 },
-    { type: 'section', title: '10.4 Representing rooted trees', page: 247 },
-    { type: 'chapter', title: '11. Hash Tables', page: 253 },
-    { type: 'section', title: '11.1 Direct-address tables', page: 253 },
-    { type: 'section', title: '11.2 Hash tables', page: 257 },
-    { type: 'section', title: '11.3 Hash functions', page: 266 },
-    { type: 'section', title: '11.4 Open addressing', page: 278 },
-    { type: 'chapter', title: '12. Binary Search Trees', page: 286 },
-    { type: 'section', title: '12.1 What is a binary search tree?', page: 286 },
-    { type: 'section', title: '12.2 Querying a binary search tree', page: 291 },
-    { type: 'section', title: '12.3 Insertion and deletion', page: 297 },
-    { type: 'chapter', title: '13. Red-Black Trees', page: 308 },
-    { type: 'section', title: '13.1 Properties of red-black trees', page: 308 },
-    { type: 'section', title: '13.2 Rotations', page: 313 },
-    { type: 'section', title: '13.3 Insertion', page: 317 },
-    { type: 'section', title: '13.4 Deletion', page: 329 },
-    { type: 'chapter', title: '14. Augmenting Data Structures', page: 339 },
-    { type: 'section', title: '14.1 Dynamic order statistics', page: 339 },
-    { type: 'section', title: '14.2 How to augment a data structure', page: 346 },
-    { type: 'section', title: '14.3 Interval trees', page: 351 },
-
-    { type: 'part', title: 'PART IV: ADVANCED DESIGN TECHNIQUES' },
-    { type: 'chapter', title: '15. Dynamic Programming', page: 359 },
-    { type: 'section', title: '15.1 Rod cutting', page: 359 },
-    { type: 'section', title: '15.2 Matrix-chain multiplication', page: 371 },
-    { type: 'section', title: '15.3 Elements of dynamic programming', page: 384 },
-    { type: 'section', title: '15.4 Longest common subsequence', page: 394 },
-    { type: 'section', title: '15.5 Optimal binary search trees', page: 404 },
-    { type: 'chapter', title: '16. Greedy Algorithms', page: 414 },
-    { type: 'section', title: '16.1 An activity-selection problem', page: 414 },
-    { type: 'section', title: '16.2 Elements of the greedy strategy', page: 422 },
-    { type: 'section', title: '16.3 Huffman codes', page: 429 },
-    { type: 'chapter', title: '17. Amortized Analysis', page: 451 },
-    { type: 'section', title: '17.1 Aggregate analysis', page: 451 },
-    { type: 'section', title: '17.2 The accounting method', page: 457 },
-    { type: 'section', title: '17.3 The potential method', page: 462 },
-    { type: 'section', title: '17.4 Dynamic tables', page: 469 },
-
-    { type: 'part', title: 'PART V: ADVANCED DATA STRUCTURES' },
-    { type: 'chapter', title: '18. B-Trees', page: 484 },
-    { type: 'section', title: '18.1 Definition of B-trees', page: 484 },
-    { type: 'section', title: '18.2 Basic operations on B-trees', page: 491 },
-    { type: 'section', title: '18.3 Deleting a key from a B-tree', page: 501 },
-    { type: 'chapter', title: '19. Fibonacci Heaps', page: 505 },
-    { type: 'section', title: '19.1 Structure of Fibonacci heaps', page: 506 },
-    { type: 'section', title: '19.2 Mergeable-heap operations', page: 509 },
-    { type: 'section', title: '19.3 Decreasing a key and deleting a node', page: 518 },
-    { type: 'section', title: '19.4 Bounding the maximum degree', page: 523 },
-    { type: 'chapter', title: '20. van Emde Boas Trees', page: 531 },
-    { type: 'section', title: '20.1 Preliminary approaches', page: 532 },
-    { type: 'section', title: '20.2 A recursive structure', page: 537 },
-    { type: 'section', title: '20.3 The van Emde Boas tree', page: 545 },
-    { type: 'chapter', title: '21. Data Structures for Disjoint Sets', page: 561 },
-    { type: 'section', title: '21.1 Disjoint-set operations', page: 561 },
-    { type: 'section', title: '21.2 Linked-list representation', page: 566 },
-    { type: 'section', title: '21.3 Disjoint-set forests', page: 571 },
-    { type: 'section', title: '21.4 Analysis of union by rank with path compression', page: 579 },
-
-    { type: 'part', title: 'PART VI: GRAPH ALGORITHMS' },
-    { type: 'chapter', title: '22. Elementary Graph Algorithms', page: 589 },
-    { type: 'section', title: '22.1 Representations of graphs', page: 589 },
-    { type: 'section', title: '22.2 Breadth-first search', page: 595 },
-    { type: 'section', title: '22.3 Depth-first search', page: 604 },
-    { type: 'section', title: '22.4 Topological sort', page: 613 },
-    { type: 'section', title: '22.5 Strongly connected components', page: 617 },
-    { type: 'chapter', title: '23. Minimum Spanning Trees', page: 624 },
-    { type: 'section', title: '23.1 Growing a minimum spanning tree', page: 624 },
-    { type: 'section', title: '23.2 Kruskal and Prim algorithms', page: 631 },
-    { type: 'chapter', title: '24. Single-Source Shortest Paths', page: 643 },
-    { type: 'section', title: '24.1 Bellman-Ford algorithm', page: 643 },
-    { type: 'section', title: '24.2 Single-source shortest paths in DAGs', page: 652 },
-    { type: 'section', title: '24.3 Dijkstra\'s algorithm', page: 657 },
-    { type: 'section', title: '24.4 Difference constraints', page: 669 },
-    { type: 'section', title: '24.5 Proofs of shortest-paths properties', page: 676 },
-    { type: 'chapter', title: '25. All-Pairs Shortest Paths', page: 684 },
-    { type: 'section', title: '25.1 Shortest paths and matrix multiplication', page: 684 },
-    { type: 'section', title: '25.2 Floyd-Warshall algorithm', page: 691 },
-    { type: 'section', title: '25.3 Johnson\'s algorithm', page: 699 },
-    { type: 'chapter', title: '26. Maximum Flow', page: 708 },
-    { type: 'section', title: '26.1 Flow networks', page: 708 },
-    { type: 'section', title: '26.2 Ford-Fulkerson method', page: 721 },
-    { type: 'section', title: '26.3 Maximum bipartite matching', page: 756 },
-
-    { type: 'part', title: 'PART VII: SELECTED TOPICS' },
-    { type: 'chapter', title: '27. Multithreaded Algorithms', page: 772 },
-    { type: 'section', title: '27.1 The basics of dynamic multithreading', page: 773 },
-    { type: 'section', title: '27.2 Multithreaded matrix multiplication', page: 793 },
-    { type: 'section', title: '27.3 Multithreaded merge sort', page: 800 },
-    { type: 'chapter', title: '28. Matrix Operations', page: 813 },
-    { type: 'section', title: '28.1 Solving systems of linear equations', page: 813 },
-    { type: 'section', title: '28.2 Inverting matrices', page: 828 },
-    { type: 'section', title: '28.3 Symmetric positive-definite matrices', page: 833 },
-    { type: 'chapter', title: '29. Linear Programming', page: 843 },
-    { type: 'section', title: '29.1 Standard and slack forms', page: 850 },
-    { type: 'section', title: '29.2 Formulating problems as linear programs', page: 859 },
-    { type: 'section', title: '29.3 The simplex algorithm', page: 864 },
-    { type: 'chapter', title: '30. Polynomials and the FFT', page: 898 },
-    { type: 'section', title: '30.1 Representing polynomials', page: 899 },
-    { type: 'section', title: '30.2 The DFT and FFT', page: 906 },
-    { type: 'section', title: '30.3 Efficient FFT implementations', page: 915 },
-    { type: 'chapter', title: '31. Number-Theoretic Algorithms', page: 926 },
-    { type: 'section', title: '31.1 Elementary number-theoretic notions', page: 926 },
-    { type: 'section', title: '31.2 Greatest common divisor', page: 933 },
-    { type: 'section', title: '31.3 Modular arithmetic', page: 939 },
-    { type: 'section', title: '31.4 Solving modular linear equations', page: 946 },
-    { type: 'section', title: '31.5 The Chinese remainder theorem', page: 950 },
-    { type: 'section', title: '31.6 Powers of an element', page: 954 },
-    { type: 'section', title: '31.7 The RSA public-key cryptosystem', page: 958 },
-    { type: 'section', title: '31.8 Primality testing', page: 965 },
-    { type: 'section', title: '31.9 Integer factorization', page: 975 },
-    { type: 'chapter', title: '32. String Matching', page: 985 },
-    { type: 'section', title: '32.1 The naive string-matching algorithm', page: 985 },
-    { type: 'section', title: '32.2 The Rabin-Karp algorithm', page: 989 },
-    { type: 'section', title: '32.3 String matching with finite automata', page: 995 },
-    { type: 'section', title: '32.4 The Knuth-Morris-Pratt algorithm', page: 1002 },
-    { type: 'chapter', title: '33. Computational Geometry', page: 1014 },
-    { type: 'section', title: '33.1 Line-segment properties', page: 1015 },
-    { type: 'section', title: '33.2 Determining whether any pair of segments intersects', page: 1021 },
-    { type: 'section', title: '33.3 Finding the convex hull', page: 1029 },
-    { type: 'section', title: '33.4 Finding the closest pair of points', page: 1039 },
-    { type: 'chapter', title: '34. NP-Completeness', page: 1048 },
-    { type: 'section', title: '34.1 Polynomial time', page: 1048 },
-    { type: 'section', title: '34.2 Polynomial-time verification', page: 1058 },
-    { type: 'section', title: '34.3 NP-completeness and reducibility', page: 1066 },
-    { type: 'section', title: '34.4 NP-completeness proofs', page: 1076 },
-    { type: 'section', title: '34.5 NP-complete problems', page: 1086 },
-    { type: 'chapter', title: '35. Approximation Algorithms', page: 1106 },
-    { type: 'section', title: '35.1 The vertex-cover problem', page: 1108 },
-    { type: 'section', title: '35.2 The traveling-salesman problem', page: 1111 },
-    { type: 'section', title: '35.3 The set-covering problem', page: 1117 },
-    { type: 'section', title: '35.4 Randomization and linear programming', page: 1123 },
-    { type: 'section', title: '35.5 The subset-sum problem', page: 1128 },
-
-    { type: 'part', title: 'PART VIII: APPENDIX' },
-    { type: 'chapter', title: 'A. Summations', page: 1145 },
-    { type: 'chapter', title: 'B. Sets, Relations, Functions, Graphs, Trees', page: 1158 },
-    { type: 'chapter', title: 'C. Counting and Probability', page: 1183 },
-    { type: 'chapter', title: 'D. Matrices', page: 1217 },
-];
+// Full TOC structure, from data/toc.json (also read by build_thumbnail_sprites.py)
+let TOC_DATA = [];
 
 // ==================== INITIALIZATION ====================
 document.addEventListener('DOMContentLoaded', init);
 
 async function init() {
+    // The tile index is optional; fetch it and the TOC alongside the manifest
+    const tiles = loadTileIndex();
+    const toc = fetch('data/toc.json').then(r => r.json()).catch(() => []);
+
     // Load manifest
     try {
         const manifest = await fetch('data/manifest.json').then(r => r.json());
@@ -211,13 +30,25 @@ async function init() {
     } catch (e) {
         console.warn('Could not load manifest, using defaults');
     }
+    tileIndex = await tiles;
+    TOC_DATA = await toc;
 
+    registerServiceWorker();
     loadPage(currentPage);
     setView(currentView);
     setupEventListeners();
     updateUI();
 }
 
+function registerServiceWorker() {
+    // Offline mode: sw.js serves files from the precache built by build_precache.py
+    if (!('serviceWorker' in navigator)) return;
+    navigator.serviceWorker.register('sw.js').then(registration => {
+        // Pick up files whose hashes changed since the worker was installed
+        if (registration.active) registration.active.postMessage('sync');
+    }).catch(() => {});
+}
+
 function setupEventListeners() {
     // Menu trigger
     document.getElementById('menuTrigger').addEventListener('click', toggleMenu);
@@ -240,6 +71,11 @@ function setupEventListeners() {
     // Keyboard shortcuts
     document.addEventListener('keydown', handleKeyboard);
 
+    // Deep-zoom tiles follow the viewport; capture catches scrolling in any container
+    window.addEventListener('scroll', scheduleTileRender, true);
+    window.addEventListener('resize', scheduleTileRender);
+    document.addEventListener('transitionend', scheduleTileRender, true);
+
     // Render TOC
     renderTOC();
 }
@@ -276,6 +112,23 @@ function closeTOC() {
     document.getElementById('tocOverlay').classList.remove('active');
 }
 
+// Page preview cut from a sprite sheet (build_thumbnail_sprites.py); thumbnails
+// are stored at 2x, so the sheet is drawn at half size
+function thumbHTML(page) {
+    const entry = State.manifest && State.manifest.pages && State.manifest.pages[page - 1];
+    if (!entry || !entry.thumb) return '';
+
+    // Sheets are keyed by number, not array position
+    const [sheetNum, x, y, width, height] = entry.thumb;
+    const sheets = State.manifest.thumbnails && State.manifest.thumbnails.sheets;
+    const sheet = sheets && Object.hasOwn(sheets, sheetNum) && sheets[sheetNum];
+    if (!sheet) return '';
+    return `<span class="toc-thumb" style="width: ${width / 2}px; height: ${height / 2}px;
+                background-image: url('${sheet.src}');
+                background-size: ${sheet.width / 2}px ${sheet.height / 2}px;
+                background-position: -${x / 2}px -${y / 2}px"></span>`;
+}
+
 function renderTOC(filter = '') {
     const container = document.getElementById('tocContent');
     const lowerFilter = filter.toLowerCase();
@@ -295,6 +148,7 @@ function renderTOC(filter = '') {
         } else if (item.type === 'chapter') {
             if (!filter || item.title.toLowerCase().includes(lowerFilter)) {
                 html += `<div class="toc-chapter" data-page="${item.page}" onclick="window.tocGoToPage(${item.page})">
+                    ${thumbHTML(item.page)}
                     <span>${item.title}</span>
                     <span class="page-num">p.${item.page}</span>
                 </div>`;
@@ -313,8 +167,71 @@ function renderTOC(filter = '') {
     updateTOCHighlight();
 }
 
-function filterTOC(query) {
+let autocompleteRequest = null;
+
+function loadAutocompleteIndex() {
+    if (!autocompleteRequest) {
+        autocompleteRequest = fetch('data/autocomplete.json')
+            .then(r => r.json())
+            .catch(() => null);
+    }
+    return autocompleteRequest;
+}
+
+// Mirrors complete() in build_autocomplete_index.py
+function completePrefix(index, prefix, limit = 8) {
+    prefix = prefix.toLowerCase().trim();
+    const heads = index.heads;
+    let lo = 0, hi = heads.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (heads[mid] < prefix) lo = mid + 1;
+        else hi = mid;
+    }
+
+    const results = [];
+    const seen = new Set();
+    for (let block = Math.max(lo - 1, 0); block < heads.length; block++) {
+        let key = '';
+        for (const [offset, [shared, suffix]] of index.blocks[block].entries()) {
+            key = key.slice(0, shared) + suffix;
+            if (key < prefix) continue;
+            if (!key.startsWith(prefix)) return results;
+            const ref = index.refs[block * index.blockSize + offset];
+            if (!seen.has(ref)) {
+                seen.add(ref);
+                results.push(index.targets[ref]);
+                if (results.length === limit) return results;
+            }
+        }
+    }
+    return results;
+}
+
+// Labels and titles from the indexes go through textContent, like the figure captions
+function escapeHTML(text) {
+    const span = document.createElement('span');
+    span.textContent = text;
+    return span.innerHTML;
+}
+
+async function filterTOC(query) {
     renderTOC(query);
+    if (!query.trim()) return;
+
+    const index = await loadAutocompleteIndex();
+    if (!index || document.getElementById('tocSearch').value !== query) return;
+
+    const completions = completePrefix(index, query);
+    if (completions.length === 0) return;
+
+    const html = completions.map(([label, page, kind]) => `
+        <div class="toc-section" data-page="${Number(page)}" onclick="window.tocGoToPage(${Number(page)})">
+            <span>${escapeHTML(label)}</span>
+            <span class="page-num">${kind === 'section' || kind === 'chapter' ? '' : escapeHTML(kind) + ' '}${Number(page)}</span>
+        </div>`).join('');
+    document.getElementById('tocContent').insertAdjacentHTML('afterbegin',
+        `<div class="toc-part">Suggestions</div>${html}`);
 }
 
 function updateTOCHighlight() {
@@ -388,22 +305,253 @@ function updateUI() {
 }
 
 // ==================== PAGE LOADING ====================
-async function loadPage(page) {
-    const reader = document.getElementById('reader');
+// Gzipped bytes the reader may spend prefetching after each page turn
+const PREFETCH_BUDGET = 64 * 1024;
 
-    // Load page data if not cached
+async function fetchPage(page) {
     if (!pageCache[page]) {
         try {
             const paddedNum = String(page).padStart(4, '0');
-            const data = await fetch(`data/pages/page-${paddedNum}.json`).then(r => r.json());
+            // cbor_pages.py --use-in-reader switches the reader to binary records
+            const data = State.manifest && State.manifest.pageFormat === 'cbor'
+                ? await fetch(`data/pages-cbor/page-${paddedNum}.cbor`).then(r => r.arrayBuffer()).then(decodeCBOR)
+                : await fetch(`data/pages/page-${paddedNum}.json`).then(r => r.json());
             pageCache[page] = data;
         } catch (e) {
             // Page data not available
             pageCache[page] = null;
         }
     }
+    return pageCache[page];
+}
+
+function prefetchNeighbors(page) {
+    // Hints come from build_manifest_hints.py: next page, next section, cross-refs
+    const entry = State.manifest && State.manifest.pages && State.manifest.pages[page - 1];
+    if (!entry || !entry.prefetch) return;
+
+    let budget = PREFETCH_BUDGET;
+    for (const target of entry.prefetch) {
+        if (target in pageCache) continue;
+        const size = (State.manifest.pages[target - 1] || {}).gzipBytes || 0;
+        if (size > budget) break;
+        budget -= size;
+        fetchPage(target);
+    }
+}
+
+// Scan mapped to a page by build_image_index.py; older manifests fall back to the naming convention
+function pageImageSrc(page) {
+    const entry = State.manifest && State.manifest.pages && State.manifest.pages[page - 1];
+    return entry && entry.image ? entry.image.src : `../clrs_pages/clrs-${String(page).padStart(4, '0')}.png`;
+}
+
+// Page whose image files serve a page: duplicates found by build_image_dedup.py
+// share the canonical page's tiles, crop and derivatives
+function imagePage(page) {
+    const entry = State.manifest && State.manifest.pages && State.manifest.pages[page - 1];
+    return (entry && entry.image && entry.image.duplicateOf) || page;
+}
+
+// Warm the cache with the next page's image; only mapped images are requested, so nothing 404s
+function prefetchNextImage(page) {
+    const next = State.manifest && State.manifest.pages && State.manifest.pages[page];
+    if (currentView !== 'image' || !next || !next.image) return;
+    if (tileIndex && tileIndex.pages[imagePage(page + 1)] && navigator.onLine) return;
+
+    const cropped = pickCrop(page + 1, currentZoom);
+    const picked = pickImage(page + 1, currentZoom);
+    new Image().src = cropped ? cropped.image.src : picked ? picked.image.src : next.image.src;
+}
+
+// Smallest derivative (build_image_derivatives.py) that covers the displayed
+// width at the current zoom and pixel ratio; the last entry is the full scan
+function pickImage(page, zoom) {
+    const entry = State.manifest && State.manifest.pages && State.manifest.pages[imagePage(page) - 1];
+    const images = entry && entry.images;
+    if (!images || !images.length) return null;
+
+    const full = images[images.length - 1];
+    const reader = document.getElementById('reader');
+    const displayed = Math.min(full.width, reader ? reader.clientWidth : full.width);
+    const needed = displayed * (window.devicePixelRatio || 1) * zoom / 100;
+    return { image: images.find(i => i.width >= needed) || full, full };
+}
+
+// ==================== DEEP-ZOOM TILES ====================
+// Tile pyramids from build_image_tiles.py; pages without one fall back to pickImage()
+let tileIndexRequest = null;
+let tileIndex = null;
+let tileRenderPending = false;
+
+function loadTileIndex() {
+    if (!tileIndexRequest) {
+        tileIndexRequest = fetch('data/tile-index.json')
+            .then(r => r.json())
+            .catch(() => null);
+    }
+    return tileIndexRequest;
+}
+
+function tileURL(page, level, col, row) {
+    return `${tileIndex.base}/clrs-${String(page).padStart(4, '0')}_files/${level}/${col}_${row}.${tileIndex.format}`;
+}
+
+function tileViewHTML(page) {
+    // data-page names the pyramid, which is the canonical page's for a duplicate
+    const source = imagePage(page);
+    const [width, height, , minLevel] = tileIndex.pages[source];
+    // The single-tile level is stretched underneath as a placeholder while tiles load
+    return `<div class="tile-view zoom-${currentZoom}" id="pageImage"
+                 role="img" aria-label="Page ${page}" data-page="${source}"
+                 style="width: ${width}px; aspect-ratio: ${width} / ${height};
+                        background-image: url('${tileURL(source, minLevel, 0, 0)}')"></div>`;
+}
+
+// Mirrors pyramid_levels()/level_size() in build_image_tiles.py: picks the smallest
+// level that covers the displayed width at the current zoom and pixel ratio, then
+// keeps exactly the tiles of that level that intersect the viewport
+function renderTiles() {
+    tileRenderPending = false;
+    const view = document.getElementById('pageImage');
+    if (!view || !view.classList.contains('tile-view') || currentView !== 'image') return;
+
+    const page = parseInt(view.dataset.page);
+    const [width, height, maxLevel, minLevel] = tileIndex.pages[page];
+    const size = tileIndex.tileSize;
+    const needed = view.offsetWidth * (window.devicePixelRatio || 1) * currentZoom / 100;
+    let level = minLevel;
+    while (level < maxLevel && Math.ceil(width / 2 ** (maxLevel - level)) < needed) level++;
+    const levelWidth = Math.ceil(width / 2 ** (maxLevel - level));
+    const levelHeight = Math.ceil(height / 2 ** (maxLevel - level));
+
+    // Visible part of the page in level pixels (the rect includes the zoom transform)
+    const rect = view.getBoundingClientRect();
+    const scale = levelWidth / rect.width;
+    const left = Math.max(0, -rect.left) * scale;
+    const top = Math.max(0, -rect.top) * scale;
+    const right = Math.min(rect.width, window.innerWidth - rect.left) * scale;
+    const bottom = Math.min(rect.height, window.innerHeight - rect.top) * scale;
+
+    const wanted = new Map();
+    for (let row = Math.floor(top / size); row * size < Math.min(bottom, levelHeight); row++) {
+        for (let col = Math.floor(left / size); col * size < Math.min(right, levelWidth); col++) {
+            wanted.set(`${level}/${col}_${row}`, [col, row]);
+        }
+    }
+
+    // Drop tiles that scrolled away or belong to another level; keep the rest
+    for (const tile of [...view.children]) {
+        if (!wanted.delete(tile.dataset.key)) tile.remove();
+    }
+    for (const [key, [col, row]] of wanted) {
+        const tile = document.createElement('img');
+        tile.src = tileURL(page, level, col, row);
+        tile.alt = '';
+        tile.dataset.key = key;
+        tile.style.left = `${col * size / levelWidth * 100}%`;
+        tile.style.top = `${row * size / levelHeight * 100}%`;
+        tile.style.width = `${Math.min(size, levelWidth - col * size) / levelWidth * 100}%`;
+        tile.style.height = `${Math.min(size, levelHeight - row * size) / levelHeight * 100}%`;
+        view.appendChild(tile);
+    }
+}
+
+function scheduleTileRender() {
+    if (tileRenderPending || !tileIndex) return;
+    tileRenderPending = true;
+    requestAnimationFrame(renderTiles);
+}
+
+// Cropped text block (build_image_crops.py) at the smallest scale that covers the
+// displayed page width; it sits at its offset in a frame of the full page size
+function pickCrop(page, zoom) {
+    const entry = State.manifest && State.manifest.pages && State.manifest.pages[imagePage(page) - 1];
+    const crop = entry && entry.crop;
+    if (!crop) return null;
+
+    const reader = document.getElementById('reader');
+    const displayed = Math.min(crop.pageWidth, reader ? reader.clientWidth : crop.pageWidth);
+    const needed = displayed * (window.devicePixelRatio || 1) * zoom / 100;
+    return { image: crop.images.find(i => i.pageWidth >= needed) || crop.images[crop.images.length - 1], crop };
+}
+
+function croppedViewHTML(page, picked) {
+    const { image, crop } = picked;
+    const percent = (value, total) => `${value / total * 100}%`;
+    return `<div class="cropped-view zoom-${currentZoom}" id="pageImage" data-page-width="${image.pageWidth}"
+                 style="width: ${crop.pageWidth}px; aspect-ratio: ${crop.pageWidth} / ${crop.pageHeight}">
+                <img src="${image.src}" alt="Page ${page}"
+                     style="left: ${percent(crop.x, crop.pageWidth)}; top: ${percent(crop.y, crop.pageHeight)};
+                            width: ${percent(crop.width, crop.pageWidth)}">
+            </div>`;
+}
+
+function pageImageHTML(page) {
+    // Tiles are not precached (build_precache.py), so offline the cropped page is shown
+    if (tileIndex && tileIndex.pages[imagePage(page)] && navigator.onLine) return tileViewHTML(page);
+    const cropped = pickCrop(page, currentZoom);
+    if (cropped) return croppedViewHTML(page, cropped);
+
+    const picked = pickImage(page, currentZoom);
+    if (!picked) {
+        return `<img src="${pageImageSrc(page)}"
+                 alt="Page ${page}"
+                 class="zoom-${currentZoom}"
+                 id="pageImage">`;
+    }
+    // width/height are the full scan's, so the layout does not depend on which file loads
+    return `<img src="${picked.image.src}"
+                 width="${picked.full.width}" height="${picked.full.height}"
+                 data-width="${picked.image.width}"
+                 alt="Page ${page}"
+                 class="zoom-${currentZoom}"
+                 id="pageImage">`;
+}
+
+// ==================== FIGURES ====================
+// Figures cut out of the scans by build_figures.py, shown under the page text
+let figureIndexRequest = null;
+
+function loadFigureIndex() {
+    if (!figureIndexRequest) {
+        figureIndexRequest = fetch('data/figure-index.json')
+            .then(r => r.json())
+            .catch(() => null);
+    }
+    return figureIndexRequest;
+}
 
-    const data = pageCache[page];
+async function inlineFigures(page) {
+    const index = await loadFigureIndex();
+    const numbers = index && index.pages[page];
+    const textView = document.getElementById('textView');
+    if (!numbers || !textView || currentPage !== page) return;
+
+    for (const number of numbers) {
+        const info = index.figures[number];
+        const img = document.createElement('img');
+        img.src = info.src;
+        img.width = info.width;
+        img.height = info.height;
+        img.loading = 'lazy';
+        img.alt = `Figure ${number}`;
+        // Captions are OCR text, so they are set as text rather than HTML
+        const caption = document.createElement('figcaption');
+        caption.textContent = info.caption;
+        const figure = document.createElement('figure');
+        figure.className = 'page-figure';
+        figure.append(img, caption);
+        textView.appendChild(figure);
+    }
+}
+
+async function loadPage(page) {
+    const reader = document.getElementById('reader');
+
+    const data = await fetchPage(page);
+    prefetchNeighbors(page);
+    prefetchNextImage(page);
 
     const zoomButtonsHTML = ZOOM_LEVELS.map(level =>
         `<button class="zoom-btn ${currentZoom === level ? 'active' : ''}" onclick="window.setZoom(${level})">${level}%</button>`
@@ -416,10 +564,7 @@ async function loadPage(page) {
                 <span>Zoom</span>
                 ${zoomButtonsHTML}
             </div>
-            <img src="../clrs_pages/clrs-${String(page).padStart(4, '0')}.png"
-                 alt="Page ${page}"
-                 class="zoom-${currentZoom}"
-                 id="pageImage">
+            ${pageImageHTML(page)}
         </div>
     `;
 
@@ -440,6 +585,8 @@ async function loadPage(page) {
     `;
 
     reader.innerHTML = imageHTML + textHTML;
+    scheduleTileRender();
+    inlineFigures(page);
 
     // Update menu title after loading
     document.getElementById('menuPageTitle').textContent = data ? data.title : `Page ${page}`;
@@ -455,6 +602,7 @@ function setView(view) {
 
     if (imageView) imageView.classList.toggle('hidden', view !== 'image');
     if (textView) textView.classList.toggle('active', view === 'text');
+    scheduleTileRender();
 
     // Update menu items
     document.getElementById('viewImage').classList.toggle('active', view === 'image');
@@ -478,20 +626,157 @@ window.setZoom = function(level) {
         ZOOM_LEVELS.forEach(l => img.classList.remove(`zoom-${l}`));
         // Add current zoom class
         img.classList.add(`zoom-${level}`);
+
+        // Zooming in may need a wider derivative; never swap down to a smaller one
+        if (img.classList.contains('cropped-view')) {
+            const cropped = pickCrop(currentPage, level);
+            if (cropped && cropped.image.pageWidth > parseInt(img.dataset.pageWidth)) {
+                img.firstElementChild.src = cropped.image.src;
+                img.dataset.pageWidth = cropped.image.pageWidth;
+            }
+        } else {
+            const picked = pickImage(currentPage, level);
+            if (picked && picked.image.width > parseInt(img.dataset.width)) {
+                img.src = picked.image.src;
+                img.dataset.width = picked.image.width;
+            }
+        }
     }
 
     // Update button states
     document.querySelectorAll('.zoom-btn').forEach(btn => {
         btn.classList.toggle('active', btn.textContent === `${level}%`);
     });
+    scheduleTileRender();
 }
 
 function openFullscreen() {
-    window.open(`../clrs_pages/clrs-${String(currentPage).padStart(4, '0')}.png`, '_blank');
+    window.open(pageImageSrc(currentPage), '_blank');
     closeMenu();
 }
 
 // ==================== SEARCH ====================
+// Mirrors tokenize() in build_search_index.py
+const SMALL_CAPS_GAP = /\b([A-Z]) ([A-Z]{2,})\b/g;
+const TOKEN_PATTERN = /\d+(?:\.\d+)+|[a-z0-9]+/g;
+const STOP_WORDS = new Set([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'in',
+    'is', 'it', 'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was',
+    'we', 'which', 'with'
+]);
+// Mirrors MIN_SIMILARITY in build_trigram_index.py
+const MIN_TRIGRAM_SIMILARITY = 0.6;
+const MAX_SEARCH_RESULTS = 5;
+// Definition pages shown above the ranked results when the query names an algorithm or theorem
+const MAX_DEFINITION_RESULTS = 2;
+// Pages listed under "Used on" for such a query; the list starts collapsed
+const MAX_USE_RESULTS = 20;
+let searchIndexRequest = null;
+let trigramIndexRequest = null;
+let xrefIndexRequest = null;
+
+function loadSearchIndex() {
+    if (!searchIndexRequest) {
+        searchIndexRequest = fetch('data/search-index.json')
+            .then(r => r.json())
+            .catch(() => null);
+    }
+    return searchIndexRequest;
+}
+
+function loadTrigramIndex() {
+    if (!trigramIndexRequest) {
+        trigramIndexRequest = fetch('data/trigram-index.json')
+            .then(r => r.json())
+            .catch(() => null);
+    }
+    return trigramIndexRequest;
+}
+
+function loadXrefIndex() {
+    if (!xrefIndexRequest) {
+        xrefIndexRequest = fetch('data/xref-index.json')
+            .then(r => r.json())
+            .catch(() => null);
+    }
+    return xrefIndexRequest;
+}
+
+// Mirrors decode_postings() in build_xref_index.py
+function decodePostings(encoded) {
+    const bytes = atob(encoded);
+    const pages = [];
+    let prev = 0, value = 0, shift = 0;
+    for (let i = 0; i < bytes.length; i++) {
+        const byte = bytes.charCodeAt(i);
+        value |= (byte & 0x7f) << shift;
+        if (byte & 0x80) {
+            shift += 7;
+            continue;
+        }
+        prev += value;
+        pages.push(prev);
+        value = shift = 0;
+    }
+    return pages;
+}
+
+// Definition and usage pages for an algorithm name or "Theorem 4.1" style query
+function xrefLookup(index, query) {
+    const name = query.trim().replace(SMALL_CAPS_GAP, '$1$2');
+    const algo = name.toUpperCase().replace(/\s+/g, '-');
+    const theorem = name.charAt(0).toUpperCase() + name.slice(1).toLowerCase();
+    const entry = (Object.hasOwn(index.algorithms, algo) && index.algorithms[algo]) ||
+        (Object.hasOwn(index.theorems, theorem) && index.theorems[theorem]);
+    if (!entry) return null;
+    return { definitions: decodePostings(entry[0]), uses: decodePostings(entry[1]) };
+}
+
+function tokenize(text) {
+    const normalized = text.normalize('NFKC').replace(SMALL_CAPS_GAP, '$1$2').toLowerCase();
+    return (normalized.match(TOKEN_PATTERN) || []).filter(t => t.length > 1 && !STOP_WORDS.has(t));
+}
+
+function rankPages(index, query) {
+    // BM25 weights are precomputed per (term, page), so ranking is a sum
+    const scores = new Map();
+    for (const term of new Set(tokenize(query))) {
+        const flat = Object.hasOwn(index.postings, term) ? index.postings[term] : [];
+        for (let i = 0; i < flat.length; i += 2) {
+            scores.set(flat[i], (scores.get(flat[i]) || 0) + flat[i + 1]);
+        }
+    }
+    return [...scores.entries()].sort((a, b) => b[1] - a[1]);
+}
+
+// Mirrors fold() in build_trigram_index.py
+function fold(text) {
+    return text.normalize('NFKC').replace(SMALL_CAPS_GAP, '$1$2').replace(/‚/g, 'θ')
+        .toLowerCase().replace(/[^\p{L}\p{N}]/gu, '');
+}
+
+function fuzzyRankPages(index, query) {
+    // Typo-tolerant fallback: rank pages by the share of query trigrams they contain
+    const folded = fold(query);
+    const grams = new Set();
+    for (let i = 0; i + 3 <= folded.length; i++) grams.add(folded.slice(i, i + 3));
+    const overlap = new Map();
+    for (const tri of grams) {
+        let page = 0;
+        for (const delta of index.trigrams[tri] || []) {
+            page += delta;
+            overlap.set(page, (overlap.get(page) || 0) + 1);
+        }
+    }
+    const needed = MIN_TRIGRAM_SIMILARITY * grams.size;
+    return [...overlap.entries()].filter(([, n]) => n >= needed).sort((a, b) => b[1] - a[1]);
+}
+
+function pageTitle(page) {
+    const entry = State.manifest && State.manifest.pages && State.manifest.pages[page - 1];
+    return entry && entry.page === page ? entry.title : `Page ${page}`;
+}
+
 async function handleSearch(query) {
     const container = document.getElementById('searchResults');
     if (query.length < 2) {
@@ -500,33 +785,70 @@ async function handleSearch(query) {
     }
 
     const results = [];
+    const definitionResults = [];
+    const usePages = [];
     const lowerQuery = query.toLowerCase();
 
-    // Search through manifest
-    if (State.manifest && State.manifest.pages) {
-        for (const page of State.manifest.pages) {
-            if (page.title.toLowerCase().includes(lowerQuery)) {
-                results.push({ page: page.page, title: page.title });
-            }
+    const [index, xrefIndex] = await Promise.all([loadSearchIndex(), loadXrefIndex()]);
+    if (document.getElementById('searchInput').value !== query) return;
+
+    const xref = xrefIndex && xrefLookup(xrefIndex, query);
+    const uses = new Set(xref ? xref.uses : []);
+    if (xref) {
+        // Cross-references go on top of the ranked results, never instead of them
+        const definitions = xref.definitions.slice(0, MAX_DEFINITION_RESULTS);
+        for (const page of definitions) {
+            definitionResults.push({ page, title: `Definition · ${pageTitle(page)}` });
         }
+        usePages.push(...xref.uses.filter(page => !definitions.includes(page)));
     }
+    if (index) {
+        let ranked = rankPages(index, query);
+        if (ranked.length === 0) {
+            const trigramIndex = await loadTrigramIndex();
+            if (trigramIndex) ranked = fuzzyRankPages(trigramIndex, query);
+        }
+        const defined = new Set(definitionResults.map(r => r.page));
+        for (const [page] of ranked) {
+            if (results.length >= MAX_SEARCH_RESULTS) break;
+            if (defined.has(page)) continue;
+            results.push({ page, title: uses.has(page) ? `Used · ${pageTitle(page)}` : pageTitle(page) });
+        }
+    } else {
+        // Search through manifest
+        if (State.manifest && State.manifest.pages) {
+            for (const page of State.manifest.pages) {
+                if (page.title.toLowerCase().includes(lowerQuery)) {
+                    results.push({ page: page.page, title: page.title });
+                }
+            }
+        }
 
-    // Also search cached pages for content
-    for (const [pageNum, data] of Object.entries(pageCache)) {
-        if (data && !results.find(r => r.page === parseInt(pageNum))) {
-            if (data.content.toLowerCase().includes(lowerQuery)) {
-                results.push({ page: parseInt(pageNum), title: data.title });
+        // Also search cached pages for content
+        for (const [pageNum, data] of Object.entries(pageCache)) {
+            if (data && !results.find(r => r.page === parseInt(pageNum))) {
+                if (data.content.toLowerCase().includes(lowerQuery)) {
+                    results.push({ page: parseInt(pageNum), title: data.title });
+                }
             }
         }
     }
 
-    if (results.length > 0) {
-        container.innerHTML = results.slice(0, 5).map(r => `
+    const resultHTML = r => `
             <div class="search-result" onclick="window.appGoToPage(${r.page})">
                 <div class="search-result-page">Page ${r.page}</div>
-                <div>${r.title}</div>
-            </div>
-        `).join('');
+                <div>${escapeHTML(r.title)}</div>
+            </div>`;
+    if (definitionResults.length > 0 || usePages.length > 0 || results.length > 0) {
+        // "Where else is this used": a collapsed list under the definitions, above the ranked pages
+        const usesHTML = usePages.length === 0 ? '' : `
+            <details class="search-uses">
+                <summary>Used on ${usePages.length} page${usePages.length === 1 ? '' : 's'}</summary>
+                ${usePages.slice(0, MAX_USE_RESULTS).map(page => resultHTML({ page, title: pageTitle(page) })).join('')}
+                ${usePages.length > MAX_USE_RESULTS ? `<div class="search-result-page">and ${usePages.length - MAX_USE_RESULTS} more</div>` : ''}
+            </details>`;
+        container.innerHTML = definitionResults.map(resultHTML).join('') + usesHTML +
+            results.slice(0, MAX_SEARCH_RESULTS).map(resultHTML).join('');
     } else {
         container.innerHTML = '<div class="search-result">No results</div>';
     }
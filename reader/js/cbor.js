@@ -0,0 +1,51 @@
+// cbor.js - Decoder for the binary page records written by cbor_pages.py
+const textDecoder = new TextDecoder();
+
+export function decodeCBOR(buffer) {
+    const bytes = new Uint8Array(buffer);
+    const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    let pos = 0;
+
+    function readLength(info) {
+        if (info < 24) return info;
+        if (info === 24) return bytes[pos++];
+        if (info === 25) { pos += 2; return view.getUint16(pos - 2); }
+        if (info === 26) { pos += 4; return view.getUint32(pos - 4); }
+        if (info === 27) { pos += 8; return Number(view.getBigUint64(pos - 8)); }
+        throw new Error(`Unsupported CBOR length encoding ${info}`);
+    }
+
+    function readItem() {
+        const initial = bytes[pos++];
+        const major = initial >> 5;
+        const info = initial & 0x1f;
+
+        if (major === 7) {
+            if (initial === 0xf4) return false;
+            if (initial === 0xf5) return true;
+            if (initial === 0xf6) return null;
+            if (initial === 0xfb) { pos += 8; return view.getFloat64(pos - 8); }
+            throw new Error(`Unsupported CBOR simple value ${initial}`);
+        }
+
+        const length = readLength(info);
+        switch (major) {
+            case 0: return length;
+            case 1: return -1 - length;
+            case 2: pos += length; return bytes.slice(pos - length, pos);
+            case 3: pos += length; return textDecoder.decode(bytes.subarray(pos - length, pos));
+            case 4: return Array.from({ length }, readItem);
+            case 5: {
+                const result = {};
+                for (let i = 0; i < length; i++) {
+                    const key = readItem();
+                    result[key] = readItem();
+                }
+                return result;
+            }
+        }
+        throw new Error(`Unsupported CBOR major type ${major}`);
+    }
+
+    return readItem();
+}
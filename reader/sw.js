@@ -0,0 +1,137 @@
+// sw.js - Offline reading from the content-hashed precache (see build_precache.py)
+const CACHE_NAME = 'clrs-precache';
+const MANIFEST_URL = 'precache-manifest.json';
+const DELTA_INDEX_URL = 'deltas/index.json';
+
+let urlMap = null;
+
+async function loadManifest(fromNetwork) {
+    const cache = await caches.open(CACHE_NAME);
+    let response = fromNetwork ? await fetch(MANIFEST_URL, { cache: 'no-store' }).catch(() => null) : null;
+    if (response && response.ok) {
+        await cache.put(MANIFEST_URL, response.clone());
+    } else {
+        response = await cache.match(MANIFEST_URL);
+    }
+    if (!response) return null;
+
+    const manifest = await response.json();
+    urlMap = new Map(manifest.files.map(f => [new URL(f.url, self.registration.scope).href, f.hashed]));
+    return manifest;
+}
+
+// Mirrors apply_delta() in build_page_deltas.py
+function applyDelta(old, delta) {
+    let pos = 4;
+    const readVarint = () => {
+        let value = 0, shift = 0, byte;
+        do {
+            byte = delta[pos++];
+            value += (byte & 0x7f) * 2 ** shift;
+            shift += 7;
+        } while (byte & 0x80);
+        return value;
+    };
+    const out = new Uint8Array(readVarint());
+    let written = 0;
+    while (pos < delta.length) {
+        const op = delta[pos++];
+        if (op === 0) {
+            const start = readVarint();
+            const length = readVarint();
+            out.set(old.subarray(start, start + length), written);
+            written += length;
+        } else {
+            const length = readVarint();
+            out.set(delta.subarray(pos, pos + length), written);
+            pos += length;
+            written += length;
+        }
+    }
+    return out;
+}
+
+async function shortHash(bytes) {
+    const digest = new Uint8Array(await crypto.subtle.digest('SHA-256', bytes));
+    return [...digest].map(b => b.toString(16).padStart(2, '0')).join('').slice(0, 10);
+}
+
+async function patchFromCache(cache, oldFile, file, deltaIndex) {
+    // Rebuild a changed file from the copy we already hold plus a small patch
+    const entry = oldFile && deltaIndex && deltaIndex.files[file.url];
+    const patchUrl = entry && entry.hash === file.hash && entry.patches[oldFile.hash];
+    if (!patchUrl) return false;
+
+    const oldResponse = await cache.match(new URL(oldFile.hashed, self.registration.scope).href);
+    const patchResponse = oldResponse && await fetch(patchUrl).catch(() => null);
+    if (!patchResponse || !patchResponse.ok) return false;
+
+    const old = new Uint8Array(await oldResponse.clone().arrayBuffer());
+    const patched = applyDelta(old, new Uint8Array(await patchResponse.arrayBuffer()));
+    if (await shortHash(patched) !== file.hash) return false;
+
+    // The old Content-Length describes the old body
+    const headers = new Headers(oldResponse.headers);
+    headers.delete('Content-Length');
+    await cache.put(new URL(file.hashed, self.registration.scope).href, new Response(patched, { headers }));
+    return true;
+}
+
+async function syncPrecache() {
+    // Hashed URLs never change content, so only missing ones are downloaded
+    const cache = await caches.open(CACHE_NAME);
+    const previous = await cache.match(MANIFEST_URL).then(r => r ? r.json() : null);
+    const manifest = await loadManifest(true);
+    if (!manifest) return;
+
+    const oldFiles = new Map((previous ? previous.files : []).map(f => [f.url, f]));
+    const deltaIndex = previous && await fetch(DELTA_INDEX_URL, { cache: 'no-store' })
+        .then(r => r.ok ? r.json() : null).catch(() => null);
+
+    const live = new Set([new URL(MANIFEST_URL, self.registration.scope).href]);
+    for (const file of manifest.files) {
+        const hashedUrl = new URL(file.hashed, self.registration.scope).href;
+        live.add(hashedUrl);
+        if (await cache.match(hashedUrl)) continue;
+        if (!(await patchFromCache(cache, oldFiles.get(file.url), file, deltaIndex))) {
+            await cache.add(hashedUrl).catch(() => {});
+        }
+    }
+    for (const request of await cache.keys()) {
+        if (!live.has(request.url)) await cache.delete(request);
+    }
+}
+
+self.addEventListener('install', event => {
+    event.waitUntil(syncPrecache().then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(self.clients.claim());
+});
+
+self.addEventListener('message', event => {
+    if (event.data === 'sync') event.waitUntil(syncPrecache());
+});
+
+self.addEventListener('fetch', event => {
+    if (event.request.method !== 'GET') return;
+    event.respondWith((async () => {
+        if (!urlMap) await loadManifest(false);
+        let url = event.request.url.split(/[?#]/)[0];
+        if (url.endsWith('/')) url += 'index.html';
+        const hashed = urlMap && urlMap.get(url);
+        if (!hashed) return fetch(event.request);
+
+        const hashedUrl = new URL(hashed, self.registration.scope).href;
+        const cache = await caches.open(CACHE_NAME);
+        const cached = await cache.match(hashedUrl);
+        if (cached) return cached;
+        const response = await fetch(hashedUrl).catch(() => null);
+        if (response && response.ok) {
+            cache.put(hashedUrl, response.clone());
+            return response;
+        }
+        return fetch(event.request);
+    })());
+});
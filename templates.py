@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Compiled HTML templates shared by the page generators.
+
+A template is parsed once into a list of static segments and slots, so
+rendering is a single ''.join with no re-parsing and no intermediate strings.
+Slots are written {name} and are HTML-escaped; {name|raw} inserts HTML that
+was already rendered (or escaped) by the caller. Use {{ and }} for literal
+braces.
+"""
+
+import hashlib
+import html
+import re
+
+SLOT_PATTERN = re.compile(r'\{\{|\}\}|\{(\w+)(\|raw)?\}')
+
+class Template:
+    """A template compiled into static segments with slots between them."""
+
+    __slots__ = ('source', 'segments', 'slots')
+
+    def __init__(self, source):
+        self.source = source
+        segments = []
+        slots = []
+        static = []
+        pos = 0
+        for match in SLOT_PATTERN.finditer(source):
+            static.append(source[pos:match.start()])
+            pos = match.end()
+            if match.group(1) is None:
+                static.append(match.group(0)[0])
+                continue
+            segments.append(''.join(static))
+            static = []
+            slots.append((len(segments), match.group(1), bool(match.group(2))))
+            segments.append(None)
+        static.append(source[pos:])
+        segments.append(''.join(static))
+        self.segments = segments
+        self.slots = slots
+
+    def render(self, **values):
+        """Fill every slot and join once."""
+        parts = self.segments[:]
+        escape = html.escape
+        for index, name, raw in self.slots:
+            value = values[name]
+            parts[index] = value if raw else escape(str(value))
+        return ''.join(parts)
+
+def compile_template(source):
+    """Parse a template source string once for repeated rendering."""
+    return Template(source)
+
+def render_each(template, items, sep='\n'):
+    """Render a template once per dict in items and join the results."""
+    return sep.join(template.render(**item) for item in items)
+
+def template_version(*templates):
+    """Short hash of template sources, for keying caches of rendered output."""
+    digest = hashlib.sha256()
+    for template in templates:
+        digest.update(template.source.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:12]
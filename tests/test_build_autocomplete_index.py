@@ -0,0 +1,20 @@
+from build_autocomplete_index import BLOCK_SIZE, build_index, complete, decode_block, front_code
+
+def test_front_code_round_trip():
+    keys = sorted(f"heap{'s' * i}" for i in range(BLOCK_SIZE + 3)) + ["insertion sort", "insertion-sort"]
+    index = {"blocks": front_code(keys)}
+    assert len(index["blocks"]) == 2
+    assert [key for n in range(len(index["blocks"])) for key in decode_block(index, n)] == keys
+    # Every block starts over with no shared prefix, so it decodes on its own
+    assert all(block[0][0] == 0 for block in index["blocks"])
+
+def test_front_code_empty():
+    assert front_code([]) == []
+    assert complete(build_index([]), "heap") == []
+
+def test_complete_matches_later_words():
+    index = build_index([("Heapsort", 151, "section"), ("Building a heap", 156, "section")])
+    # Completions come back in key order: "heap" sorts before "heapsort"
+    assert complete(index, "heap") == [["Building a heap", 156, "section"], ["Heapsort", 151, "section"]]
+    assert complete(index, "  BUILD") == [["Building a heap", 156, "section"]]
+    assert complete(index, "quick") == []
@@ -0,0 +1,43 @@
+import pytest
+
+from build_page_deltas import MAGIC, MIN_MATCH, OP_COPY, apply_delta, make_delta, read_varint, write_varint
+
+OLD = b'{"page": 12, "title": "Insertion sort", "content": "' + b"sorted in place " * 40 + b'"}'
+
+def test_round_trip():
+    new = OLD.replace(b"Insertion sort", b"Insertion sort, revisited") + b"\n"
+    delta = make_delta(OLD, new)
+    assert apply_delta(OLD, delta) == new
+    assert len(delta) < len(new) // 4
+
+def test_empty_old_and_new():
+    new = b"a page that did not exist in the previous build"
+    assert apply_delta(b"", make_delta(b"", new)) == new
+    assert apply_delta(OLD, make_delta(OLD, b"")) == b""
+    assert make_delta(b"", b"") == MAGIC + b"\0"
+
+def test_copy_offset_takes_a_multi_byte_varint():
+    old = bytes(300) + bytes(range(1, 101))
+    new = old[300:300 + MIN_MATCH * 2]
+    delta = make_delta(old, new)
+    assert delta[len(MAGIC) + 1] == OP_COPY
+    assert read_varint(delta, len(MAGIC) + 2) == (300, len(MAGIC) + 4)
+    assert apply_delta(old, delta) == new
+
+def test_varint_round_trip():
+    out = bytearray()
+    for value in (0, 127, 128, 300, 2**35):
+        write_varint(out, value)
+    pos = 0
+    for value in (0, 127, 128, 300, 2**35):
+        decoded, pos = read_varint(out, pos)
+        assert decoded == value
+    assert pos == len(out)
+
+def test_rejects_bad_patches():
+    with pytest.raises(ValueError):
+        apply_delta(OLD, b"XXXX\0")
+    with pytest.raises(ValueError):
+        apply_delta(OLD, make_delta(OLD, OLD) + b"\x07")
+    with pytest.raises(ValueError):
+        apply_delta(OLD[:-1], make_delta(OLD, OLD))
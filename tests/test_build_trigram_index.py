@@ -0,0 +1,21 @@
+from build_trigram_index import build_index, decode_index, encode_index, fold, fuzzy_search, substring_search
+
+PAGES = {39: "INSERTION-SORT sorts in place", 40: "Merge sort divides the array", 151: "Heapsort sorts in place"}
+
+def test_index_round_trip():
+    postings = build_index(PAGES)
+    assert decode_index(encode_index(postings)) == postings
+    assert encode_index(postings)["trigrams"]["sor"] == [39, 1, 111]
+
+def test_empty():
+    assert build_index({}) == {}
+    assert decode_index(encode_index({})) == {}
+    assert fuzzy_search(build_index(PAGES), "") == []
+
+def test_search():
+    postings = build_index(PAGES)
+    folded = {page: fold(text) for page, text in PAGES.items()}
+    assert substring_search(postings, folded, "in place") == [39, 151]
+    assert substring_search(postings, folded, "So") == [39, 40, 151]
+    # One OCR-style typo still finds the page
+    assert fuzzy_search(postings, "heapsoort")[0][0] == 151
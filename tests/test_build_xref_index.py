@@ -0,0 +1,26 @@
+import base64
+from pathlib import Path
+
+from build_xref_index import collect_entities, decode_postings, encode_postings
+
+PAGES = Path(__file__).resolve().parent.parent / "clrs_pages"
+
+def read_page(page_num):
+    return (PAGES / f"page-{page_num:04d}.txt").read_text(encoding='utf-8', errors='replace')
+
+def test_small_caps_hyphenated_names_have_uses():
+    # Page 39 defines INSERTION-SORT; the OCR writes its mentions as "I NSERTION -S ORT"
+    pages = {38: read_page(38), 39: read_page(39),
+             60: "we call I NSERTION -S ORT on each subarray, then M ERGE - S ORT"}
+    algorithms = collect_entities(pages)["algorithms"]
+    assert algorithms["INSERTION-SORT"]["def"] == {39}
+    assert {38, 60} <= algorithms["INSERTION-SORT"]["use"]
+
+def test_postings_round_trip():
+    # Gaps of 128 and more take a multi-byte varint
+    for pages in ([], [1], [5, 6, 7], [3, 131, 20000, 20001]):
+        assert decode_postings(encode_postings(pages)) == pages
+
+def test_postings_multi_byte_gap():
+    assert encode_postings([]) == ""
+    assert base64.b64decode(encode_postings([300])) == bytes([0xAC, 0x02])
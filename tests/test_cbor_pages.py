@@ -0,0 +1,32 @@
+import pytest
+
+from cbor_pages import decode, encode
+
+def test_round_trip():
+    record = {"page": 39, "title": "2.1 Insertion sort", "blank": False, "figure": None,
+              "ink": 0.125, "offset": -1, "size": 2**40, "algorithms": [], "raw": b"\x00\xff",
+              "complexity": {"worst": "Θ(n²)"}}
+    assert decode(encode(record)) == record
+
+def test_empty_values():
+    for value in ("", b"", [], {}, 0):
+        assert decode(encode(value)) == value
+    assert encode("") == b"\x60"
+    assert encode({}) == b"\xa0"
+
+def test_length_heads():
+    # Up to 23 bytes fit in the initial byte; 24 and over take a length byte
+    assert encode("x" * 23)[:1] == b"\x77"
+    assert encode("x" * 24)[:2] == b"\x78\x18"
+    assert encode("é" * 12)[:2] == b"\x78\x18"
+    assert encode("x" * 300)[:3] == b"\x79\x01\x2c"
+    for length in (23, 24, 255, 256, 70000):
+        assert decode(encode("x" * length)) == "x" * length
+    assert encode(-24) == b"\x37"
+    assert encode(-25) == b"\x38\x18"
+
+def test_rejects_trailing_bytes():
+    with pytest.raises(ValueError):
+        decode(encode(1) + b"\x00")
+    with pytest.raises(TypeError):
+        encode({1, 2})
@@ -0,0 +1,58 @@
+import pytest
+
+import knowledge_base
+from knowledge_base import LazyTable, load_table, validate
+
+CHAPTER = {"name": "Getting Started", "part": "I", "summary": "s", "key_points": ["a"], "real_world": "r"}
+
+@pytest.fixture
+def snapshot(tmp_path, monkeypatch):
+    """Build the snapshot in a scratch directory and open it fresh."""
+    monkeypatch.setattr(knowledge_base, "KNOWLEDGE_DB", tmp_path / "knowledge.db")
+    monkeypatch.setattr(knowledge_base, "_connection", None)
+    yield tmp_path / "knowledge.db"
+    if knowledge_base._connection is not None:
+        knowledge_base._connection.close()
+
+def test_valid_tables():
+    validate("chapters", {})
+    validate("chapters", {2: CHAPTER})
+    validate("page_to_section", {39: "2.1"})
+    validate("algorithms", {"x": {"name": "X", "simple": "", "analogy": "", "steps": [],
+                                  "complexity": {"worst": "n"}, "when_to_use": [],
+                                  "when_not_to_use": ["never"]}})
+
+@pytest.mark.parametrize("table, message", [
+    ({"2": CHAPTER}, "key: expected int, got str"),
+    ({2: {**CHAPTER, "summary": None}}, "['summary']: expected str, got NoneType"),
+    ({2: {**CHAPTER, "key_points": ["a", 1]}}, "['key_points'][1]: expected str, got int"),
+    ({2: {k: v for k, v in CHAPTER.items() if k != "part"}}, "missing part"),
+    ({2: {**CHAPTER, "extra": ""}}, "unknown field 'extra'"),
+    ({2: [CHAPTER]}, "expected dict, got list"),
+])
+def test_invalid_tables(table, message):
+    with pytest.raises(ValueError, match=message.replace("[", r"\[").replace("(", r"\(")):
+        validate("chapters", table)
+
+def test_nested_dict_types():
+    algorithm = {"name": "X", "simple": "", "analogy": "", "steps": [], "when_to_use": [],
+                 "complexity": {"worst": 1}}
+    with pytest.raises(ValueError, match=r"\['complexity'\]\['worst'\]: expected str"):
+        validate("algorithms", {"x": algorithm})
+
+def test_lazy_table(snapshot):
+    import knowledge_data
+    chapters = load_table("chapters")
+    assert not snapshot.exists()
+    assert chapters[2] == knowledge_data.CHAPTERS[2]
+    assert snapshot.exists()
+    # Keys are typed by the schema, so the text form of a key is not found
+    assert "2" not in chapters
+    assert list(chapters) == list(knowledge_data.CHAPTERS)
+    assert dict(chapters.items()) == knowledge_data.CHAPTERS
+    with pytest.raises(KeyError):
+        chapters[10**6]
+
+def test_unknown_table():
+    with pytest.raises(KeyError):
+        LazyTable("nope")
@@ -0,0 +1,30 @@
+import pytest
+
+from templates import compile_template, render_each, template_version
+
+def test_slots_are_escaped():
+    template = compile_template('<a title="{title}">{title}</a>')
+    assert template.render(title='<b> & "x"') == \
+        '<a title="&lt;b&gt; &amp; &quot;x&quot;">&lt;b&gt; &amp; &quot;x&quot;</a>'
+    assert compile_template("p. {page}").render(page=39) == "p. 39"
+
+def test_raw_slots_are_not():
+    template = compile_template("<ul>{items|raw}</ul><p>{note}</p>")
+    assert template.render(items="<li>a</li>", note="<li>") == "<ul><li>a</li></ul><p>&lt;li&gt;</p>"
+
+def test_literal_braces():
+    template = compile_template("{{ {name} }} {{name}}")
+    assert template.render(name="x") == "{ x } {name}"
+    assert compile_template("").render() == ""
+    assert compile_template("no slots").render(unused=1) == "no slots"
+
+def test_missing_value():
+    with pytest.raises(KeyError):
+        compile_template("{name}").render()
+
+def test_render_each_and_version():
+    item = compile_template("<li>{text}</li>")
+    assert render_each(item, [{"text": "a<b"}, {"text": "c"}]) == "<li>a&lt;b</li>\n<li>c</li>"
+    assert render_each(item, []) == ""
+    assert template_version(item) == template_version(compile_template("<li>{text}</li>"))
+    assert template_version(item) != template_version(compile_template("<li>{text|raw}</li>"))